@@ -0,0 +1,67 @@
+"""Parse + build round trip per JSON codec, on small and 1 MB messages.
+
+Run with ``python benchmarks/bench_codec.py``. Each iteration parses a
+``tools/call`` request from bytes and encodes its response to bytes, as the
+stdio transport does. The ``json (str)`` row is the previous str-based path:
+decode to text, ``json.loads``, ``json.dumps`` and encode again.
+"""
+
+import argparse
+import json
+import timeit
+
+from mcp_starter.codec import available_codecs
+from mcp_starter.protocol import ProtocolHandler
+
+SMALL_TEXT = "sunny, 22C"
+LARGE_TEXT = "lorem ipsum dolor sit amet, " * 37_450  # ~1 MB
+
+
+def request_bytes() -> bytes:
+    return json.dumps({
+        "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+        "params": {"name": "weather", "arguments": {"city": "Bogota", "days": 3}},
+    }).encode()
+
+
+def result(text: str) -> dict:
+    return {"content": [{"type": "text", "text": text}], "isError": False}
+
+
+def str_round_trip(raw: bytes, payload: dict) -> bytes:
+    message = json.loads(raw.decode())
+    return json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": payload}).encode()
+
+
+def per_call_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2_000)
+    args = parser.parse_args()
+
+    raw = request_bytes()
+    small_payload = result(SMALL_TEXT)
+    large_payload = result(LARGE_TEXT)
+
+    rows = [("json (str)", lambda payload: str_round_trip(raw, payload))]
+    for codec in available_codecs():
+        protocol = ProtocolHandler(codec=codec)
+
+        def round_trip(payload: dict, protocol: ProtocolHandler = protocol) -> bytes:
+            message = protocol.parse_request(raw)
+            return protocol.build_response(message["id"], payload)
+
+        rows.append((codec.name, round_trip))
+
+    print(f"{'codec':<12} {'small':>10} {'1 MB result':>13}")
+    for name, func in rows:
+        small = per_call_us(lambda: func(small_payload), args.number)
+        large = per_call_us(lambda: func(large_payload), max(1, args.number // 100))
+        print(f"{name:<12} {small:>8.2f}us {large:>11.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Scaling of a CPU-bound tool across process-pool worker counts.
+
+Run with ``python benchmarks/bench_executors.py``. The thread-pool row shows
+the GIL-bound baseline for the same workload.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from mcp_starter.models import ExecutionMode, ToolCallRequest
+from mcp_starter.server import MCPServer
+
+
+def score(rounds: int) -> int:
+    total = 0
+    for i in range(rounds):
+        total = (total * 31 + i) % 1_000_003
+    return total
+
+
+def run(mode: ExecutionMode, workers: int, calls: int, rounds: int) -> float:
+    server = MCPServer(name="bench", max_threads=workers, max_processes=workers)
+    server.tool(name="score", description="CPU-bound scoring", execution=mode)(score)
+    request = ToolCallRequest(tool_name="score", arguments={"rounds": rounds})
+    warmup = ToolCallRequest(tool_name="score", arguments={"rounds": 1})
+
+    async def go() -> None:
+        # Warm the pool so worker start-up is not measured.
+        await asyncio.gather(*(server.handle_call_tool_async(warmup) for _ in range(workers)))
+        await asyncio.gather(*(server.handle_call_tool_async(request) for _ in range(calls)))
+
+    try:
+        start = time.perf_counter()
+        asyncio.run(go())
+        return time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=200_000)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+    print(f"calls={args.calls} rounds={args.rounds} cpus={cpus}")
+    baseline = run(ExecutionMode.THREAD, cpus, args.calls, args.rounds)
+    print(f"thread  x{cpus:<3d} {args.calls / baseline:8.1f} calls/s")
+    single = None
+    for workers in counts:
+        elapsed = run(ExecutionMode.PROCESS, workers, args.calls, args.rounds)
+        single = single or elapsed
+        print(f"process x{workers:<3d} {args.calls / elapsed:8.1f} calls/s "
+              f"(speedup {single / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
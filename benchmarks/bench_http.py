@@ -0,0 +1,150 @@
+"""Load test of the Streamable HTTP transport against the stdio transport.
+
+Run with ``python benchmarks/bench_http.py``. Both transports serve the same
+server in this process and are driven by ``--concurrency`` clients that each
+keep one request outstanding. HTTP clients use one keep-alive connection
+each; stdio clients share a pipe, as a single stdio peer would. Reports
+requests/sec and p50/p99 latency per transport. ``--latency`` adds a
+simulated I/O wait to every tool call.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from mcp_starter.http_transport import SESSION_HEADER, HTTPTransport
+from mcp_starter.server import MCPServer
+from mcp_starter.transport import StdioTransport
+
+
+def build_server(latency: float) -> MCPServer:
+    server = MCPServer(name="bench")
+
+    @server.tool(name="echo", description="Echo after a simulated I/O wait")
+    async def echo(text: str = "") -> str:
+        if latency:
+            await asyncio.sleep(latency)
+        return text
+
+    return server
+
+
+def call_body(request_id: int) -> bytes:
+    return json.dumps({
+        "jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+        "params": {"name": "echo", "arguments": {"text": "hello"}},
+    }).encode()
+
+
+async def http_client(port: int, requests: int, latencies: list[float]) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    session_id = None
+
+    async def post(body: bytes) -> dict[str, str]:
+        head = "POST /mcp HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        if session_id is not None:
+            head += f"{SESSION_HEADER}: {session_id}\r\n"
+        writer.write(f"{head}Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        response = (await reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+        headers = dict(line.split(": ", 1) for line in response[1:] if line)
+        await reader.readexactly(int(headers["Content-Length"]))
+        return headers
+
+    init = {"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}}
+    session_id = (await post(json.dumps(init).encode()))[SESSION_HEADER]
+    for i in range(requests):
+        start = time.perf_counter()
+        await post(call_body(i))
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def run_http(server: MCPServer, total: int, concurrency: int) -> tuple[float, list[float]]:
+    transport = HTTPTransport(server, port=0)
+    await transport.start()
+    latencies: list[float] = []
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            http_client(transport.port, total // concurrency, latencies)
+            for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        await transport.close()
+    return elapsed, latencies
+
+
+async def run_stdio(server: MCPServer, total: int, concurrency: int) -> tuple[float, list[float]]:
+    loop = asyncio.get_running_loop()
+    to_server_r, to_server_w = os.pipe()
+    to_client_r, to_client_w = os.pipe()
+
+    async def open_reader(fd: int) -> asyncio.StreamReader:
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(fd, "rb", 0)
+        )
+        return reader
+
+    async def open_writer(fd: int) -> asyncio.StreamWriter:
+        transport, protocol = await loop.connect_write_pipe(
+            asyncio.streams.FlowControlMixin, os.fdopen(fd, "wb", 0)
+        )
+        return asyncio.StreamWriter(transport, protocol, None, loop)
+
+    server_reader, server_writer = await open_reader(to_server_r), await open_writer(to_client_w)
+    client_reader, client_writer = await open_reader(to_client_r), await open_writer(to_server_w)
+    serving = asyncio.create_task(StdioTransport(server).serve(server_reader, server_writer))
+    pending: dict[int, asyncio.Future[None]] = {}
+
+    async def receive() -> None:
+        while line := await client_reader.readline():
+            pending.pop(json.loads(line)["id"]).set_result(None)
+
+    async def client(offset: int, latencies: list[float]) -> None:
+        for i in range(offset, offset + total // concurrency):
+            pending[i] = loop.create_future()
+            start = time.perf_counter()
+            client_writer.write(call_body(i) + b"\n")
+            await pending[i]
+            latencies.append(time.perf_counter() - start)
+
+    receiving = asyncio.create_task(receive())
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c * total, latencies) for c in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    client_writer.close()
+    await serving
+    server_writer.close()
+    await receiving
+    return elapsed, latencies
+
+
+def report(name: str, elapsed: float, latencies: list[float]) -> None:
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1e3
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e3
+    print(f"{name:6} {len(latencies) / elapsed:10.1f} req/s  p50 {p50:7.3f} ms  p99 {p99:7.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0, help="tool latency in ms")
+    args = parser.parse_args()
+
+    server = build_server(args.latency / 1000)
+    print(f"requests={args.requests} concurrency={args.concurrency} "
+          f"tool_latency={args.latency}ms")
+    report("stdio", *asyncio.run(run_stdio(server, args.requests, args.concurrency)))
+    report("http", *asyncio.run(run_http(server, args.requests, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Listing cost for large registries: full listing vs. cursor pages vs. prefix filters.
+
+Run with ``python benchmarks/bench_listing.py``.
+"""
+
+import argparse
+import timeit
+
+from mcp_starter.models import Resource, ToolDefinition, ToolParam, ToolParamType
+from mcp_starter.registry import MCPRegistry
+
+
+def build_registry(size: int) -> MCPRegistry:
+    registry = MCPRegistry()
+    params = [
+        ToolParam(name="query", type=ToolParamType.STRING, description="Query text"),
+        ToolParam(name="limit", type=ToolParamType.INTEGER, required=False),
+    ]
+    with registry.batch():
+        for i in range(size):
+            group = f"group{i % 100:02d}"
+            registry.register_tool(ToolDefinition(
+                name=f"{group}.tool{i:06d}", description="Generated", parameters=params
+            ))
+            registry.register_resource(Resource(uri=f"db://{group}/rows/{i:06d}", name=f"row {i}"))
+    return registry
+
+
+def timed_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        registry = build_registry(size)
+        limit = args.page_size
+        middle = registry.page_tools(limit=size // 2).next_cursor
+
+        def cold_full() -> None:
+            registry.snapshot()._listings.clear()
+            registry.tool_schemas_json()
+
+        rows = [
+            ("full listing (cold)", timed_us(cold_full, 3)),
+            ("full listing (cached)", timed_us(registry.tool_schemas_json, 1000)),
+            ("first page", timed_us(lambda: registry.page_tools(limit=limit), 1000)),
+            ("middle page", timed_us(lambda: registry.page_tools(middle, limit), 1000)),
+            ("prefix page", timed_us(
+                lambda: registry.page_tools(limit=limit, prefix="group42."), 1000
+            )),
+            ("resource prefix page", timed_us(
+                lambda: registry.page_resources(limit=limit, prefix="db://group07/"), 1000
+            )),
+        ]
+        print(f"entries={size} page_size={limit}")
+        for label, us in rows:
+            print(f"  {label:<22} {us:12.1f} us")
+
+
+if __name__ == "__main__":
+    main()
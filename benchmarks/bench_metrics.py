@@ -0,0 +1,69 @@
+"""Hot-path cost of metrics recording.
+
+Run with ``python benchmarks/bench_metrics.py``. Reports the cost of the
+per-call recording pair on its own and the end-to-end cost of an inline tool
+call through ``handle_call_tool_async`` with metrics recording replaced by
+no-ops, to show the recording's share of a call.
+"""
+
+import argparse
+import asyncio
+import time
+import timeit
+
+from mcp_starter.metrics import ServerMetrics
+from mcp_starter.models import ExecutionMode, ToolCallRequest
+from mcp_starter.server import MCPServer
+
+
+class NullMetrics(ServerMetrics):
+    def tool_started(self, tool: str) -> None:
+        pass
+
+    def tool_finished(self, tool: str, elapsed: float, is_error: bool) -> None:
+        pass
+
+
+def recording_pair_us(number: int) -> float:
+    metrics = ServerMetrics()
+
+    def record() -> None:
+        metrics.tool_started("search")
+        metrics.tool_finished("search", 0.001, False)
+
+    return min(timeit.repeat(record, number=number, repeat=5)) / number * 1e6
+
+
+def call_us(metrics: ServerMetrics, number: int) -> float:
+    server = MCPServer(name="bench")
+    server.metrics = metrics
+    server.tool(name="noop", description="", execution=ExecutionMode.INLINE)(lambda: "ok")
+    request = ToolCallRequest(tool_name="noop")
+
+    async def run() -> float:
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(number):
+                await server.handle_call_tool_async(request)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    return asyncio.run(run()) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"recording pair:          {recording_pair_us(args.number):6.2f} us")
+    with_metrics = call_us(ServerMetrics(), args.number)
+    without = call_us(NullMetrics(), args.number)
+    print(f"tool call with metrics:  {with_metrics:6.2f} us")
+    print(f"tool call without:       {without:6.2f} us")
+    print(f"overhead per call:       {with_metrics - without:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
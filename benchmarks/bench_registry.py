@@ -0,0 +1,157 @@
+"""Registry lookup throughput while other threads keep registering tools.
+
+Run with ``python benchmarks/bench_registry.py``. It first times registering
+``--register`` tools, resources and URI templates one at a time, without
+``batch``, which must stay linear. Reader threads then call
+``get_tool`` in a loop, with a ``to_tool_schemas`` listing every 100
+lookups, while writer threads keep replacing ``--batch`` tools per publish.
+Reports lookups/sec and publishes/sec for the snapshot registry and for a
+baseline that guards one mutable dict with a lock, as a thread-safe
+in-place registry would.
+"""
+
+import argparse
+import threading
+import time
+from contextlib import nullcontext
+
+from mcp_starter.models import Resource, ResourceTemplate, ToolDefinition, ToolParam, ToolParamType
+from mcp_starter.registry import MCPRegistry
+
+PARAMS = [ToolParam(name="query", type=ToolParamType.STRING, description="Query text")]
+
+
+class LockedRegistry:
+    """Baseline: tools in one dict, with every read and write taking a lock."""
+
+    def __init__(self) -> None:
+        self._tools: dict[str, ToolDefinition] = {}
+        self._listing: list[dict[str, str]] | None = None
+        self._lock = threading.Lock()
+
+    def register_tool(self, tool: ToolDefinition) -> None:
+        with self._lock:
+            self._tools[tool.name] = tool
+            self._listing = None
+
+    def batch(self) -> nullcontext[None]:
+        return nullcontext()
+
+    def get_tool(self, name: str) -> ToolDefinition | None:
+        with self._lock:
+            return self._tools.get(name)
+
+    def to_tool_schemas(self) -> list[dict[str, str]]:
+        with self._lock:
+            if self._listing is None:
+                self._listing = [
+                    {"name": t.name, "description": t.description} for t in self._tools.values()
+                ]
+            return self._listing
+
+
+def make_tool(i: int, generation: int = 0) -> ToolDefinition:
+    return ToolDefinition(name=f"tool{i:06d}", description=f"v{generation}", parameters=PARAMS)
+
+
+def registration_seconds(count: int) -> dict[str, float]:
+    timings = {}
+    registry = MCPRegistry()
+    start = time.perf_counter()
+    for i in range(count):
+        registry.register_tool(make_tool(i))
+    registry.to_tool_schemas()
+    timings["tools"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(count):
+        registry.register_resource(Resource(uri=f"file:///data/{i:06d}", name=f"file {i}"))
+    registry.to_resource_schemas()
+    timings["resources"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(count):
+        registry.register_resource_template(
+            ResourceTemplate(uri_template=f"db://table{i}/{{id}}", name=f"table {i}")
+        )
+    registry.get_resource("db://table0/1")
+    timings["templates"] = time.perf_counter() - start
+    return timings
+
+
+def run(
+    registry: MCPRegistry | LockedRegistry,
+    tools: int,
+    readers: int,
+    writers: int,
+    batch: int,
+    seconds: float,
+) -> tuple[float, float]:
+    stop = threading.Event()
+    lookups = [0] * readers
+    publishes = [0] * writers
+    names = [f"tool{i:06d}" for i in range(tools)]
+    prebuilt = [make_tool(i, 1) for i in range(tools)]
+
+    def read(slot: int) -> None:
+        count = 0
+        while not stop.is_set():
+            for name in names[slot::readers][:1000]:
+                if registry.get_tool(name) is None:
+                    raise AssertionError(f"{name} went missing")
+                count += 1
+                if count % 100 == 0:
+                    registry.to_tool_schemas()
+        lookups[slot] = count
+
+    def write(slot: int) -> None:
+        count = 0
+        start = slot * batch
+        while not stop.is_set():
+            with registry.batch():
+                for j in range(batch):
+                    registry.register_tool(prebuilt[(start + j) % tools])
+            start += batch * writers
+            count += 1
+        publishes[slot] = count
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=write, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(lookups) / seconds, sum(publishes) / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=1000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, nargs="+", default=[0, 1, 4])
+    parser.add_argument("--batch", type=int, default=10, help="tools replaced per publish")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--register", type=int, nargs="+", default=[1000, 10_000])
+    args = parser.parse_args()
+
+    for count in args.register:
+        timings = registration_seconds(count)
+        print(f"register {count:>7,} one at a time: " + "  ".join(
+            f"{kind} {seconds * 1e3:8.1f} ms" for kind, seconds in timings.items()
+        ))
+
+    print(f"tools={args.tools} readers={args.readers} batch={args.batch}")
+    for writers in args.writers:
+        for label, registry in [("snapshot", MCPRegistry()), ("locked", LockedRegistry())]:
+            with registry.batch():
+                for i in range(args.tools):
+                    registry.register_tool(make_tool(i))
+            rate, publish_rate = run(
+                registry, args.tools, args.readers, writers, args.batch, args.seconds
+            )
+            print(f"writers={writers:<2} {label:9} {rate:12,.0f} lookups/s "
+                  f"{publish_rate:10,.0f} publishes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Resource template lookup cost as the number of templates grows.
+
+Run with ``python benchmarks/bench_router.py``. Compares the segment trie in
+``UriRouter`` with a linear scan over one compiled regex per template.
+"""
+
+import argparse
+import re
+import timeit
+
+from mcp_starter.router import UriRouter
+
+
+def build_templates(count: int) -> list[str]:
+    return [f"db://tenant{i}/tables/{{name}}/rows/{{row}}" for i in range(count)]
+
+
+def linear_matcher(templates: list[str]):
+    compiled = [
+        re.compile(re.escape(t).replace(r"\{name\}", "([^/]+)").replace(r"\{row\}", "([^/]+)"))
+        for t in templates
+    ]
+
+    def match(uri: str):
+        for pattern in compiled:
+            m = pattern.fullmatch(uri)
+            if m is not None:
+                return m.groups()
+        return None
+
+    return match
+
+
+def per_lookup_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--number", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'templates':>9} {'trie':>10} {'linear':>12}")
+    for count in args.counts:
+        templates = build_templates(count)
+        router = UriRouter()
+        for i, template in enumerate(templates):
+            router.add(template, i)
+        linear = linear_matcher(templates)
+        # Worst case for the linear scan: the last template matches.
+        uri = f"db://tenant{count - 1}/tables/orders/rows/42"
+        assert router.match(uri) == (count - 1, {"name": "orders", "row": "42"})
+        assert linear(uri) == ("orders", "42")
+        trie_us = per_lookup_us(lambda: router.match(uri), args.number)
+        linear_us = per_lookup_us(lambda: linear(uri), max(1, args.number // 100))
+        print(f"{count:>9} {trie_us:>8.2f}us {linear_us:>10.2f}us")
+
+
+if __name__ == "__main__":
+    main()
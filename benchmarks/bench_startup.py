@@ -0,0 +1,96 @@
+"""Cold start: eager tool imports vs. lazy registration by import path.
+
+Run with ``python benchmarks/bench_startup.py``. Generates ``--tools`` tool
+modules whose import costs ``--import-ms`` (standing in for heavy
+dependencies), then times, in fresh interpreters, how long it takes to
+``import mcp_starter`` and to answer the first ``tools/list`` with every
+module imported up front vs. registered as ``"module:function"`` paths.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+TOOL_MODULE = '''\
+import time
+
+time.sleep({import_s})
+
+
+def run(text: str) -> str:
+    return text.upper()
+'''
+
+SCRIPT = '''\
+import asyncio, importlib, json, sys, time
+start = time.perf_counter()
+import mcp_starter
+from mcp_starter import MCPServer, ToolParam, ToolParamType
+imported = time.perf_counter()
+mode, n = sys.argv[1], int(sys.argv[2])
+server = MCPServer(name="bench")
+params = [ToolParam(name="text", type=ToolParamType.STRING)]
+for i in range(n):
+    path = f"bench_tool_{i}:run"
+    if mode == "eager":
+        module = importlib.import_module(f"bench_tool_{i}")
+        server.tool(name=f"tool{i}", description="Upper-case text", parameters=params)(module.run)
+    else:
+        server.add_tool(f"tool{i}", "Upper-case text", path, params)
+listing = asyncio.run(server.handle_raw(b'{"jsonrpc":"2.0","id":1,"method":"tools/list"}'))
+listed = time.perf_counter()
+call = json.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/call",
+                   "params": {"name": "tool0", "arguments": {"text": "hi"}}})
+asyncio.run(server.handle_raw(call))
+called = time.perf_counter()
+server.shutdown()
+print(json.dumps({"import": imported - start, "list": listed - start, "call": called - listed}))
+'''
+
+PACKAGE_IMPORT = (
+    "import time; s = time.perf_counter(); import mcp_starter; print(time.perf_counter() - s)"
+)
+
+
+def run(args: list[str], env: dict[str, str]) -> str:
+    return subprocess.run(
+        [sys.executable, *args], env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=300)
+    parser.add_argument("--import-ms", type=float, default=2.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(args.tools):
+            with open(os.path.join(directory, f"bench_tool_{i}.py"), "w") as f:
+                f.write(TOOL_MODULE.format(import_s=args.import_ms / 1000))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [directory, env.get("PYTHONPATH")]))
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+        package = [float(run(["-c", PACKAGE_IMPORT], env)) for _ in range(args.repeat)]
+        print(f"import mcp_starter: {statistics.median(package) * 1e3:8.1f}ms")
+        print(f"tools={args.tools} import_cost={args.import_ms:g}ms per module")
+        print(f"{'mode':<6} {'import':>9} {'tools/list':>11} {'first call':>11}")
+        for mode in ("eager", "lazy"):
+            samples = [
+                json.loads(run(["-c", SCRIPT, mode, str(args.tools)], env))
+                for _ in range(args.repeat)
+            ]
+            row = {key: statistics.median(s[key] for s in samples) * 1e3 for key in samples[0]}
+            print(
+                f"{mode:<6} {row['import']:>7.1f}ms {row['list']:>9.1f}ms {row['call']:>9.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
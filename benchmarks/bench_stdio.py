@@ -0,0 +1,91 @@
+"""Throughput of the concurrent stdio transport vs. a naive sequential loop.
+
+Run with ``python benchmarks/bench_stdio.py``. Each request calls a tool that
+blocks for ``--latency`` milliseconds, simulating an I/O-bound backend.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from mcp_starter.models import ToolCallRequest
+from mcp_starter.server import MCPServer
+from mcp_starter.transport import StdioTransport
+
+
+class NullWriter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def write(self, data: bytes) -> None:
+        self.count += 1
+
+    async def drain(self) -> None:
+        pass
+
+
+def build_server(latency: float) -> MCPServer:
+    server = MCPServer(name="bench")
+
+    @server.tool(name="io", description="Simulated blocking I/O")
+    def io() -> str:
+        time.sleep(latency)
+        return "ok"
+
+    return server
+
+
+def build_lines(n: int) -> list[bytes]:
+    return [
+        json.dumps({
+            "jsonrpc": "2.0", "id": i, "method": "tools/call",
+            "params": {"name": "io", "arguments": {}},
+        }).encode()
+        for i in range(n)
+    ]
+
+
+def run_sequential(server: MCPServer, lines: list[bytes]) -> float:
+    start = time.perf_counter()
+    for line in lines:
+        message = server.protocol.parse_request(line)
+        params = message["params"]
+        response = server.handle_call_tool(
+            ToolCallRequest(tool_name=params["name"], arguments=params["arguments"])
+        )
+        server.protocol.build_response(message["id"], {"content": response.content})
+    return time.perf_counter() - start
+
+
+def run_concurrent(server: MCPServer, lines: list[bytes], max_in_flight: int) -> float:
+    async def run() -> None:
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"".join(line + b"\n" for line in lines))
+        reader.feed_eof()
+        await StdioTransport(server, max_in_flight).serve(reader, NullWriter())
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=5.0, help="tool latency in ms")
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    args = parser.parse_args()
+
+    server = build_server(args.latency / 1000)
+    lines = build_lines(args.requests)
+    sequential = run_sequential(server, lines)
+    concurrent = run_concurrent(server, lines, args.max_in_flight)
+    print(f"requests={args.requests} tool_latency={args.latency}ms")
+    print(f"sequential: {args.requests / sequential:10.1f} req/s")
+    print(f"concurrent: {args.requests / concurrent:10.1f} req/s "
+          f"({sequential / concurrent:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
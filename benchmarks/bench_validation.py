@@ -0,0 +1,53 @@
+"""Per-call argument validation cost: ToolValidator.validate_call vs. compiled.
+
+Run with ``python benchmarks/bench_validation.py``. ``validate_call`` compiles
+the tool on every call. Each tool has a mix of required and optional
+parameters of every type, and every call is valid.
+"""
+
+import argparse
+import timeit
+
+from mcp_starter.models import ToolDefinition, ToolParam, ToolParamType
+from mcp_starter.validation import ToolValidator
+
+SAMPLE_VALUES = {
+    ToolParamType.STRING: "value",
+    ToolParamType.INTEGER: 42,
+    ToolParamType.BOOLEAN: True,
+    ToolParamType.NUMBER: 3.5,
+}
+
+
+def build_tool(n_params: int) -> tuple[ToolDefinition, dict]:
+    types = list(ToolParamType)
+    params = [
+        ToolParam(name=f"p{i}", type=types[i % len(types)], required=i % 3 != 0)
+        for i in range(n_params)
+    ]
+    arguments = {p.name: SAMPLE_VALUES[p.type] for p in params}
+    return ToolDefinition(name=f"tool{n_params}", description="", parameters=params), arguments
+
+
+def per_call_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    validator = ToolValidator()
+    print(f"{'params':>6} {'validate_call':>14} {'compiled':>10} {'speedup':>8}")
+    for n in (1, 10, 50):
+        tool, arguments = build_tool(n)
+        compiled = ToolValidator.compile(tool)
+        assert compiled(arguments) == validator.validate_call(tool, arguments) == []
+        legacy = per_call_us(lambda: validator.validate_call(tool, arguments), args.number)
+        fast = per_call_us(lambda: compiled(arguments), args.number)
+        print(f"{n:>6} {legacy:>12.2f}us {fast:>8.2f}us {legacy / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
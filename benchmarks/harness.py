@@ -0,0 +1,103 @@
+"""Timing helpers and JSON baselines for the benchmark suite."""
+
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+# A case is a function that performs ``n`` operations.
+BatchFunc = Callable[[int], None]
+
+
+@dataclass
+class Result:
+    """Per-operation timing of one benchmark case."""
+
+    name: str
+    ops_per_sec: float
+    p50_us: float
+    p95_us: float
+    p99_us: float
+    samples: int
+
+
+def calibrate(func: BatchFunc, target: float = 0.002) -> int:
+    """Return a batch size whose run time is roughly ``target`` seconds."""
+    n = 1
+    while True:
+        start = time.perf_counter()
+        func(n)
+        elapsed = time.perf_counter() - start
+        if elapsed >= target or n >= 1_000_000:
+            return n
+        n *= 2 if elapsed == 0 else max(2, min(10, int(target / elapsed) + 1))
+
+
+def measure(name: str, func: BatchFunc, duration: float = 0.5, min_samples: int = 20) -> Result:
+    """Time ``func`` in batches and report throughput and latency percentiles.
+
+    Each sample is the mean per-operation time of one batch, so timer
+    overhead stays negligible even for sub-microsecond operations.
+    """
+    batch = calibrate(func)
+    func(batch)  # Warm caches before sampling.
+    per_op: list[float] = []
+    total_ops = 0
+    total_time = 0.0
+    deadline = time.perf_counter() + duration
+    while len(per_op) < min_samples or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        func(batch)
+        elapsed = time.perf_counter() - start
+        per_op.append(elapsed / batch)
+        total_ops += batch
+        total_time += elapsed
+    cuts = statistics.quantiles(per_op, n=100, method="inclusive")
+    return Result(
+        name=name,
+        ops_per_sec=total_ops / total_time,
+        p50_us=cuts[49] * 1e6,
+        p95_us=cuts[94] * 1e6,
+        p99_us=cuts[98] * 1e6,
+        samples=len(per_op),
+    )
+
+
+def save_baseline(path: str, results: list[Result]) -> None:
+    with open(path, "w") as f:
+        json.dump({r.name: asdict(r) for r in results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare_baseline(path: str, results: list[Result], tolerance: float) -> list[str]:
+    """Return a message for every case whose p50 latency regressed beyond ``tolerance``.
+
+    Cases missing from the baseline are ignored so new benchmarks can be added
+    before the baseline is refreshed.
+    """
+    with open(path) as f:
+        baseline = json.load(f)
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            continue
+        limit = previous["p50_us"] * (1 + tolerance)
+        if result.p50_us > limit:
+            regressions.append(
+                f"{result.name}: p50 {result.p50_us:.3f}us > baseline "
+                f"{previous['p50_us']:.3f}us (+{tolerance:.0%} allowed)"
+            )
+    return regressions
+
+
+def format_table(results: list[Result]) -> str:
+    width = max(len(r.name) for r in results)
+    lines = [f"{'case':<{width}} {'ops/s':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}"]
+    for r in results:
+        lines.append(
+            f"{r.name:<{width}} {r.ops_per_sec:>12,.0f} "
+            f"{r.p50_us:>10.3f} {r.p95_us:>10.3f} {r.p99_us:>10.3f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,204 @@
+"""Benchmark suite for parsing, validation, dispatch and listing.
+
+Usage::
+
+    python benchmarks/run.py                          # run and print results
+    python benchmarks/run.py --save baseline.json     # record a baseline
+    python benchmarks/run.py --compare baseline.json  # exit 1 on regressions
+    python benchmarks/run.py --filter listing         # only matching cases
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Callable
+
+from harness import BatchFunc, Result, compare_baseline, format_table, measure, save_baseline
+
+from mcp_starter.models import (
+    ExecutionMode,
+    ToolCallRequest,
+    ToolDefinition,
+    ToolParam,
+    ToolParamType,
+)
+from mcp_starter.protocol import ProtocolHandler
+from mcp_starter.registry import MCPRegistry
+from mcp_starter.server import MCPServer
+from mcp_starter.validation import ToolValidator
+
+REGISTRY_SIZES = (10, 1_000, 10_000)
+SAMPLE_VALUES = {
+    ToolParamType.STRING: "value",
+    ToolParamType.INTEGER: 42,
+    ToolParamType.BOOLEAN: True,
+    ToolParamType.NUMBER: 3.5,
+}
+
+
+def make_params(count: int) -> list[ToolParam]:
+    types = list(ToolParamType)
+    return [
+        ToolParam(name=f"p{i}", type=types[i % len(types)], description=f"Parameter {i}",
+                  required=i % 3 != 0)
+        for i in range(count)
+    ]
+
+
+def make_arguments(params: list[ToolParam]) -> dict:
+    return {p.name: SAMPLE_VALUES[p.type] for p in params}
+
+
+def call_message(arguments: dict) -> str:
+    return json.dumps({
+        "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+        "params": {"name": "search", "arguments": arguments},
+    })
+
+
+def protocol_cases() -> dict[str, BatchFunc]:
+    protocol = ProtocolHandler()
+    small = call_message({"query": "weather in Bogota", "limit": 5, "verbose": False})
+    large = call_message({"document": "lorem ipsum dolor sit amet " * 4_000})
+    small_result = {"content": [{"type": "text", "text": "sunny, 22C"}], "isError": False}
+    large_result = {"content": [{"type": "text", "text": "x" * 1_000_000}], "isError": False}
+
+    def repeat(func: Callable[[], object]) -> BatchFunc:
+        def run(n: int) -> None:
+            for _ in range(n):
+                func()
+        return run
+
+    return {
+        "protocol.parse_request/small": repeat(lambda: protocol.parse_request(small)),
+        "protocol.parse_request/100KB": repeat(lambda: protocol.parse_request(large)),
+        "protocol.build_response/small": repeat(lambda: protocol.build_response(1, small_result)),
+        "protocol.build_response/1MB": repeat(lambda: protocol.build_response(1, large_result)),
+    }
+
+
+def validation_cases() -> dict[str, BatchFunc]:
+    validator = ToolValidator()
+    cases: dict[str, BatchFunc] = {}
+    for count in (1, 10, 50):
+        params = make_params(count)
+        tool = ToolDefinition(name="t", description="", parameters=params)
+        arguments = make_arguments(params)
+        compiled = ToolValidator.compile(tool)
+
+        def legacy(n: int, tool=tool, arguments=arguments) -> None:
+            for _ in range(n):
+                validator.validate_call(tool, arguments)
+
+        def fast(n: int, compiled=compiled, arguments=arguments) -> None:
+            for _ in range(n):
+                compiled(arguments)
+
+        cases[f"validation.validate_call/{count}p"] = legacy
+        cases[f"validation.compiled/{count}p"] = fast
+    return cases
+
+
+def dispatch_cases() -> dict[str, BatchFunc]:
+    server = MCPServer(name="bench")
+    params = make_params(10)
+    server.tool(
+        name="search", description="Search", parameters=params, execution=ExecutionMode.INLINE
+    )(lambda **kwargs: "result")
+    request = ToolCallRequest(tool_name="search", arguments=make_arguments(params))
+    raw = call_message(request.arguments)
+    loop = asyncio.new_event_loop()
+
+    def sync_call(n: int) -> None:
+        for _ in range(n):
+            server.handle_call_tool(request)
+
+    async def async_calls(n: int) -> None:
+        for _ in range(n):
+            await server.handle_call_tool_async(request)
+
+    async def raw_calls(n: int) -> None:
+        for _ in range(n):
+            await server.handle_raw(raw)
+
+    return {
+        "server.handle_call_tool": sync_call,
+        "server.handle_call_tool_async": lambda n: loop.run_until_complete(async_calls(n)),
+        "server.handle_raw/tools.call": lambda n: loop.run_until_complete(raw_calls(n)),
+    }
+
+
+def listing_cases() -> dict[str, BatchFunc]:
+    cases: dict[str, BatchFunc] = {}
+    for size in REGISTRY_SIZES:
+        registry = MCPRegistry()
+        params = make_params(5)
+        with registry.batch():
+            for i in range(size):
+                registry.register_tool(ToolDefinition(
+                    name=f"tool{i:06d}", description="Generated tool", parameters=params
+                ))
+
+        def cold(n: int, registry=registry) -> None:
+            for _ in range(n):
+                registry.snapshot()._listings.clear()
+                registry.to_tool_schemas()
+
+        def cached(n: int, registry=registry) -> None:
+            for _ in range(n):
+                registry.tool_schemas_json()
+
+        def page(n: int, registry=registry) -> None:
+            for _ in range(n):
+                registry.page_tools(limit=100)
+
+        cases[f"registry.to_tool_schemas/cold/{size}"] = cold
+        cases[f"registry.tool_schemas_json/cached/{size}"] = cached
+        cases[f"registry.page_tools/100/{size}"] = page
+    return cases
+
+
+def all_cases() -> dict[str, BatchFunc]:
+    cases: dict[str, BatchFunc] = {}
+    for group in (protocol_cases, validation_cases, dispatch_cases, listing_cases):
+        cases.update(group())
+    return cases
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--duration", type=float, default=0.5, help="seconds per case")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="fail if slower than this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p50 slowdown before failing (default: 0.25)")
+    args = parser.parse_args()
+
+    results: list[Result] = []
+    for name, func in all_cases().items():
+        if args.filter in name:
+            results.append(measure(name, func, duration=args.duration))
+    if not results:
+        print(f"no cases match {args.filter!r}", file=sys.stderr)
+        return 2
+    print(format_table(results))
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"baseline written to {args.save}")
+    if args.compare:
+        regressions = compare_baseline(args.compare, results, args.tolerance)
+        if regressions:
+            print("\nregressions:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"no regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
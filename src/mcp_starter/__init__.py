@@ -1,23 +1,146 @@
-"""MCP Server Starter - Template for MCP servers."""
+"""MCP Server Starter - Template for MCP servers.
+
+Public names are imported from their submodules on first access, so
+``import mcp_starter`` stays cheap and only the parts a server uses are
+loaded.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
 
 __all__ = [
+    "CachePolicy",
+    "CacheStats",
+    "CallableReader",
+    "CompiledValidator",
+    "ConcurrencyLimit",
+    "ConcurrencyLimiter",
+    "ContentBlock",
+    "ContentLengthFramer",
+    "EmbeddedResource",
+    "ExecutionMode",
+    "ExecutorPool",
+    "FileReader",
+    "Framer",
+    "HTTPTransport",
+    "ImageContent",
+    "JSONCodec",
+    "JsonContent",
+    "LimiterStats",
     "MCPRegistry",
     "MCPServer",
+    "MessageTooLargeError",
+    "NewlineFramer",
+    "OverloadedError",
+    "PreforkServer",
+    "ProtocolError",
     "ProtocolHandler",
+    "RateLimit",
+    "RateLimitedError",
+    "RateLimiter",
     "Resource",
+    "ResourceLink",
+    "ResourceReader",
+    "ResourceTemplate",
+    "ResultSpool",
+    "ServerMetrics",
+    "SingleFlight",
+    "SpoolPolicy",
+    "StdioTransport",
+    "TextContent",
     "ToolCallRequest",
     "ToolCallResponse",
     "ToolDefinition",
     "ToolParam",
     "ToolParamType",
     "ToolValidator",
+    "UriRouter",
     "ValidationError",
 ]
 
 __version__ = "0.1.0"
 
-from .models import Resource, ToolCallRequest, ToolCallResponse, ToolDefinition, ToolParam, ToolParamType
-from .protocol import ProtocolHandler
-from .registry import MCPRegistry
-from .server import MCPServer
-from .validation import ToolValidator, ValidationError
+_EXPORTS = {
+    "CachePolicy": "models",
+    "CacheStats": "cache",
+    "CallableReader": "resources",
+    "CompiledValidator": "validation",
+    "ConcurrencyLimit": "models",
+    "ConcurrencyLimiter": "limits",
+    "ContentBlock": "content",
+    "ContentLengthFramer": "framing",
+    "EmbeddedResource": "content",
+    "ExecutionMode": "models",
+    "ExecutorPool": "executors",
+    "FileReader": "resources",
+    "Framer": "framing",
+    "HTTPTransport": "http_transport",
+    "ImageContent": "content",
+    "JSONCodec": "codec",
+    "JsonContent": "content",
+    "LimiterStats": "limits",
+    "MCPRegistry": "registry",
+    "MCPServer": "server",
+    "MessageTooLargeError": "framing",
+    "NewlineFramer": "framing",
+    "OverloadedError": "limits",
+    "PreforkServer": "prefork",
+    "ProtocolError": "protocol",
+    "ProtocolHandler": "protocol",
+    "RateLimit": "models",
+    "RateLimitedError": "limits",
+    "RateLimiter": "limits",
+    "Resource": "models",
+    "ResourceLink": "content",
+    "ResourceReader": "resources",
+    "ResourceTemplate": "models",
+    "ResultSpool": "spool",
+    "ServerMetrics": "metrics",
+    "SingleFlight": "singleflight",
+    "SpoolPolicy": "models",
+    "StdioTransport": "transport",
+    "TextContent": "content",
+    "ToolCallRequest": "models",
+    "ToolCallResponse": "models",
+    "ToolDefinition": "models",
+    "ToolParam": "models",
+    "ToolParamType": "models",
+    "ToolValidator": "validation",
+    "UriRouter": "router",
+    "ValidationError": "validation",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
+
+
+if TYPE_CHECKING:
+    from .cache import CacheStats
+    from .codec import JSONCodec
+    from .content import ContentBlock, EmbeddedResource, ImageContent, JsonContent, ResourceLink, TextContent
+    from .executors import ExecutorPool
+    from .framing import ContentLengthFramer, Framer, MessageTooLargeError, NewlineFramer
+    from .http_transport import HTTPTransport
+    from .limits import ConcurrencyLimiter, LimiterStats, OverloadedError, RateLimitedError, RateLimiter
+    from .metrics import ServerMetrics
+    from .models import CachePolicy, ConcurrencyLimit, ExecutionMode, RateLimit, Resource, ResourceTemplate, SpoolPolicy, ToolCallRequest, ToolCallResponse, ToolDefinition, ToolParam, ToolParamType
+    from .prefork import PreforkServer
+    from .protocol import ProtocolError, ProtocolHandler
+    from .registry import MCPRegistry
+    from .resources import CallableReader, FileReader, ResourceReader
+    from .router import UriRouter
+    from .server import MCPServer
+    from .singleflight import SingleFlight
+    from .spool import ResultSpool
+    from .transport import StdioTransport
+    from .validation import CompiledValidator, ToolValidator, ValidationError
@@ -0,0 +1,100 @@
+"""LRU + TTL memoization of tool results."""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from mcp_starter.models import CachePolicy, ToolCallResponse
+
+
+@dataclass
+class CacheStats:
+    """Counters describing a result cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+def canonical_arguments(arguments: dict[str, Any]) -> str:
+    """Encode arguments so that equal argument dicts always produce the same key."""
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+class ResultCache:
+    """Thread-safe LRU cache of successful responses for a single tool."""
+
+    def __init__(self, policy: CachePolicy, clock: Callable[[], float] = time.monotonic) -> None:
+        self.policy = policy
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[ToolCallResponse, float | None, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: str) -> ToolCallResponse | None:
+        """Return the cached response for ``key``, or None on a miss or expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, expires, size = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return response
+                self._remove(key)
+            self._stats.misses += 1
+            return None
+
+    def put(self, key: str, response: ToolCallResponse) -> None:
+        """Store a response; error responses and results over ``max_bytes`` are skipped."""
+        if response.is_error:
+            return
+        size = response_size(response)
+        max_bytes = self.policy.max_bytes
+        if max_bytes is not None and size > max_bytes:
+            return
+        expires = self._clock() + self.policy.ttl if self.policy.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (response, expires, size)
+            self._stats.bytes += size
+            while len(self._entries) > self.policy.max_entries or (
+                max_bytes is not None and self._stats.bytes > max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop one entry, or every entry when ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._stats.bytes = 0
+            elif key in self._entries:
+                self._remove(key)
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                bytes=self._stats.bytes,
+            )
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._stats.bytes -= size
+
+
+def response_size(response: ToolCallResponse) -> int:
+    """Approximate the memory held by a cached response."""
+    return len(response.content) + sum(block.size() for block in response.blocks)
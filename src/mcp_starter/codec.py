@@ -0,0 +1,104 @@
+"""Pluggable JSON codecs that decode from and encode to bytes."""
+
+import json
+from typing import Any, Protocol
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None  # type: ignore[assignment, unused-ignore]
+
+Buffer = bytes | bytearray | memoryview | str
+
+
+class JSONCodec(Protocol):
+    """Encodes Python values to compact UTF-8 JSON and decodes them back.
+
+    ``decode_errors`` lists the exceptions ``loads`` raises for malformed
+    input, so callers can map them to a parse error without knowing which
+    library is in use.
+    """
+
+    name: str
+
+    @property
+    def decode_errors(self) -> tuple[type[Exception], ...]: ...
+
+    def loads(self, data: Buffer) -> Any: ...
+
+    def dumps(self, value: Any) -> bytes: ...
+
+
+class StdlibCodec:
+    """Codec backed by the standard library ``json`` module."""
+
+    name = "json"
+    decode_errors = (json.JSONDecodeError, UnicodeDecodeError)
+
+    def __init__(self) -> None:
+        self._encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def loads(self, data: Buffer) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        return self._encoder.encode(value).encode()
+
+
+class OrjsonCodec:
+    """Codec backed by ``orjson``; accepts memoryviews without copying."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        self.decode_errors = (orjson.JSONDecodeError,)
+
+    def loads(self, data: Buffer) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MsgspecCodec:
+    """Codec backed by ``msgspec.json``; accepts memoryviews without copying."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+        self.decode_errors = (msgspec.DecodeError,)
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def loads(self, data: Buffer) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, value: Any) -> bytes:
+        return self._encoder.encode(value)
+
+
+def available_codecs() -> list[JSONCodec]:
+    """Return an instance of every codec whose library is importable, fastest first."""
+    codecs: list[JSONCodec] = []
+    if orjson is not None:
+        codecs.append(OrjsonCodec())
+    if msgspec is not None:
+        codecs.append(MsgspecCodec())
+    codecs.append(StdlibCodec())
+    return codecs
+
+
+def default_codec() -> JSONCodec:
+    """Return the fastest available codec, falling back to the standard library."""
+    return available_codecs()[0]
@@ -0,0 +1,143 @@
+"""Typed content blocks carried by tool results.
+
+Blocks keep their payload in its native form (text, raw bytes or Python
+values) and are serialized straight to JSON bytes by
+``ProtocolHandler.build_tool_result``. Binary payloads are base64-encoded
+only at that point, and structured values are encoded once and reused.
+"""
+
+import base64
+from dataclasses import dataclass, field
+from typing import Any
+
+from mcp_starter.codec import JSONCodec, default_codec
+
+BINARY_MIME_TYPE = "application/octet-stream"
+
+
+@dataclass
+class TextContent:
+    """Plain text shown to the model."""
+
+    text: str
+
+    def render(self, codec: JSONCodec) -> list[bytes]:
+        return [codec.dumps({"type": "text", "text": self.text})]
+
+    def size(self) -> int:
+        return len(self.text)
+
+
+@dataclass
+class ImageContent:
+    """An image given as raw bytes; base64-encoded when the response is written."""
+
+    data: bytes
+    mime_type: str
+
+    def render(self, codec: JSONCodec) -> list[bytes]:
+        return [
+            b'{"type":"image","mimeType":',
+            codec.dumps(self.mime_type),
+            b',"data":"',
+            base64.b64encode(self.data),
+            b'"}',
+        ]
+
+    def size(self) -> int:
+        return len(self.data)
+
+
+@dataclass
+class EmbeddedResource:
+    """Resource contents returned inline, as ``text`` or as binary ``blob``."""
+
+    uri: str
+    mime_type: str = BINARY_MIME_TYPE
+    text: str | None = None
+    blob: bytes | None = None
+
+    def __post_init__(self) -> None:
+        if (self.text is None) == (self.blob is None):
+            raise ValueError("Exactly one of text and blob must be set")
+
+    def render(self, codec: JSONCodec) -> list[bytes]:
+        head = codec.dumps({"uri": self.uri, "mimeType": self.mime_type})[:-1]
+        if self.blob is not None:
+            body = [b',"blob":"', base64.b64encode(self.blob), b'"']
+        else:
+            body = [b',"text":', codec.dumps(self.text)]
+        return [b'{"type":"resource","resource":', head, *body, b"}}"]
+
+    def size(self) -> int:
+        return len(self.blob) if self.blob is not None else len(self.text or "")
+
+
+@dataclass
+class ResourceLink:
+    """A pointer to a resource the client can fetch with ``resources/read``."""
+
+    uri: str
+    name: str
+    description: str = ""
+    mime_type: str = BINARY_MIME_TYPE
+
+    def render(self, codec: JSONCodec) -> list[bytes]:
+        return [codec.dumps({
+            "type": "resource_link", "uri": self.uri, "name": self.name,
+            "description": self.description, "mimeType": self.mime_type,
+        })]
+
+    def size(self) -> int:
+        return len(self.uri)
+
+
+@dataclass
+class JsonContent:
+    """A structured JSON value, sent as the result's ``structuredContent``.
+
+    Values other than dicts are sent there as ``{"result": value}``, since
+    ``structuredContent`` must be an object.
+
+    The value is encoded once, on first use, and the encoding is reused for
+    every later response, including cache hits. A text block holding the
+    same JSON is also rendered for clients that ignore ``structuredContent``.
+    """
+
+    value: Any
+    _encoded: bytes | None = field(default=None, init=False, repr=False, compare=False)
+
+    def encode(self, codec: JSONCodec) -> bytes:
+        if self._encoded is None:
+            self._encoded = codec.dumps(self.value)
+        return self._encoded
+
+    def render(self, codec: JSONCodec) -> list[bytes]:
+        return [b'{"type":"text","text":', codec.dumps(self.encode(codec).decode()), b"}"]
+
+    def size(self) -> int:
+        return len(self.encode(default_codec()))
+
+
+ContentBlock = TextContent | ImageContent | EmbeddedResource | ResourceLink | JsonContent
+CONTENT_BLOCK_TYPES = (TextContent, ImageContent, EmbeddedResource, ResourceLink, JsonContent)
+
+
+def as_blocks(value: Any, uri: str) -> list[ContentBlock] | None:
+    """Map a handler's return value to content blocks.
+
+    Blocks and lists of blocks are used as-is, dicts and sequences become
+    ``JsonContent`` and bytes become an ``EmbeddedResource`` blob addressed
+    by ``uri``. Returns None for anything else, which is sent as text.
+    """
+    if isinstance(value, CONTENT_BLOCK_TYPES):
+        return [value]
+    if isinstance(value, (list, tuple)) and value and all(
+        isinstance(item, CONTENT_BLOCK_TYPES) for item in value
+    ):
+        return list(value)
+    if isinstance(value, (dict, list, tuple)):
+        return [JsonContent(value)]
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return [EmbeddedResource(uri=uri, blob=bytes(value))]
+    return None
@@ -0,0 +1,107 @@
+"""Thread and process pools used to run synchronous tool handlers."""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+from mcp_starter.models import ExecutionMode
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+def default_thread_workers() -> int:
+    """Match the stdlib default for ``ThreadPoolExecutor``."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def default_process_workers() -> int:
+    return os.cpu_count() or 1
+
+
+class ExecutorPool:
+    """Lazily created thread and process pools owned by a server.
+
+    Pools are only started the first time a tool with the matching
+    ``ExecutionMode`` is called, so servers that never use them pay nothing.
+    """
+
+    def __init__(self, max_threads: int | None = None, max_processes: int | None = None) -> None:
+        if max_threads is not None and max_threads < 1:
+            raise ValueError("max_threads must be at least 1")
+        if max_processes is not None and max_processes < 1:
+            raise ValueError("max_processes must be at least 1")
+        self.max_threads = max_threads or default_thread_workers()
+        self.max_processes = max_processes or default_process_workers()
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: "ProcessPoolExecutor | None" = None
+
+    async def run(
+        self, mode: ExecutionMode, func: Callable[..., Any], kwargs: dict[str, Any]
+    ) -> Any:
+        """Run ``func(**kwargs)`` according to ``mode`` and return its result.
+
+        Args:
+            mode: Where to run the call.
+            func: A synchronous callable.
+            kwargs: Keyword arguments for the call.
+
+        Returns:
+            Whatever ``func`` returns.
+        """
+        if mode is ExecutionMode.INLINE:
+            return func(**kwargs)
+        return await asyncio.wrap_future(self.submit(mode, func, kwargs))
+
+    def submit(
+        self, mode: ExecutionMode, func: Callable[..., Any], kwargs: dict[str, Any]
+    ) -> Future[Any]:
+        """Start ``func(**kwargs)`` on the THREAD or PROCESS pool and return its future.
+
+        Unlike ``run``, this exposes when the call really finishes: cancelling
+        an awaiting task does not stop a call that has already started.
+        """
+        return self._executor(mode).submit(functools.partial(func, **kwargs))
+
+    def call(self, mode: ExecutionMode, func: Callable[..., Any], kwargs: dict[str, Any]) -> Any:
+        """Blocking counterpart of ``run`` for callers outside an event loop.
+
+        The caller waits either way, so INLINE and THREAD both run ``func``
+        on the calling thread; only PROCESS hands it to the process pool.
+
+        Args:
+            mode: Where to run the call.
+            func: A synchronous callable.
+            kwargs: Keyword arguments for the call.
+
+        Returns:
+            Whatever ``func`` returns.
+        """
+        if mode is not ExecutionMode.PROCESS:
+            return func(**kwargs)
+        return self._executor(mode).submit(functools.partial(func, **kwargs)).result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop any started pools; they are recreated on next use."""
+        if self._threads is not None:
+            self._threads.shutdown(wait=wait)
+            self._threads = None
+        if self._processes is not None:
+            self._processes.shutdown(wait=wait)
+            self._processes = None
+
+    def _executor(self, mode: ExecutionMode) -> Executor:
+        if mode is ExecutionMode.PROCESS:
+            if self._processes is None:
+                # Imported here because it pulls in multiprocessing, which most servers never use.
+                from concurrent.futures import ProcessPoolExecutor
+
+                self._processes = ProcessPoolExecutor(max_workers=self.max_processes)
+            return self._processes
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                max_workers=self.max_threads, thread_name_prefix="mcp-tool"
+            )
+        return self._threads
@@ -0,0 +1,217 @@
+"""Incremental framing of JSON-RPC messages from a byte stream.
+
+Framers accept chunks of any size, as read from a pipe or socket, and yield
+each complete message as a memoryview. A message that arrives within a
+single chunk is a slice of that chunk; one split across chunks is joined
+exactly once when its last byte arrives, so large messages cost linear time.
+Chunks are referenced rather than copied and must not be mutated after they
+are fed.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterator
+
+from mcp_starter.protocol import INVALID_REQUEST, ProtocolError
+
+DEFAULT_MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+MAX_HEADER_SIZE = 8 * 1024
+_WHITESPACE = frozenset(b" \t\r\n")
+
+
+class MessageTooLargeError(ProtocolError):
+    """Raised when a message exceeds the framer's ``max_message_size``.
+
+    The oversized message is discarded as it streams in; input after it is
+    kept and framed by the next ``feed`` call.
+    """
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"Message exceeds {limit} bytes", INVALID_REQUEST)
+
+
+class Framer(ABC):
+    """Base class holding the unconsumed input and the parts of a partial message."""
+
+    def __init__(self, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE) -> None:
+        if max_message_size < 1:
+            raise ValueError("max_message_size must be at least 1")
+        self.max_message_size = max_message_size
+        self._input: deque[tuple[bytes | bytearray, int]] = deque()
+        self._parts: list[memoryview] = []
+        self._size = 0
+        self._skipping = False
+
+    def feed(self, data: bytes | bytearray | memoryview) -> Iterator[memoryview]:
+        """Add a chunk of input and yield every message it completes.
+
+        Raises:
+            MessageTooLargeError: If a message exceeds ``max_message_size``.
+                Input already fed is retained; call ``feed(b"")`` to continue.
+            ProtocolError: If a header block is malformed.
+        """
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if data:
+            self._input.append((data, 0))
+        return self._frames()
+
+    def finish(self) -> Iterator[memoryview]:
+        """Yield a trailing message left unterminated at end of input, if any."""
+        return iter(())
+
+    @staticmethod
+    @abstractmethod
+    def wrap(message: bytes) -> tuple[bytes, ...]:
+        """Return the pieces to write for one outgoing message."""
+
+    @abstractmethod
+    def _frames(self) -> Iterator[memoryview]: ...
+
+    def _advance(self, pos: int) -> None:
+        buf = self._input[0][0]
+        if pos >= len(buf):
+            self._input.popleft()
+        else:
+            self._input[0] = (buf, pos)
+
+    def _collect(self, piece: memoryview, final: bool = False) -> None:
+        """Buffer part of the current message, enforcing the size limit.
+
+        Unless ``piece`` is the end of the message, the rest of an oversized
+        message is skipped as it arrives.
+        """
+        if self._skipping:
+            return
+        self._size += len(piece)
+        if self._size > self.max_message_size:
+            self._reset(skipping=not final)
+            raise MessageTooLargeError(self.max_message_size)
+        self._parts.append(piece)
+
+    def _complete(self) -> memoryview:
+        parts = self._parts
+        message = parts[0] if len(parts) == 1 else memoryview(b"".join(parts))
+        self._reset()
+        return message
+
+    def _reset(self, skipping: bool = False) -> None:
+        self._parts = []
+        self._size = 0
+        self._skipping = skipping
+
+
+class NewlineFramer(Framer):
+    """Frames newline-delimited messages, skipping blank lines.
+
+    Each byte is scanned once: searches resume where the previous chunk
+    ended rather than rescanning the partial message.
+    """
+
+    @staticmethod
+    def wrap(message: bytes) -> tuple[bytes, ...]:
+        return (message, b"\n")
+
+    def finish(self) -> Iterator[memoryview]:
+        if self._parts and not self._skipping:
+            message = self._complete()
+            if not _is_blank(message):
+                yield message
+        self._reset()
+
+    def _frames(self) -> Iterator[memoryview]:
+        while self._input:
+            buf, pos = self._input[0]
+            end = buf.find(b"\n", pos)
+            if end < 0:
+                self._advance(len(buf))
+                self._collect(memoryview(buf)[pos:])
+                continue
+            self._advance(end + 1)
+            if self._skipping:
+                self._reset()
+                continue
+            self._collect(memoryview(buf)[pos:end], final=True)
+            message = self._complete()
+            if not _is_blank(message):
+                yield message
+
+
+class ContentLengthFramer(Framer):
+    """Frames messages preceded by a ``Content-Length: N`` header block.
+
+    Header blocks end with a blank ``\\r\\n`` line, as in the Language
+    Server Protocol; other headers are ignored.
+    """
+
+    def __init__(self, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE) -> None:
+        super().__init__(max_message_size)
+        self._header = bytearray()
+        self._remaining: int | None = None
+
+    @staticmethod
+    def wrap(message: bytes) -> tuple[bytes, ...]:
+        return (b"Content-Length: %d\r\n\r\n" % len(message), message)
+
+    def _frames(self) -> Iterator[memoryview]:
+        while self._input:
+            if self._remaining is None:
+                self._read_header()
+                if self._remaining == 0:
+                    # An empty body still gets a (parse error) response.
+                    self._remaining = None
+                    yield memoryview(b"")
+                continue
+            buf, pos = self._input[0]
+            take = min(self._remaining, len(buf) - pos)
+            self._advance(pos + take)
+            self._remaining -= take
+            self._collect(memoryview(buf)[pos:pos + take])
+            if self._remaining == 0:
+                self._remaining = None
+                if self._skipping:
+                    self._reset()
+                else:
+                    yield self._complete()
+
+    def _read_header(self) -> None:
+        buf, pos = self._input[0]
+        start = len(self._header)
+        window = buf[pos:pos + MAX_HEADER_SIZE - start]
+        self._header += window
+        end = self._header.find(b"\r\n\r\n", max(0, start - 3))
+        if end < 0:
+            self._advance(pos + len(window))
+            if len(self._header) >= MAX_HEADER_SIZE:
+                self._header.clear()
+                raise ProtocolError("Header block too large")
+            return
+        self._advance(pos + end + 4 - start)
+        header = bytes(self._header[:end])
+        self._header.clear()
+        length = _content_length(header)
+        self._remaining = length
+        if length > self.max_message_size:
+            self._skipping = True
+            raise MessageTooLargeError(self.max_message_size)
+
+
+def _content_length(header: bytes) -> int:
+    for line in header.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            try:
+                length = int(value.strip())
+            except ValueError:
+                break
+            if length >= 0:
+                return length
+            break
+    else:
+        raise ProtocolError("Missing Content-Length header")
+    raise ProtocolError("Invalid Content-Length header")
+
+
+def _is_blank(message: memoryview) -> bool:
+    # Only lines starting with whitespace can be blank, so valid JSON is never copied.
+    return not message or (message[0] in _WHITESPACE and not message.tobytes().strip())
@@ -0,0 +1,552 @@
+"""Streamable HTTP transport: JSON-RPC over POST, notifications over server-sent events.
+
+A single endpoint, ``/mcp`` by default, accepts three methods:
+
+* ``POST`` carries a JSON-RPC message or batch. The reply is normally a
+  JSON response. If the client accepts ``text/event-stream`` and the
+  request sends notifications before it finishes, such as progress from
+  a streaming tool, the reply is an event stream instead: the
+  notifications first, then the response.
+* ``GET`` with ``Accept: text/event-stream`` opens a stream of
+  server-initiated notifications, such as ``list_changed``.
+* ``DELETE`` ends a session.
+
+Connections are persistent (HTTP/1.1 keep-alive), and all request
+handling happens on the event loop, with no thread per request. Tool
+handlers still run wherever their ``ExecutionMode`` puts them.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import secrets
+import socket
+import time
+from contextvars import ContextVar
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Callable, Collection
+
+from mcp_starter.framing import DEFAULT_MAX_MESSAGE_SIZE
+from mcp_starter.protocol import INVALID_REQUEST, ProtocolError
+from mcp_starter.server import REQUEST_NOTIFICATION, REQUEST_SCOPE
+from mcp_starter.transport import DEFAULT_MAX_IN_FLIGHT
+
+if TYPE_CHECKING:
+    from mcp_starter.server import MCPServer
+
+DEFAULT_PATH = "/mcp"
+DEFAULT_KEEPALIVE = 15.0
+DEFAULT_IDLE_TIMEOUT = 60.0
+DEFAULT_SESSION_TIMEOUT = 3600.0
+DEFAULT_EVENT_BUFFER = 256
+SESSION_HEADER = "Mcp-Session-Id"
+JSON_CONTENT_TYPE = "application/json"
+SSE_CONTENT_TYPE = "text/event-stream"
+
+Event = tuple[bool, bytes | None]
+
+# Notifications about a POST's request, such as progress, are routed to its reply.
+_request_events: ContextVar["asyncio.Queue[Event] | None"] = ContextVar(
+    "mcp_http_request_events", default=None
+)
+
+
+class _HTTPError(Exception):
+    """Answered with ``status`` and a JSON-RPC error body."""
+
+    def __init__(self, status: int, message: str, code: int = INVALID_REQUEST) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.code = code
+
+
+class _Request:
+    __slots__ = ("method", "target", "version", "headers", "body")
+
+    def __init__(
+        self, method: str, target: str, version: str, headers: dict[str, str], body: bytes
+    ) -> None:
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def path(self) -> str:
+        return self.target.partition("?")[0]
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return "keep-alive" in connection
+        return "close" not in connection
+
+    def accepts(self, media_type: str) -> bool:
+        return media_type in self.headers.get("accept", "")
+
+
+class _Session:
+    """A client's session id, its open event streams and when it was last used."""
+
+    __slots__ = ("id", "last_used", "streams")
+
+    def __init__(self, session_id: str, now: float) -> None:
+        self.id = session_id
+        self.last_used = now
+        self.streams: set[asyncio.Queue[bytes | None]] = set()
+
+    def push(self, message: bytes) -> None:
+        for queue in list(self.streams):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # A client this far behind is disconnected rather than buffered for.
+                self.streams.discard(queue)
+                _end_stream(queue)
+
+    def close(self) -> None:
+        for queue in self.streams:
+            _end_stream(queue)
+        self.streams.clear()
+
+
+class _EventStream:
+    """Writes server-sent events to a response, chunk-encoded unless on HTTP/1.0."""
+
+    def __init__(self, writer: asyncio.StreamWriter, chunked: bool) -> None:
+        self.writer = writer
+        self.chunked = chunked
+
+    async def send(self, message: bytes) -> None:
+        await self._write(b"event: message\ndata: " + message + b"\n\n")
+
+    async def ping(self) -> None:
+        await self._write(b": ping\n\n")
+
+    async def end(self) -> None:
+        if self.chunked:
+            self.writer.write(b"0\r\n\r\n")
+            await self.writer.drain()
+
+    async def _write(self, payload: bytes) -> None:
+        if self.chunked:
+            self.writer.writelines((b"%x\r\n" % len(payload), payload, b"\r\n"))
+        else:
+            self.writer.write(payload)
+        await self.writer.drain()
+
+
+class HTTPTransport:
+    """Serves an ``MCPServer`` over the MCP Streamable HTTP transport.
+
+    ``initialize`` creates a session, and the client sends its id in the
+    ``Mcp-Session-Id`` header on every later request. Request ids are
+    scoped to their session, so clients cannot cancel each other's calls.
+    Sessions without an open stream expire after ``session_timeout``
+    seconds idle.
+
+    A connection handles its requests in order; clients wanting concurrent
+    calls open several connections. At most ``max_in_flight`` POSTs are
+    dispatched at once. Event streams send a comment every ``keepalive``
+    seconds to keep intermediaries from timing them out. A ``GET`` stream
+    whose client falls ``event_buffer`` events behind is closed; a ``POST``
+    reply that far behind drops further notifications but still gets its
+    response.
+
+    Sessions idle for ``session_timeout`` seconds expire. With a
+    ``session_secret``, session ids are signed and carry their creation
+    time, and an id this transport has not seen is accepted if its
+    signature is valid and it was created less than ``session_timeout`` ago.
+    Several transports sharing the secret, such as prefork workers, then
+    accept each other's sessions. Ids deleted or expired on this transport
+    are refused here, like unknown ones.
+
+    ``Origin`` headers are rejected unless listed in ``allowed_origins``
+    when it is given. Resuming streams with ``Last-Event-ID`` and chunked
+    request bodies are not supported.
+    """
+
+    def __init__(
+        self,
+        server: "MCPServer",
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        path: str = DEFAULT_PATH,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        keepalive: float = DEFAULT_KEEPALIVE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        session_timeout: float = DEFAULT_SESSION_TIMEOUT,
+        event_buffer: int = DEFAULT_EVENT_BUFFER,
+        max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE,
+        allowed_origins: Collection[str] | None = None,
+        session_secret: bytes | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if event_buffer < 1:
+            raise ValueError("event_buffer must be at least 1")
+        if keepalive <= 0 or idle_timeout <= 0 or session_timeout <= 0:
+            raise ValueError("keepalive and timeouts must be positive")
+        self.server = server
+        self.host = host
+        self.port = port
+        self.path = path
+        self.keepalive = keepalive
+        self.idle_timeout = idle_timeout
+        self.session_timeout = session_timeout
+        self.event_buffer = event_buffer
+        self.max_message_size = max_message_size
+        self.allowed_origins = allowed_origins
+        self.session_secret = session_secret
+        self._clock = clock
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._sessions: dict[str, _Session] = {}
+        # Ended signed ids, until their signature check rejects them by age.
+        self._ended: dict[str, float] = {}
+        self._connections: set[asyncio.Task[Any]] = set()
+        self._listener: asyncio.Server | None = None
+        self._sink: Callable[[bytes], None] | None = None
+
+    @property
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+    async def start(self, sock: socket.socket | None = None) -> asyncio.Server:
+        """Start listening and return the listening server.
+
+        With ``port=0`` the OS picks a free port, which is then stored in
+        ``self.port``.
+
+        Args:
+            sock: An already listening socket to accept connections from
+                instead of binding ``host`` and ``port``.
+        """
+        loop = asyncio.get_running_loop()
+
+        def sink(message: bytes) -> None:
+            # Notifications may come from other threads; queues are only touched on the loop.
+            events = _request_events.get()
+            if events is not None and REQUEST_NOTIFICATION.get():
+                loop.call_soon_threadsafe(_put_event, events, message)
+            else:
+                loop.call_soon_threadsafe(self._broadcast, message)
+
+        self.server.add_notification_sink(sink)
+        self._sink = sink
+        if sock is not None:
+            self._listener = await asyncio.start_server(self.handle_connection, sock=sock)
+        else:
+            self._listener = await asyncio.start_server(
+                self.handle_connection, self.host, self.port
+            )
+        self.port = self._listener.sockets[0].getsockname()[1]
+        return self._listener
+
+    async def close(self) -> None:
+        """Stop listening, end every event stream and close open connections."""
+        if self._sink is not None:
+            self.server.remove_notification_sink(self._sink)
+            self._sink = None
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+        for task in list(self._connections):
+            task.cancel()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if listener is not None:
+            await listener.wait_closed()
+
+    async def serve_forever(self) -> None:
+        """Start listening and serve until cancelled."""
+        listener = await self.start()
+        try:
+            await listener.serve_forever()
+        finally:
+            await self.close()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve requests from one connection until it closes or stays idle too long."""
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await self._read_request(reader)
+                except _HTTPError as e:
+                    await self._send_error(writer, e, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                try:
+                    keep_alive = await self._route(request, writer)
+                except _HTTPError as e:
+                    keep_alive = request.keep_alive
+                    await self._send_error(writer, e, keep_alive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Cancelled by close(). This task is the top of the connection, and
+            # asyncio.start_server logs an error for callbacks that end cancelled.
+            pass
+        finally:
+            self._connections.discard(task)  # type: ignore[arg-type]
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> _Request | None:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.idle_timeout)
+        except (asyncio.IncompleteReadError, TimeoutError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise _HTTPError(431, "Request header block too large")
+        lines = head[:-4].decode("latin-1").lstrip("\r\n").split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise _HTTPError(400, "Malformed request line")
+        headers: dict[str, str] = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise _HTTPError(400, "Malformed header line")
+            name, value = name.strip().lower(), value.strip()
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+        if "transfer-encoding" in headers:
+            raise _HTTPError(501, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise _HTTPError(400, "Invalid Content-Length header")
+        if length > self.max_message_size:
+            raise _HTTPError(413, f"Message exceeds {self.max_message_size} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return _Request(parts[0], parts[1], parts[2], headers, body)
+
+    async def _route(self, request: _Request, writer: asyncio.StreamWriter) -> bool:
+        """Answer one request and return whether the connection stays open."""
+        if request.path != self.path:
+            raise _HTTPError(404, f"Not found: {request.path}")
+        origin = request.headers.get("origin")
+        if origin is not None and self.allowed_origins is not None:
+            if origin not in self.allowed_origins:
+                raise _HTTPError(403, f"Origin not allowed: {origin}")
+        if request.method == "POST":
+            return await self._post(request, writer)
+        if request.method == "GET":
+            return await self._get(request, writer)
+        if request.method == "DELETE":
+            return await self._delete(request, writer)
+        raise _HTTPError(405, f"Method not allowed: {request.method}")
+
+    async def _post(self, request: _Request, writer: asyncio.StreamWriter) -> bool:
+        session = self._find_session(request)
+        try:
+            message = self.server.protocol.parse_message(request.body)
+        except ProtocolError as e:
+            raise _HTTPError(400, e.message, e.code)
+        if session is None:
+            if not (isinstance(message, dict) and message["method"] == "initialize"):
+                raise _HTTPError(400, f"Missing {SESSION_HEADER} header")
+            session = self._create_session()
+        # One slot beyond the buffer is kept for the response; see _put_event.
+        events: asyncio.Queue[Event] = asyncio.Queue(self.event_buffer + 1)
+        async with self._slots:
+            task = asyncio.create_task(self._dispatch(message, session.id, events))
+            try:
+                return await self._reply(request, writer, session, events)
+            finally:
+                # Stops the call if the client disconnected before it finished.
+                task.cancel()
+
+    async def _dispatch(
+        self, message: dict[str, Any] | list[Any], session_id: str, events: "asyncio.Queue[Event]"
+    ) -> None:
+        # This runs in its own task, so the context variables only apply to this request.
+        REQUEST_SCOPE.set(session_id)
+        _request_events.set(events)
+        response = None
+        try:
+            if isinstance(message, list):
+                response = await self.server.handle_batch(message)
+            else:
+                response = await self.server.handle_message(message)
+        finally:
+            # call_soon queues the response behind notifications already scheduled.
+            asyncio.get_running_loop().call_soon(events.put_nowait, (True, response))
+
+    async def _reply(
+        self,
+        request: _Request,
+        writer: asyncio.StreamWriter,
+        session: _Session,
+        events: "asyncio.Queue[Event]",
+    ) -> bool:
+        headers = [(SESSION_HEADER, session.id)]
+        final, data = await events.get()
+        if not final and request.accepts(SSE_CONTENT_TYPE):
+            stream = self._open_stream(request, writer, headers)
+            while not final:
+                await stream.send(data)  # type: ignore[arg-type]
+                final, data = await self._next_event(events, stream)
+            if data is not None:
+                await stream.send(data)
+            await stream.end()
+            return stream.chunked and request.keep_alive
+        while not final:
+            # Without an event stream on this request, use the session's GET streams.
+            session.push(data)  # type: ignore[arg-type]
+            final, data = await events.get()
+        session.last_used = self._clock()
+        if data is None:
+            headers.append(("Content-Length", "0"))
+            writer.write(_head(202, headers, request.keep_alive))
+        else:
+            headers += [("Content-Type", JSON_CONTENT_TYPE), ("Content-Length", str(len(data)))]
+            writer.writelines((_head(200, headers, request.keep_alive), data))
+        await writer.drain()
+        return request.keep_alive
+
+    async def _get(self, request: _Request, writer: asyncio.StreamWriter) -> bool:
+        if not request.accepts(SSE_CONTENT_TYPE):
+            raise _HTTPError(406, f"GET requires Accept: {SSE_CONTENT_TYPE}")
+        session = self._require_session(request)
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(self.event_buffer)
+        session.streams.add(queue)
+        try:
+            stream = self._open_stream(request, writer, [(SESSION_HEADER, session.id)])
+            while (message := await self._next_event(queue, stream)) is not None:
+                await stream.send(message)
+            await stream.end()
+        finally:
+            session.streams.discard(queue)
+            session.last_used = self._clock()
+        return stream.chunked and request.keep_alive
+
+    async def _delete(self, request: _Request, writer: asyncio.StreamWriter) -> bool:
+        session = self._require_session(request)
+        self._end_session(session)
+        writer.write(_head(200, [("Content-Length", "0")], request.keep_alive))
+        await writer.drain()
+        return request.keep_alive
+
+    def _open_stream(
+        self, request: _Request, writer: asyncio.StreamWriter, headers: list[tuple[str, str]]
+    ) -> _EventStream:
+        chunked = request.version != "HTTP/1.0"
+        headers = [("Content-Type", SSE_CONTENT_TYPE), ("Cache-Control", "no-cache"), *headers]
+        if chunked:
+            headers.append(("Transfer-Encoding", "chunked"))
+        writer.write(_head(200, headers, chunked and request.keep_alive))
+        return _EventStream(writer, chunked)
+
+    async def _next_event(self, queue: "asyncio.Queue[Any]", stream: _EventStream) -> Any:
+        while True:
+            try:
+                return await asyncio.wait_for(queue.get(), self.keepalive)
+            except TimeoutError:
+                await stream.ping()
+
+    def _find_session(self, request: _Request) -> _Session | None:
+        session_id = request.headers.get(SESSION_HEADER.lower())
+        if session_id is None:
+            return None
+        now = self._clock()
+        session = self._sessions.get(session_id)
+        if session is not None and self._expired(session, now):
+            self._end_session(session)
+            session = None
+        elif session is None and self._is_signed(session_id, now):
+            session = self._sessions[session_id] = _Session(session_id, now)
+        if session is None:
+            raise _HTTPError(404, "Unknown or expired session")
+        session.last_used = now
+        return session
+
+    def _require_session(self, request: _Request) -> _Session:
+        session = self._find_session(request)
+        if session is None:
+            raise _HTTPError(400, f"Missing {SESSION_HEADER} header")
+        return session
+
+    def _create_session(self) -> _Session:
+        now = self._clock()
+        for session in [s for s in self._sessions.values() if self._expired(s, now)]:
+            self._end_session(session)
+        self._ended = {k: until for k, until in self._ended.items() if until > now}
+        session_id = secrets.token_hex(16)
+        if self.session_secret is not None:
+            session_id += f"-{int(now):x}"
+            session_id += "." + self._signature(session_id)
+        session = _Session(session_id, now)
+        self._sessions[session.id] = session
+        return session
+
+    def _signature(self, token: str) -> str:
+        assert self.session_secret is not None
+        return hmac.new(self.session_secret, token.encode(), hashlib.sha256).hexdigest()[:32]
+
+    def _is_signed(self, session_id: str, now: float) -> bool:
+        """Whether another transport sharing the secret may have created this live id."""
+        if self.session_secret is None or session_id in self._ended:
+            return False
+        token, _, signature = session_id.partition(".")
+        # Headers are decoded as latin-1, and compare_digest rejects non-ASCII str.
+        if not hmac.compare_digest(signature.encode("latin-1"), self._signature(token).encode()):
+            return False
+        return now - int(token.rpartition("-")[2], 16) <= self.session_timeout
+
+    def _expired(self, session: _Session, now: float) -> bool:
+        return not session.streams and now - session.last_used > self.session_timeout
+
+    def _end_session(self, session: _Session) -> None:
+        del self._sessions[session.id]
+        session.close()
+        self.server.end_session(session.id)
+        if self.session_secret is not None:
+            created = int(session.id.partition(".")[0].rpartition("-")[2], 16)
+            self._ended[session.id] = created + self.session_timeout + 1
+
+    def _broadcast(self, message: bytes) -> None:
+        for session in self._sessions.values():
+            session.push(message)
+
+    async def _send_error(
+        self, writer: asyncio.StreamWriter, error: _HTTPError, keep_alive: bool
+    ) -> None:
+        body = self.server.protocol.build_error(None, error.code, error.message)
+        headers = [("Content-Type", JSON_CONTENT_TYPE), ("Content-Length", str(len(body)))]
+        writer.writelines((_head(error.status, headers, keep_alive), body))
+        await writer.drain()
+
+
+def _head(status: int, headers: list[tuple[str, str]], keep_alive: bool) -> bytes:
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    if not keep_alive:
+        lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def _put_event(events: "asyncio.Queue[Event]", message: bytes) -> None:
+    # Notifications for a reply this far behind are dropped, so the response still fits.
+    if events.qsize() < events.maxsize - 1:
+        events.put_nowait((False, message))
+
+
+def _end_stream(queue: "asyncio.Queue[bytes | None]") -> None:
+    while not queue.empty():
+        queue.get_nowait()
+    queue.put_nowait(None)
@@ -0,0 +1,184 @@
+"""Concurrency limits with bounded wait queues, and token-bucket rate limits."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+from mcp_starter.models import ConcurrencyLimit, RateLimit
+from mcp_starter.protocol import RATE_LIMITED, SERVER_OVERLOADED, ProtocolError
+
+DEFAULT_MAX_BUCKETS = 10_000
+
+
+class OverloadedError(ProtocolError):
+    """Raised when a call is rejected because the wait queue is full."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message, SERVER_OVERLOADED)
+
+
+class RateLimitedError(ProtocolError):
+    """Raised when a call exceeds a rate limit.
+
+    ``retry_after`` is the number of seconds until the call would be
+    admitted; it is sent to the client as ``{"retryAfter": seconds}`` in the
+    JSON-RPC error's ``data``.
+    """
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message, RATE_LIMITED, {"retryAfter": retry_after})
+        self.retry_after = retry_after
+
+
+@dataclass
+class LimiterStats:
+    """Snapshot of a concurrency limiter."""
+
+    active: int = 0
+    waiting: int = 0
+    rejected: int = 0
+    max_concurrent: int = 0
+    max_queue: int = 0
+
+
+class ConcurrencyLimiter:
+    """Admits up to ``max_concurrent`` holders and queues at most ``max_queue`` more.
+
+    Released slots are handed to the oldest waiter directly, so queued calls
+    are served in arrival order. Calls arriving when the queue is full fail
+    immediately with ``OverloadedError``.
+    """
+
+    def __init__(self, limit: ConcurrencyLimit, name: str = "server") -> None:
+        self.limit = limit
+        self.name = name
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._rejected = 0
+
+    async def acquire(self) -> None:
+        """Wait for a slot.
+
+        Raises:
+            OverloadedError: If all slots are busy and the wait queue is full.
+        """
+        if self._active < self.limit.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+        if len(self._waiters) >= self.limit.max_queue:
+            self._rejected += 1
+            raise OverloadedError(f"Too many concurrent calls for {self.name}, try again later")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on.
+                self.release()
+            elif waiter in self._waiters:
+                # A release in the same tick may already have dropped it.
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Return a slot, handing it to the next waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.release()
+
+    def stats(self) -> LimiterStats:
+        """Return current occupancy, queue depth and rejection count."""
+        return LimiterStats(
+            active=self._active,
+            waiting=len(self._waiters),
+            rejected=self._rejected,
+            max_concurrent=self.limit.max_concurrent,
+            max_queue=self.limit.max_queue,
+        )
+
+
+class RateLimiter:
+    """One token bucket per key, such as a client session.
+
+    Each bucket holds up to ``limit.burst`` tokens, refills at ``limit.rate``
+    tokens per second and pays one token per admitted call. Buckets are
+    refilled when checked rather than on a timer, so ``check`` is O(1).
+
+    Buckets are kept in least recently used order. A bucket left idle long
+    enough to refill completely is the same as a new one and is dropped when
+    a new key is added. At most ``max_buckets`` are kept: beyond that the least
+    recently used bucket is dropped even if it has not refilled, which gives
+    that key a fresh, full bucket on its next call.
+    """
+
+    def __init__(
+        self,
+        limit: RateLimit,
+        name: str = "server",
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_buckets < 1:
+            raise ValueError("max_buckets must be at least 1")
+        self.limit = limit
+        self.name = name
+        self.max_buckets = max_buckets
+        self.rejected = 0
+        self._clock = clock
+        self._refill_time = limit.burst / limit.rate
+        # key -> [tokens, time of last update]
+        self._buckets: OrderedDict[Hashable, list[float]] = OrderedDict()
+        # Sync tool calls may check from several threads.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def check(self, key: Hashable) -> None:
+        """Take a token from ``key``'s bucket.
+
+        Raises:
+            RateLimitedError: If the bucket is empty.
+        """
+        with self._lock:
+            now = self._clock()
+            buckets = self._buckets
+            bucket = buckets.get(key)
+            if bucket is None:
+                self._evict(now)
+                bucket = buckets[key] = [float(self.limit.burst), now]
+            else:
+                buckets.move_to_end(key)
+                tokens = bucket[0] + (now - bucket[1]) * self.limit.rate
+                bucket[0] = min(tokens, self.limit.burst)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return
+            self.rejected += 1
+            retry_after = (1 - bucket[0]) / self.limit.rate
+        raise RateLimitedError(
+            f"Rate limit exceeded for {self.name}, retry after {retry_after:.3g}s", retry_after
+        )
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if len(buckets) < self.max_buckets and now - oldest[1] < self._refill_time:
+                break
+            buckets.popitem(last=False)
@@ -0,0 +1,194 @@
+"""Low-overhead in-process metrics with Prometheus text export."""
+
+import math
+from bisect import bisect_left
+from typing import Iterator
+
+# Latency buckets in seconds: 25us doubling up to ~52s.
+DEFAULT_BUCKETS: tuple[float, ...] = tuple(25e-6 * 2**i for i in range(22))
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is a bisect plus three increments."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the observations of a histogram with the same bounds."""
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge histograms with different bounds")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile by interpolating within its bucket.
+
+        Returns NaN when nothing has been observed.
+        """
+        if self.count == 0:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+
+class MetricFamily:
+    """A named metric with one label dimension (e.g. ``tool``)."""
+
+    def __init__(self, name: str, help: str, kind: str, label: str) -> None:
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.label = label
+        self.values: dict[str, float] = {}
+        self.histograms: dict[str, Histogram] = {}
+
+    def inc(self, label_value: str, amount: float = 1) -> None:
+        self.values[label_value] = self.values.get(label_value, 0) + amount
+
+    def histogram(self, label_value: str) -> Histogram:
+        hist = self.histograms.get(label_value)
+        if hist is None:
+            hist = self.histograms[label_value] = Histogram()
+        return hist
+
+    def merge(self, other: "MetricFamily") -> None:
+        """Add another family's values and histograms, label by label."""
+        for label_value, amount in other.values.items():
+            self.inc(label_value, amount)
+        for label_value, hist in other.histograms.items():
+            self.histogram(label_value).merge(hist)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        if self.kind == "histogram":
+            for value, hist in sorted(self.histograms.items()):
+                label = f'{self.label}="{_escape(value)}"'
+                cumulative = 0
+                for bound, n in zip(hist.bounds, hist.counts):
+                    cumulative += n
+                    yield f'{self.name}_bucket{{{label},le="{bound:.6g}"}} {cumulative}'
+                yield f'{self.name}_bucket{{{label},le="+Inf"}} {hist.count}'
+                yield f"{self.name}_sum{{{label}}} {hist.sum:.9g}"
+                yield f"{self.name}_count{{{label}}} {hist.count}"
+        else:
+            for value, number in sorted(self.values.items()):
+                yield f'{self.name}{{{self.label}="{_escape(value)}"}} {number:g}'
+
+
+class ServerMetrics:
+    """Per-method and per-tool counters, latency histograms and in-flight gauges.
+
+    Updates are plain attribute and dict operations without locking; they
+    are exact on the event loop and may undercount under heavy contention
+    from the sync ``handle_call_tool`` path in several threads.
+    """
+
+    def __init__(self) -> None:
+        self.requests = MetricFamily(
+            "mcp_requests_total", "JSON-RPC requests handled.", "counter", "method"
+        )
+        self.request_errors = MetricFamily(
+            "mcp_request_errors_total", "JSON-RPC requests answered with an error.",
+            "counter", "method",
+        )
+        self.request_latency = MetricFamily(
+            "mcp_request_duration_seconds", "JSON-RPC request latency.", "histogram", "method"
+        )
+        self.requests_in_flight = MetricFamily(
+            "mcp_requests_in_flight", "JSON-RPC requests currently running.", "gauge", "method"
+        )
+        self.tool_calls = MetricFamily(
+            "mcp_tool_calls_total", "Tool calls handled.", "counter", "tool"
+        )
+        self.tool_errors = MetricFamily(
+            "mcp_tool_errors_total", "Tool calls that returned an error.", "counter", "tool"
+        )
+        self.tool_latency = MetricFamily(
+            "mcp_tool_duration_seconds", "Tool call latency.", "histogram", "tool"
+        )
+        self.tools_in_flight = MetricFamily(
+            "mcp_tool_calls_in_flight", "Tool calls currently running.", "gauge", "tool"
+        )
+        self.validation_failures = MetricFamily(
+            "mcp_tool_validation_failures_total", "Tool calls rejected by argument validation.",
+            "counter", "tool",
+        )
+        self._families = [
+            self.requests,
+            self.request_errors,
+            self.request_latency,
+            self.requests_in_flight,
+            self.tool_calls,
+            self.tool_errors,
+            self.tool_latency,
+            self.tools_in_flight,
+            self.validation_failures,
+        ]
+
+    def request_started(self, method: str) -> None:
+        self.requests_in_flight.inc(method)
+
+    def request_finished(self, method: str, elapsed: float, is_error: bool) -> None:
+        self.requests_in_flight.inc(method, -1)
+        self.requests.inc(method)
+        if is_error:
+            self.request_errors.inc(method)
+        self.request_latency.histogram(method).observe(elapsed)
+
+    def tool_started(self, tool: str) -> None:
+        self.tools_in_flight.inc(tool)
+
+    def tool_finished(self, tool: str, elapsed: float, is_error: bool) -> None:
+        self.tools_in_flight.inc(tool, -1)
+        self.tool_calls.inc(tool)
+        if is_error:
+            self.tool_errors.inc(tool)
+        self.tool_latency.histogram(tool).observe(elapsed)
+
+    def validation_failed(self, tool: str) -> None:
+        self.validation_failures.inc(tool)
+
+    def merge(self, other: "ServerMetrics", gauges: bool = True) -> None:
+        """Add another server's metrics to these, e.g. to total several processes.
+
+        Pass ``gauges=False`` to leave out the other server's in-flight
+        gauges, as for a process that has exited.
+        """
+        for mine, theirs in zip(self._families, other._families):
+            if gauges or mine.kind != "gauge":
+                mine.merge(theirs)
+
+    def tool_percentiles(self, tool: str) -> dict[str, float]:
+        """Return estimated p50/p95/p99 latency in seconds for a tool."""
+        hist = self.tool_latency.histogram(tool)
+        return {"p50": hist.quantile(0.5), "p95": hist.quantile(0.95), "p99": hist.quantile(0.99)}
+
+    def render_prometheus(self) -> str:
+        """Dump every metric in the Prometheus text exposition format."""
+        lines = [line for family in self._families for line in family.render()]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,8 +1,15 @@
+import importlib
+import inspect
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable
 
+from mcp_starter.content import ContentBlock, ResourceLink, TextContent
+from mcp_starter.resources import ResourceReader
+
 DEFAULT_MIME_TYPE = "text/plain"
+DEFAULT_CACHE_ENTRIES = 1024
+DEFAULT_SPOOL_TTL = 300.0
 
 
 class ToolParamType(Enum):
@@ -14,6 +21,18 @@ class ToolParamType(Enum):
     NUMBER = "number"
 
 
+class ExecutionMode(Enum):
+    """Where a synchronous tool handler runs.
+
+    ``handle_call_tool`` blocks its caller anyway, so it runs THREAD tools
+    inline and honours only PROCESS.
+    """
+
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
 @dataclass
 class ToolParam:
     """Definition of a single parameter accepted by a tool."""
@@ -24,37 +43,239 @@ class ToolParam:
     required: bool = True
 
 
+@dataclass(frozen=True)
+class CachePolicy:
+    """Opt-in result caching settings for a tool.
+
+    ``ttl`` is in seconds; ``max_bytes`` bounds the summed content length of
+    cached results. None disables the corresponding limit.
+    """
+
+    max_entries: int = DEFAULT_CACHE_ENTRIES
+    ttl: float | None = None
+    max_bytes: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if self.max_bytes is not None and self.max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+
+
+@dataclass(frozen=True)
+class SpoolPolicy:
+    """Server-wide settings for moving large tool results out of responses.
+
+    Results longer than ``threshold`` characters are written to a temp file
+    in ``directory`` (the system default if None) and served as a resource
+    for ``ttl`` seconds.
+    """
+
+    threshold: int
+    ttl: float = DEFAULT_SPOOL_TTL
+    directory: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.threshold < 1:
+            raise ValueError("threshold must be at least 1")
+        if self.ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+
+@dataclass(frozen=True)
+class ConcurrencyLimit:
+    """Bounds how many calls run at once and how many may wait for a slot."""
+
+    max_concurrent: int
+    max_queue: int = 0
+
+    def __post_init__(self) -> None:
+        if self.max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if self.max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token-bucket rate: ``rate`` calls per second on average, bursts of up to ``burst``."""
+
+    rate: float
+    burst: int = 1
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0:
+            raise ValueError("rate must be positive")
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+
+
 @dataclass
 class ToolDefinition:
-    """Complete definition of a tool including its handler function."""
+    """Complete definition of a tool including its handler function.
+
+    ``is_async`` is derived from the handler and tells the server whether the
+    handler must be awaited; ``is_streaming`` marks generator and
+    async-generator handlers, whose chunks are joined into the result.
+    ``execution`` only applies to sync handlers;
+    process-pool handlers and their arguments must be picklable. ``cache``
+    enables memoization of successful results and ``coalesce`` lets concurrent
+    calls with equal arguments share one execution. ``limit`` bounds
+    concurrent executions of this tool and ``timeout`` is the default
+    deadline in seconds for a call.
+
+    ``handler`` may also be an import path such as ``"pkg.module:func"``.
+    The module is then imported by ``load`` on the first call, so listing
+    the tool never imports it; ``is_async`` and ``is_streaming`` are only
+    known once it is loaded.
+    """
 
     name: str
     description: str
     parameters: list[ToolParam] = field(default_factory=list)
-    handler: Callable[..., Any] | None = None
+    handler: Callable[..., Any] | str | None = None
+    execution: ExecutionMode = ExecutionMode.THREAD
+    cache: CachePolicy | None = None
+    coalesce: bool = False
+    limit: ConcurrencyLimit | None = None
+    timeout: float | None = None
+    rate_limit: RateLimit | None = None
+    is_async: bool = field(init=False, default=False)
+    is_streaming: bool = field(init=False, default=False)
+
+    def __post_init__(self) -> None:
+        if isinstance(self.handler, str):
+            _split_import_path(self.handler)  # Reject malformed paths at registration.
+            return
+        self.is_async = _is_coroutine_callable(self.handler)
+        self.is_streaming = _is_generator_callable(self.handler)
+
+    @property
+    def is_loaded(self) -> bool:
+        """False while the handler is still an unimported ``"module:attr"`` path."""
+        return not isinstance(self.handler, str)
+
+    def load(self) -> Callable[..., Any] | None:
+        """Import the handler if it was given as a path, and return it.
+
+        Raises:
+            ImportError: If the module cannot be imported or lacks the attribute.
+        """
+        if isinstance(self.handler, str):
+            handler = _import_handler(self.handler)
+            self.is_async = _is_coroutine_callable(handler)
+            self.is_streaming = _is_generator_callable(handler)
+            self.handler = handler
+        return self.handler
 
 
 @dataclass
 class ToolCallRequest:
-    """Incoming request to invoke a specific tool with arguments."""
+    """Incoming request to invoke a specific tool with arguments.
+
+    ``timeout`` overrides the tool's default deadline in seconds. When
+    ``progress_token`` is set, chunks from streaming handlers are sent as
+    ``notifications/progress`` carrying that token.
+    """
 
     tool_name: str
     arguments: dict[str, Any] = field(default_factory=dict)
+    timeout: float | None = None
+    progress_token: str | int | None = None
 
 
 @dataclass
 class ToolCallResponse:
-    """Result returned after executing a tool call."""
+    """Result returned after executing a tool call.
+
+    ``content`` is the text result. Results that are not plain text, such as
+    images, bytes or structured JSON, are carried in ``blocks`` instead.
+    ``resource_link`` is set when the result was too large to return inline;
+    ``content`` then describes it and the data is read from the resource.
+    """
 
     content: str = ""
     is_error: bool = False
+    resource_link: "Resource | None" = None
+    blocks: list[ContentBlock] = field(default_factory=list)
+
+    def content_blocks(self) -> list[ContentBlock]:
+        """Return every block to send: the text, the typed blocks, then any link."""
+        blocks: list[ContentBlock] = []
+        if self.content or not self.blocks:
+            blocks.append(TextContent(self.content))
+        blocks.extend(self.blocks)
+        link = self.resource_link
+        if link is not None:
+            blocks.append(ResourceLink(link.uri, link.name, link.description, link.mime_type))
+        return blocks
 
 
 @dataclass
 class Resource:
-    """An MCP resource exposed to clients."""
+    """An MCP resource exposed to clients.
+
+    ``reader`` supplies the contents for ``resources/read``; resources without
+    one are listed but cannot be read.
+    """
 
     uri: str
     name: str
     description: str = ""
     mime_type: str = DEFAULT_MIME_TYPE
+    reader: ResourceReader | None = None
+
+
+@dataclass
+class ResourceTemplate:
+    """A family of resources addressed by an RFC 6570 URI template.
+
+    Variables such as ``{name}`` in ``uri_template`` each match one path
+    segment; their values are passed to ``reader`` when a matching URI is read.
+    """
+
+    uri_template: str
+    name: str
+    description: str = ""
+    mime_type: str = DEFAULT_MIME_TYPE
+    reader: ResourceReader | None = None
+
+
+def _is_coroutine_callable(func: Callable[..., Any] | None) -> bool:
+    if func is None:
+        return False
+    if inspect.iscoroutinefunction(func):
+        return True
+    call = getattr(func, "__call__", None)
+    return inspect.iscoroutinefunction(call)
+
+
+def _is_generator_callable(func: Callable[..., Any] | None) -> bool:
+    if func is None:
+        return False
+    call = getattr(func, "__call__", None)
+    return any(
+        inspect.isgeneratorfunction(f) or inspect.isasyncgenfunction(f) for f in (func, call)
+    )
+
+
+def _split_import_path(path: str) -> tuple[str, str]:
+    module, sep, attr = path.partition(":")
+    if not sep or not module or not attr:
+        raise ValueError(f"Handler path must look like 'package.module:function', got {path!r}")
+    return module, attr
+
+
+def _import_handler(path: str) -> Callable[..., Any]:
+    module_name, attr = _split_import_path(path)
+    target: Any = importlib.import_module(module_name)
+    try:
+        for part in attr.split("."):
+            target = getattr(target, part)
+    except AttributeError:
+        raise ImportError(f"Module '{module_name}' has no attribute '{attr}'") from None
+    if not callable(target):
+        raise ImportError(f"'{path}' is not callable")
+    return target
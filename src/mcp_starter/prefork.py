@@ -0,0 +1,326 @@
+"""Prefork mode: a supervisor process serving HTTP through forked worker processes.
+
+The supervisor finishes setting up the server, then binds the listening
+socket and forks the workers. The registry, compiled validators, cached
+listings and imported tool modules all exist before the fork, so workers
+share them copy-on-write instead of each building their own. The objects
+are also frozen out of garbage collection, so collecting in a worker does
+not write to their pages and copy them. Each worker runs its own event
+loop and ``HTTPTransport``.
+
+Per-process state stays in the worker that created it. This includes
+changes to the registry, spooled results and in-flight requests that
+``notifications/cancelled`` can reach. Clients that need it should keep
+one connection open.
+"""
+
+import asyncio
+import gc
+import os
+import pickle
+import secrets
+import shutil
+import signal
+import socket
+import tempfile
+import time
+import traceback
+from collections import deque
+from typing import TYPE_CHECKING, Callable
+
+from mcp_starter.http_transport import HTTPTransport
+from mcp_starter.metrics import ServerMetrics
+
+if TYPE_CHECKING:
+    from mcp_starter.server import MCPServer
+
+DEFAULT_METRICS_INTERVAL = 1.0
+DEFAULT_SHUTDOWN_TIMEOUT = 10.0
+DEFAULT_MAX_RESTARTS = 10
+RESTART_WINDOW = 60.0
+_RETIRED_METRICS = "retired.metrics"
+_STOP_SIGNALS = {signal.SIGTERM, signal.SIGINT}
+
+
+class PreforkServer:
+    """Runs an ``MCPServer`` over HTTP in ``workers`` forked processes.
+
+    By default the workers accept connections from one listening socket
+    inherited from the supervisor. With ``reuse_port``, each worker binds
+    its own ``SO_REUSEPORT`` socket on the same port instead, and the
+    kernel spreads connections evenly between them (Linux).
+
+    A worker that exits while the supervisor is running is restarted. If
+    there are more than ``max_restarts`` restarts within a minute,
+    ``run`` gives up and raises. Each worker saves a snapshot of its
+    metrics every ``metrics_interval`` seconds and again when it exits.
+    ``aggregate_metrics`` sums those snapshots, including the final ones of
+    workers that have exited.
+
+    ``transport`` builds each worker's transport and is called with the
+    server and a ``session_secret`` the workers share, so a session
+    started on one worker is accepted by the others. To change transport
+    options, pass a ``functools.partial`` of ``HTTPTransport``.
+
+    Only one ``PreforkServer`` runs per process, and the process must not
+    have started an event loop or threads before ``run``.
+    """
+
+    def __init__(
+        self,
+        server: "MCPServer",
+        workers: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        reuse_port: bool = False,
+        transport: Callable[..., HTTPTransport] = HTTPTransport,
+        metrics_interval: float = DEFAULT_METRICS_INTERVAL,
+        shutdown_timeout: float = DEFAULT_SHUTDOWN_TIMEOUT,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+    ) -> None:
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        if metrics_interval <= 0 or shutdown_timeout <= 0:
+            raise ValueError("metrics_interval and shutdown_timeout must be positive")
+        if max_restarts < 0:
+            raise ValueError("max_restarts must not be negative")
+        self.server = server
+        self.workers = workers or os.cpu_count() or 1
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        self.transport = transport
+        self.metrics_interval = metrics_interval
+        self.shutdown_timeout = shutdown_timeout
+        self.max_restarts = max_restarts
+        self.metrics_dir: str | None = None
+        self._socket: socket.socket | None = None
+        self._secret = secrets.token_bytes(32)
+        self._pids: dict[int, int] = {}
+        self._restarts: deque[float] = deque()
+        self._stopping = False
+        self._final_metrics: ServerMetrics | None = None
+
+    @property
+    def worker_pids(self) -> list[int]:
+        return list(self._pids)
+
+    def bind(self) -> None:
+        """Bind the listening socket; ``run`` calls this if it was not called first.
+
+        With ``port=0`` the OS picks a free port, which is then stored in
+        ``self.port``.
+        """
+        if self._socket is not None:
+            return
+        if self.reuse_port:
+            # Only reserves the port: workers listen on their own sockets, and
+            # connections go to listening sockets only.
+            sock = socket.socket(_family(self.host), socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind((self.host, self.port))
+        else:
+            sock = socket.create_server((self.host, self.port), family=_family(self.host))
+        self._socket = sock
+        self.port = sock.getsockname()[1]
+
+    def run(self) -> None:
+        """Fork the workers and supervise them until SIGTERM or SIGINT.
+
+        Blocks until every worker has exited.
+
+        Raises:
+            RuntimeError: If workers keep crashing, or the platform lacks ``fork``.
+        """
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Prefork mode requires os.fork")
+        self._prepare()
+        handlers = {sig: signal.signal(sig, self._on_signal) for sig in _STOP_SIGNALS}
+        try:
+            for index in range(self.workers):
+                self._spawn(index)
+            self._supervise()
+        finally:
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+            self._stop_workers()
+            self._cleanup()
+
+    def stop(self) -> None:
+        """Ask every worker to finish; ``run`` returns once they have exited."""
+        self._stopping = True
+        self._signal_workers(signal.SIGTERM)
+
+    def aggregate_metrics(self) -> ServerMetrics:
+        """Return the summed metrics of every worker, including exited ones.
+
+        Running workers are counted as of their latest snapshot. This works
+        in the supervisor and in workers, e.g. behind a metrics resource.
+        """
+        if self._final_metrics is not None:
+            return self._final_metrics
+        total = ServerMetrics()
+        if self.metrics_dir is None:
+            return total
+        for name in sorted(os.listdir(self.metrics_dir)):
+            if name.endswith(".metrics"):
+                metrics = _read_metrics(os.path.join(self.metrics_dir, name))
+                if metrics is not None:
+                    total.merge(metrics)
+        return total
+
+    def render_metrics(self) -> str:
+        """Return ``aggregate_metrics`` in the Prometheus text format."""
+        return self.aggregate_metrics().render_prometheus()
+
+    def _prepare(self) -> None:
+        self.bind()
+        # Import lazy tools and build cached listings once here rather than in every worker.
+        self.server.load_tools()
+        self.server.registry.warm()
+        self.metrics_dir = tempfile.mkdtemp(prefix="mcp-prefork-")
+        self._final_metrics = None
+        self._stopping = False
+        gc.collect()
+        gc.freeze()
+
+    def _spawn(self, index: int) -> None:
+        # Keep the supervisor's handlers from running in the child before it resets them.
+        signal.pthread_sigmask(signal.SIG_BLOCK, _STOP_SIGNALS)
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                self._pids.clear()
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, _STOP_SIGNALS)
+                asyncio.run(self._serve_worker(index))
+                code = 0
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                # Never return into the supervisor's code in the child.
+                os._exit(code)
+        self._pids[pid] = index
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, _STOP_SIGNALS)
+
+    async def _serve_worker(self, index: int) -> None:
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+        assert self._socket is not None
+        sock = self._socket
+        if self.reuse_port:
+            sock = socket.create_server(
+                (self.host, self.port), family=_family(self.host), reuse_port=True
+            )
+        transport = self.transport(self.server, session_secret=self._secret)
+        await transport.start(sock=sock)
+        path = self._metrics_path(index)
+        try:
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), self.metrics_interval)
+                except TimeoutError:
+                    pass
+                _write_metrics(path, self.server.metrics)
+        finally:
+            await transport.close()
+            self.server.shutdown()
+            _write_metrics(path, self.server.metrics)
+
+    def _supervise(self) -> None:
+        while self._pids:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+            index = self._pids.pop(pid, None)
+            if index is None:
+                continue
+            self._retire(index)
+            if not self._stopping:
+                self._check_restarts()
+                self._spawn(index)
+
+    def _check_restarts(self) -> None:
+        now = time.monotonic()
+        self._restarts.append(now)
+        while now - self._restarts[0] > RESTART_WINDOW:
+            self._restarts.popleft()
+        if len(self._restarts) > self.max_restarts:
+            raise RuntimeError(
+                f"Workers exited {len(self._restarts)} times in {RESTART_WINDOW:g}s; giving up"
+            )
+
+    def _stop_workers(self) -> None:
+        self._stopping = True
+        self._signal_workers(signal.SIGTERM)
+        deadline = time.monotonic() + self.shutdown_timeout
+        while self._pids:
+            for pid in list(self._pids):
+                if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                    self._retire(self._pids.pop(pid))
+            if self._pids and time.monotonic() > deadline:
+                self._signal_workers(signal.SIGKILL)
+                deadline = float("inf")
+            if self._pids:
+                time.sleep(0.01)
+
+    def _signal_workers(self, sig: int) -> None:
+        for pid in list(self._pids):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def _on_signal(self, signum: int, frame: object) -> None:
+        self.stop()
+
+    def _retire(self, index: int) -> None:
+        """Fold an exited worker's last snapshot into the running total of exited workers."""
+        assert self.metrics_dir is not None
+        path = self._metrics_path(index)
+        metrics = _read_metrics(path)
+        if metrics is None:
+            return
+        retired_path = os.path.join(self.metrics_dir, _RETIRED_METRICS)
+        retired = _read_metrics(retired_path) or ServerMetrics()
+        retired.merge(metrics, gauges=False)
+        _write_metrics(retired_path, retired)
+        os.unlink(path)
+
+    def _cleanup(self) -> None:
+        gc.unfreeze()
+        if self.metrics_dir is not None:
+            self._final_metrics = self.aggregate_metrics()
+            shutil.rmtree(self.metrics_dir, ignore_errors=True)
+            self.metrics_dir = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _metrics_path(self, index: int) -> str:
+        assert self.metrics_dir is not None
+        return os.path.join(self.metrics_dir, f"worker-{index}.metrics")
+
+
+def _family(host: str) -> socket.AddressFamily:
+    return socket.AF_INET6 if ":" in host else socket.AF_INET
+
+
+def _write_metrics(path: str, metrics: ServerMetrics) -> None:
+    # Replace atomically so readers never see a partial snapshot.
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        pickle.dump(metrics, f)
+    os.replace(temp, path)
+
+
+def _read_metrics(path: str) -> ServerMetrics | None:
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
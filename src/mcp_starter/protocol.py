@@ -1,63 +1,220 @@
 """JSON-RPC protocol message handling for MCP."""
 
-import json
 from typing import Any
 
+from mcp_starter.codec import Buffer, JSONCodec, default_codec
+from mcp_starter.content import ContentBlock, JsonContent
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_OVERLOADED = -32001
+RESOURCE_NOT_FOUND = -32002
+RATE_LIMITED = -32003
+
+
+class ProtocolError(ValueError):
+    """Raised when a message cannot be processed; ``code`` is the JSON-RPC error code.
+
+    ``data``, if not None, is sent as the error's ``data`` member.
+    """
+
+    def __init__(self, message: str, code: int = INVALID_REQUEST, data: Any = None) -> None:
+        self.message = message
+        self.code = code
+        self.data = data
+        super().__init__(message)
+
+
+class RawJSON:
+    """An already-encoded JSON value that ``build_response`` splices in as-is.
+
+    ``text`` may also be a list of byte pieces, which are joined only once,
+    into the final response.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str | bytes | list[bytes]) -> None:
+        self.text = text
+
 
 class ProtocolHandler:
-    """Handles JSON-RPC 2.0 message parsing and building."""
+    """Handles JSON-RPC 2.0 message parsing and building.
+
+    Messages are decoded from and encoded to UTF-8 bytes by ``codec``, which
+    defaults to the fastest JSON library installed (orjson, then msgspec,
+    then the standard library).
+    """
 
     JSONRPC_VERSION = "2.0"
 
-    def parse_request(self, raw: str) -> dict[str, Any]:
-        """Parse a raw JSON-RPC request string into a dict.
+    def __init__(self, codec: JSONCodec | None = None) -> None:
+        self.codec = codec or default_codec()
+        self._response_prefix = f'{{"jsonrpc":"{self.JSONRPC_VERSION}","id":'.encode()
+
+    def parse_request(self, raw: Buffer) -> dict[str, Any]:
+        """Parse a raw JSON-RPC request into a dict.
 
         Args:
-            raw: JSON-encoded request string.
+            raw: JSON-encoded request as bytes, a memoryview or a string.
 
         Returns:
             Parsed request as a dictionary.
 
         Raises:
-            ValueError: If the JSON is malformed or missing required fields.
+            ProtocolError: If the JSON is malformed or missing required fields.
         """
-        try:
-            data = json.loads(raw)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON: {e}")
+        return self.validate_request(self._decode(raw))
+
+    def parse_message(self, raw: Buffer) -> dict[str, Any] | list[Any]:
+        """Parse a raw message that may be a single request or a batch.
+
+        Batch items are returned undecoded so each can be checked with
+        ``validate_request`` and answered with its own error.
+
+        Args:
+            raw: JSON-encoded request or batch array.
+
+        Returns:
+            The request dict, or the list of batch items.
+
+        Raises:
+            ProtocolError: If the JSON is malformed, the batch is empty, or a
+                single request is missing required fields.
+        """
+        data = self._decode(raw)
+        if isinstance(data, list):
+            if not data:
+                raise ProtocolError("Empty batch")
+            return data
+        return self.validate_request(data)
+
+    def validate_request(self, data: Any) -> dict[str, Any]:
+        """Check that a decoded value is a JSON-RPC request object.
+
+        Raises:
+            ProtocolError: If ``data`` is not an object with a ``method`` field.
+        """
+        if not isinstance(data, dict):
+            raise ProtocolError("Request must be a JSON object")
         if "method" not in data:
-            raise ValueError("Missing 'method' field")
+            raise ProtocolError("Missing 'method' field")
         return data
 
-    def build_response(self, request_id: Any, result: Any) -> str:
-        """Build a JSON-RPC success response string.
+    def build_response(self, request_id: Any, result: Any) -> bytes:
+        """Build a JSON-RPC success response.
 
         Args:
             request_id: The id from the original request.
-            result: The result payload to include.
+            result: The result payload to include; a ``RawJSON`` result is
+                inserted without being re-encoded.
 
         Returns:
-            JSON-encoded response string.
+            JSON-encoded response bytes.
         """
-        return json.dumps({
+        if isinstance(result, RawJSON):
+            text = result.text
+            pieces = [self._response_prefix, self.codec.dumps(request_id), b',"result":']
+            if isinstance(text, list):
+                pieces.extend(text)
+            else:
+                pieces.append(text.encode() if isinstance(text, str) else text)
+            pieces.append(b"}")
+            return b"".join(pieces)
+        return self.codec.dumps({
             "jsonrpc": self.JSONRPC_VERSION,
             "id": request_id,
             "result": result,
         })
 
-    def build_error(self, request_id: Any, code: int, message: str) -> str:
-        """Build a JSON-RPC error response string.
+    def build_tool_result(
+        self, blocks: list[ContentBlock], is_error: bool, structured: bool = True
+    ) -> RawJSON:
+        """Encode a ``tools/call`` result from typed content blocks.
+
+        Each block is serialized directly to bytes; the first ``JsonContent``
+        block also becomes the result's ``structuredContent``. That must be an
+        object, so any other value is wrapped as ``{"result": value}``.
+
+        Args:
+            blocks: Content blocks in the order they are sent.
+            is_error: Whether the tool reported an error.
+            structured: Whether to send ``structuredContent``; clients of
+                protocol versions before 2025-06-18 do not know it.
+
+        Returns:
+            The encoded result, to be passed to ``build_response``.
+        """
+        pieces = [b'{"content":[']
+        structured_content = None
+        for i, block in enumerate(blocks):
+            if i:
+                pieces.append(b",")
+            pieces.extend(block.render(self.codec))
+            if structured and structured_content is None and isinstance(block, JsonContent):
+                structured_content = block.encode(self.codec)
+                if not isinstance(block.value, dict):
+                    structured_content = b'{"result":' + structured_content + b"}"
+        pieces.append(b'],"isError":true' if is_error else b'],"isError":false')
+        if structured_content is not None:
+            pieces.extend((b',"structuredContent":', structured_content))
+        pieces.append(b"}")
+        return RawJSON(pieces)
+
+    def build_error(self, request_id: Any, code: int, message: str, data: Any = None) -> bytes:
+        """Build a JSON-RPC error response.
 
         Args:
             request_id: The id from the original request.
             code: JSON-RPC error code.
             message: Human-readable error description.
+            data: Optional additional information, omitted when None.
 
         Returns:
-            JSON-encoded error response string.
+            JSON-encoded error response bytes.
         """
-        return json.dumps({
+        error: dict[str, Any] = {"code": code, "message": message}
+        if data is not None:
+            error["data"] = data
+        return self.codec.dumps({
             "jsonrpc": self.JSONRPC_VERSION,
             "id": request_id,
-            "error": {"code": code, "message": message},
+            "error": error,
         })
+
+    def build_notification(self, method: str, params: dict[str, Any] | None = None) -> bytes:
+        """Build a JSON-RPC notification (a request without an id).
+
+        Args:
+            method: Notification method name.
+            params: Optional parameters object.
+
+        Returns:
+            JSON-encoded notification bytes.
+        """
+        message: dict[str, Any] = {"jsonrpc": self.JSONRPC_VERSION, "method": method}
+        if params is not None:
+            message["params"] = params
+        return self.codec.dumps(message)
+
+    def build_batch(self, responses: list[bytes]) -> bytes | None:
+        """Combine already-encoded responses into a batch response.
+
+        Args:
+            responses: Encoded responses, one per non-notification request.
+
+        Returns:
+            JSON-encoded array, or None if there is nothing to send.
+        """
+        if not responses:
+            return None
+        return b"[" + b",".join(responses) + b"]"
+
+    def _decode(self, raw: Buffer) -> Any:
+        try:
+            return self.codec.loads(raw)
+        except self.codec.decode_errors as e:
+            raise ProtocolError(f"Invalid JSON: {e}", PARSE_ERROR)
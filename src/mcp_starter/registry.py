@@ -1,60 +1,591 @@
-from typing import Any
+import base64
+import binascii
+import dataclasses
+import json
+import threading
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Mapping
 
-from mcp_starter.models import ToolDefinition, Resource
+from mcp_starter.models import Resource, ResourceTemplate, ToolDefinition
+from mcp_starter.router import UriRouter
+from mcp_starter.validation import CompiledValidator, ToolValidator
+
+TOOLS = "tools"
+RESOURCES = "resources"
+
+ChangeListener = Callable[[str], None]
+Listing = tuple[list[Any], bytes]
+
+
+@dataclass
+class ListingPage:
+    """One page of a tools or resources listing.
+
+    ``json`` is the pre-encoded UTF-8 array of ``items``; ``next_cursor`` is None on
+    the last page.
+    """
+
+    items: list[dict[str, Any]] = field(default_factory=list)
+    json: bytes = b"[]"
+    next_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """The registry's contents at one point in time.
+
+    A snapshot is never modified once published, so it can be read from any
+    thread without locking; do not mutate its mappings. ``tool_names`` and
+    ``resource_uris`` are the sorted keys used for cursor and prefix paging.
+    Full listings are encoded on first use and cached on the snapshot.
+    """
+
+    tools: Mapping[str, ToolDefinition] = field(default_factory=dict)
+    validators: Mapping[str, CompiledValidator] = field(default_factory=dict)
+    tool_schemas: Mapping[str, tuple[dict[str, Any], bytes]] = field(default_factory=dict)
+    tool_names: tuple[str, ...] = ()
+    resources: Mapping[str, Resource] = field(default_factory=dict)
+    resource_schemas: Mapping[str, tuple[dict[str, str], bytes]] = field(default_factory=dict)
+    resource_uris: tuple[str, ...] = ()
+    resource_templates: Mapping[str, ResourceTemplate] = field(default_factory=dict)
+    template_schemas: Mapping[str, tuple[dict[str, str], bytes]] = field(default_factory=dict)
+    templates: UriRouter[ResourceTemplate] = field(default_factory=UriRouter)
+    tools_version: int = 0
+    resources_version: int = 0
+    _listings: dict[str, Listing] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def _listing(self, schemas: str) -> Listing:
+        # Two threads may both build a missing listing; they produce equal results.
+        listing = self._listings.get(schemas)
+        if listing is None:
+            listing = self._listings[schemas] = _build_listing(getattr(self, schemas).values())
+        return listing
+
+
+class RegistryBatch:
+    """Changes to the registry that readers cannot see yet.
+
+    Each mapping, and the template router, is copied the first time the
+    batch changes it; later changes update the copies in place, and the
+    sorted keys are merged once when the batch is published. Many
+    registrations therefore cost about as much as one copy of the registry.
+    """
+
+    def __init__(self, base: RegistrySnapshot, atomic: bool = True) -> None:
+        self._base = base
+        self._atomic = atomic
+        self._copies: dict[str, dict[str, Any]] = {}
+        self._router: UriRouter[ResourceTemplate] | None = None
+        self._added: dict[str, set[str]] = {TOOLS: set(), RESOURCES: set()}
+        self._removed: dict[str, set[str]] = {TOOLS: set(), RESOURCES: set()}
+        self._changed: dict[str, int] = {}
+
+    @property
+    def tools(self) -> Mapping[str, ToolDefinition]:
+        """The tools as the batch would publish them; do not mutate."""
+        return self._view("tools")
+
+    def _view(self, name: str) -> Mapping[str, Any]:
+        copy = self._copies.get(name)
+        return copy if copy is not None else getattr(self._base, name)
+
+    def _copy(self, name: str) -> dict[str, Any]:
+        copy = self._copies.get(name)
+        if copy is None:
+            copy = self._copies[name] = dict(getattr(self._base, name))
+        return copy
+
+    def _change(self, kind: str) -> str:
+        self._changed[kind] = self._changed.get(kind, 0) + 1
+        return kind
+
+    def _key_added(self, kind: str, key: str) -> None:
+        if key in self._removed[kind]:
+            self._removed[kind].discard(key)
+        else:
+            self._added[kind].add(key)
+
+    def _key_removed(self, kind: str, key: str) -> None:
+        if key in self._added[kind]:
+            self._added[kind].discard(key)
+        else:
+            self._removed[kind].add(key)
+
+    def _put_tool(
+        self,
+        tool: ToolDefinition,
+        schema: tuple[dict[str, Any], bytes],
+        validator: CompiledValidator,
+    ) -> str:
+        tools = self._copy("tools")
+        if tool.name not in tools:
+            self._key_added(TOOLS, tool.name)
+        tools[tool.name] = tool
+        self._copy("validators")[tool.name] = validator
+        self._copy("tool_schemas")[tool.name] = schema
+        return self._change(TOOLS)
+
+    def _remove_tool(self, name: str) -> str | None:
+        if name not in self._view("tools"):
+            return None
+        del self._copy("tools")[name]
+        del self._copy("validators")[name]
+        del self._copy("tool_schemas")[name]
+        self._key_removed(TOOLS, name)
+        return self._change(TOOLS)
+
+    def _put_resource(self, resource: Resource, schema: tuple[dict[str, str], bytes]) -> str:
+        resources = self._copy("resources")
+        if resource.uri not in resources:
+            self._key_added(RESOURCES, resource.uri)
+        resources[resource.uri] = resource
+        self._copy("resource_schemas")[resource.uri] = schema
+        return self._change(RESOURCES)
+
+    def _remove_resource(self, uri: str) -> str | None:
+        if uri not in self._view("resources"):
+            return None
+        del self._copy("resources")[uri]
+        del self._copy("resource_schemas")[uri]
+        self._key_removed(RESOURCES, uri)
+        return self._change(RESOURCES)
+
+    def _put_template(
+        self, template: ResourceTemplate, schema: tuple[dict[str, str], bytes]
+    ) -> str:
+        if self._router is None:
+            self._router = UriRouter[ResourceTemplate]()
+            for uri_template, existing in self._base.resource_templates.items():
+                self._router.add(uri_template, existing)
+        self._router.add(template.uri_template, template)
+        self._copy("resource_templates")[template.uri_template] = template
+        self._copy("template_schemas")[template.uri_template] = schema
+        return self._change(RESOURCES)
+
+    def _bump(self, kind: str) -> int:
+        return 1 if self._atomic else self._changed[kind]
+
+    def _publish(self) -> RegistrySnapshot:
+        base = self._base
+        if not self._changed:
+            return base
+        changes: dict[str, Any] = dict(self._copies)
+        if TOOLS in self._changed:
+            changes["tool_names"] = _merge_keys(
+                base.tool_names, self._added[TOOLS], self._removed[TOOLS]
+            )
+            changes["tools_version"] = base.tools_version + self._bump(TOOLS)
+        if RESOURCES in self._changed:
+            changes["resource_uris"] = _merge_keys(
+                base.resource_uris, self._added[RESOURCES], self._removed[RESOURCES]
+            )
+            changes["resources_version"] = base.resources_version + self._bump(RESOURCES)
+        if self._router is not None:
+            changes["templates"] = self._router
+        snapshot = dataclasses.replace(base, **changes)
+        # Listings whose schemas did not change carry over to the new snapshot.
+        for schemas, listing in base._listings.items():
+            if schemas not in changes:
+                snapshot._listings[schemas] = listing
+        return snapshot
 
 
 class MCPRegistry:
-    """Central registry for MCP tools and resources."""
+    """Central registry for MCP tools and resources.
+
+    The contents live in an immutable ``RegistrySnapshot``. Readers use
+    whichever snapshot is current without locking, so lookups and listings
+    are safe from any thread while others register entries.
+
+    Registrations made outside ``batch`` are collected as pending changes
+    and published as a new snapshot by the next read, with a single
+    reference swap. Registering one entry at a time therefore stays linear
+    overall, for example through the ``@server.tool`` decorator; only the
+    first read after a write takes the lock. ``batch`` publishes its changes
+    together when it ends, so readers never see part of it.
+
+    Listing output is cached: each registration stores the entry's schema dict
+    and its JSON encoding, and the full listings are built lazily once per
+    snapshot that changes them.
+    """
 
     def __init__(self) -> None:
-        self._tools: dict[str, ToolDefinition] = {}
-        self._resources: dict[str, Resource] = {}
+        self._snapshot = RegistrySnapshot()
+        self._ephemeral: dict[str, Resource] = {}
+        self._listeners: list[ChangeListener] = []
+        self._lock = threading.RLock()
+        self._batch: RegistryBatch | None = None
+        self._pending: RegistryBatch | None = None
+
+    @property
+    def tools_version(self) -> int:
+        return self.snapshot().tools_version
+
+    @property
+    def resources_version(self) -> int:
+        return self.snapshot().resources_version
+
+    def snapshot(self) -> RegistrySnapshot:
+        """Return the current snapshot, which later registrations leave unchanged."""
+        if self._pending is None:
+            return self._snapshot
+        with self._lock:
+            self._publish_pending()
+            return self._snapshot
+
+    @contextmanager
+    def batch(self) -> Iterator[RegistryBatch]:
+        """Stage registrations and publish them together as one snapshot.
+
+        Readers see none of the changes until the block exits, then all of
+        them; listeners are notified once per kind and each version is bumped
+        once. If the block raises, nothing is published. Other threads'
+        registrations wait until the batch ends, and a batch opened inside
+        another joins it.
+
+        Example::
+
+            with registry.batch():
+                for tool in tools:
+                    registry.register_tool(tool)
+        """
+        with self._lock:
+            if self._batch is not None:
+                yield self._batch
+                return
+            self._publish_pending()
+            batch = self._batch = RegistryBatch(self._snapshot)
+            try:
+                yield batch
+                self._snapshot = batch._publish()
+            finally:
+                self._batch = None
+        for kind in batch._changed:
+            self._notify(kind)
 
     def register_tool(self, tool: ToolDefinition) -> None:
-        """Add a tool definition to the registry."""
-        self._tools[tool.name] = tool
+        """Add a tool definition to the registry, compiling its argument validator."""
+        schema = _tool_schema(tool)
+        entry = (schema, json.dumps(schema).encode())
+        validator = ToolValidator.compile(tool)
+        self._write(lambda changes: changes._put_tool(tool, entry, validator))
+
+    def unregister_tool(self, name: str) -> bool:
+        """Remove a tool, returning False if it was not registered.
+
+        Calls already running keep the definition they looked up.
+        """
+        return self._write(lambda changes: changes._remove_tool(name)) is not None
 
     def register_resource(self, resource: Resource) -> None:
         """Add a resource definition to the registry."""
-        self._resources[resource.uri] = resource
+        schema = _resource_schema(resource)
+        entry = (schema, json.dumps(schema).encode())
+        self._write(lambda changes: changes._put_resource(resource, entry))
+
+    def unregister_resource(self, uri: str) -> bool:
+        """Remove a resource, returning False if it was not registered."""
+        return self._write(lambda changes: changes._remove_resource(uri)) is not None
+
+    def add_ephemeral_resource(self, resource: Resource) -> None:
+        """Make a short-lived resource readable without listing it.
+
+        Ephemeral resources, such as spooled tool results, are resolved by
+        URI like any other resource but do not appear in ``resources/list``,
+        bump ``resources_version``, notify listeners or belong to snapshots.
+        """
+        self._ephemeral[resource.uri] = resource
+
+    def remove_ephemeral_resource(self, uri: str) -> None:
+        """Forget an ephemeral resource; unknown URIs are ignored."""
+        self._ephemeral.pop(uri, None)
+
+    def register_resource_template(self, template: ResourceTemplate) -> None:
+        """Add a URI template that resolves a whole family of resources.
+
+        Raises:
+            ValueError: If the template repeats a variable name.
+        """
+        UriRouter[ResourceTemplate]().add(template.uri_template, template)
+        schema = _template_schema(template)
+        entry = (schema, json.dumps(schema).encode())
+        self._write(lambda changes: changes._put_template(template, entry))
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """Call ``listener`` with ``"tools"`` or ``"resources"`` after each published change."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: ChangeListener) -> None:
+        """Stop notifying a listener previously passed to ``add_listener``."""
+        self._listeners.remove(listener)
 
     def get_tool(self, name: str) -> ToolDefinition | None:
         """Look up a tool by name, returning None if not found."""
-        return self._tools.get(name)
+        return self.snapshot().tools.get(name)
+
+    def get_validator(self, name: str) -> CompiledValidator | None:
+        """Return the compiled argument validator for a tool, or None if not found."""
+        return self.snapshot().validators.get(name)
 
     def get_resource(self, uri: str) -> Resource | None:
-        """Look up a resource by URI, returning None if not found."""
-        return self._resources.get(uri)
+        """Look up a resource by URI, returning None if not found.
+
+        Registered resources take precedence; otherwise a matching template
+        yields a Resource for ``uri`` that shares the template's reader.
+        """
+        resolved = self.resolve_resource(uri)
+        return resolved[0] if resolved is not None else None
+
+    def resolve_resource(self, uri: str) -> tuple[Resource, dict[str, str]] | None:
+        """Look up a resource by URI along with any variables extracted from a template.
+
+        Returns:
+            The resource and its template variables (empty for concrete
+            resources), or None if nothing matches.
+        """
+        snapshot = self.snapshot()
+        resource = snapshot.resources.get(uri) or self._ephemeral.get(uri)
+        if resource is not None:
+            return resource, {}
+        matched = snapshot.templates.match(uri)
+        if matched is None:
+            return None
+        template, variables = matched
+        resource = Resource(
+            uri=uri,
+            name=template.name,
+            description=template.description,
+            mime_type=template.mime_type,
+            reader=template.reader,
+        )
+        return resource, variables
 
     def list_tools(self) -> list[ToolDefinition]:
         """Return all registered tool definitions."""
-        return list(self._tools.values())
+        return list(self.snapshot().tools.values())
 
     def list_resources(self) -> list[Resource]:
         """Return all registered resource definitions."""
-        return list(self._resources.values())
+        return list(self.snapshot().resources.values())
+
+    def to_template_schemas(self) -> list[dict[str, str]]:
+        """Convert all resource templates to dicts for ``resources/templates/list``.
+
+        The returned list is cached and shared between callers; do not mutate it.
+        """
+        return self.snapshot()._listing("template_schemas")[0]
+
+    def template_schemas_json(self) -> bytes:
+        """Return ``to_template_schemas()`` as a cached, already-encoded UTF-8 JSON array."""
+        return self.snapshot()._listing("template_schemas")[1]
 
     def tool_exists(self, name: str) -> bool:
         """Check whether a tool with the given name is registered."""
-        return name in self._tools
+        return name in self.snapshot().tools
 
     def to_tool_schemas(self) -> list[dict[str, Any]]:
-        """Convert all registered tools to JSON-schema dicts for the MCP protocol."""
-        schemas: list[dict[str, Any]] = []
-        for tool in self._tools.values():
-            properties: dict[str, dict[str, str]] = {}
-            required: list[str] = []
-            for p in tool.parameters:
-                properties[p.name] = {"type": p.type.value, "description": p.description}
-                if p.required:
-                    required.append(p.name)
-            schemas.append({
-                "name": tool.name,
-                "description": tool.description,
-                "inputSchema": {
-                    "type": "object",
-                    "properties": properties,
-                    "required": required,
-                },
-            })
-        return schemas
+        """Convert all registered tools to JSON-schema dicts for the MCP protocol.
+
+        The returned list is cached and shared between callers; do not mutate it.
+        """
+        return self.snapshot()._listing("tool_schemas")[0]
+
+    def tool_schemas_json(self) -> bytes:
+        """Return ``to_tool_schemas()`` as a cached, already-encoded UTF-8 JSON array."""
+        return self.snapshot()._listing("tool_schemas")[1]
+
+    def to_resource_schemas(self) -> list[dict[str, str]]:
+        """Convert all registered resources to dicts for the MCP protocol.
+
+        The returned list is cached and shared between callers; do not mutate it.
+        """
+        return self.snapshot()._listing("resource_schemas")[0]
+
+    def resource_schemas_json(self) -> bytes:
+        """Return ``to_resource_schemas()`` as a cached, already-encoded UTF-8 JSON array."""
+        return self.snapshot()._listing("resource_schemas")[1]
+
+    def warm(self) -> None:
+        """Build every lazily cached listing of the current snapshot now instead of on first use."""
+        snapshot = self.snapshot()
+        for schemas in ("tool_schemas", "resource_schemas", "template_schemas"):
+            snapshot._listing(schemas)
+
+    def page_tools(
+        self, cursor: str | None = None, limit: int = 100, prefix: str = ""
+    ) -> ListingPage:
+        """Return one page of tool schemas ordered by name.
+
+        Args:
+            cursor: ``next_cursor`` from the previous page, or None to start.
+            limit: Maximum number of tools in the page.
+            prefix: Only include tools whose name starts with this prefix.
+
+        Returns:
+            The page of schemas and the cursor for the next one.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        snapshot = self.snapshot()
+        return _page(snapshot.tool_names, snapshot.tool_schemas, cursor, limit, prefix)
+
+    def page_resources(
+        self, cursor: str | None = None, limit: int = 100, prefix: str = ""
+    ) -> ListingPage:
+        """Return one page of resource schemas ordered by URI.
+
+        See ``page_tools`` for the arguments; ``prefix`` filters on the URI.
+        """
+        snapshot = self.snapshot()
+        return _page(snapshot.resource_uris, snapshot.resource_schemas, cursor, limit, prefix)
+
+    def _write(self, change: Callable[[RegistryBatch], str | None]) -> str | None:
+        """Apply ``change`` to the open batch, or else to the pending changes.
+
+        Returns the kind of entry changed, or None if nothing changed.
+        """
+        with self._lock:
+            if self._batch is not None:
+                # The batch notifies listeners when it is published.
+                return change(self._batch)
+            if self._pending is None:
+                self._pending = RegistryBatch(self._snapshot, atomic=False)
+            kind = change(self._pending)
+        if kind is not None:
+            self._notify(kind)
+        return kind
+
+    def _publish_pending(self) -> None:
+        # Callers hold the lock. Publish before clearing, so a reader that
+        # sees no pending changes also sees the snapshot that includes them.
+        if self._pending is not None:
+            self._snapshot = self._pending._publish()
+            self._pending = None
+
+    def _notify(self, kind: str) -> None:
+        for listener in list(self._listeners):
+            listener(kind)
+
+
+def _tool_schema(tool: ToolDefinition) -> dict[str, Any]:
+    properties: dict[str, dict[str, str]] = {}
+    required: list[str] = []
+    for p in tool.parameters:
+        properties[p.name] = {"type": p.type.value, "description": p.description}
+        if p.required:
+            required.append(p.name)
+    return {
+        "name": tool.name,
+        "description": tool.description,
+        "inputSchema": {
+            "type": "object",
+            "properties": properties,
+            "required": required,
+        },
+    }
+
+
+def _resource_schema(resource: Resource) -> dict[str, str]:
+    return {
+        "uri": resource.uri,
+        "name": resource.name,
+        "description": resource.description,
+        "mimeType": resource.mime_type,
+    }
+
+
+def _template_schema(template: ResourceTemplate) -> dict[str, str]:
+    return {
+        "uriTemplate": template.uri_template,
+        "name": template.name,
+        "description": template.description,
+        "mimeType": template.mime_type,
+    }
+
+
+def _build_listing(entries: Iterable[tuple[Any, bytes]]) -> tuple[list[Any], bytes]:
+    schemas = []
+    encoded = []
+    for schema, fragment in entries:
+        schemas.append(schema)
+        encoded.append(fragment)
+    return schemas, b"[" + b", ".join(encoded) + b"]"
+
+
+def _page(
+    keys: tuple[str, ...],
+    schemas: Mapping[str, tuple[Any, bytes]],
+    cursor: str | None,
+    limit: int,
+    prefix: str,
+) -> ListingPage:
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    after = decode_cursor(cursor) if cursor is not None else None
+    page, has_more = _key_range(keys, after, prefix, limit)
+    items, encoded = _build_listing(schemas[key] for key in page)
+    next_cursor = encode_cursor(page[-1]) if has_more and page else None
+    return ListingPage(items=items, json=encoded, next_cursor=next_cursor)
+
+
+def _key_range(
+    keys: tuple[str, ...], after: str | None, prefix: str, limit: int
+) -> tuple[tuple[str, ...], bool]:
+    """Return up to ``limit`` sorted keys after ``after`` that start with ``prefix``.
+
+    The boolean is True if more matching keys follow. Cursors encode the last
+    key returned, so pages stay consistent while entries are added: existing
+    keys are never skipped or repeated.
+    """
+    if after is not None and after >= prefix:
+        start = bisect_right(keys, after)
+    else:
+        start = bisect_left(keys, prefix)
+    end = len(keys)
+    if prefix:
+        upper = _prefix_upper_bound(prefix)
+        if upper is not None:
+            end = bisect_left(keys, upper, start)
+        else:
+            while end > start and not keys[end - 1].startswith(prefix):
+                end -= 1
+    stop = min(start + limit, end)
+    return keys[start:stop], stop < end
+
+
+def _merge_keys(keys: tuple[str, ...], added: set[str], removed: set[str]) -> tuple[str, ...]:
+    merged = [key for key in keys if key not in removed] if removed else list(keys)
+    if added:
+        # Two sorted runs: Timsort merges them in linear time.
+        merged.extend(sorted(added))
+        merged.sort()
+    return tuple(merged)
+
+
+def encode_cursor(key: str) -> str:
+    """Encode a listing key as an opaque pagination cursor."""
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> str:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        return base64.b64decode(cursor.encode(), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    last = ord(prefix[-1])
+    if last >= 0x10FFFF:
+        return None
+    return prefix[:-1] + chr(last + 1)
@@ -0,0 +1,188 @@
+"""Readers that supply resource contents for ``resources/read``."""
+
+import asyncio
+import base64
+import codecs
+import inspect
+import json
+import mmap
+import os
+from abc import ABC, abstractmethod
+from typing import Awaitable, BinaryIO, Callable, Iterable, Iterator
+
+DEFAULT_CHUNK_SIZE = 3 * 64 * 1024  # A multiple of 3 so base64 chunks concatenate cleanly.
+
+TEXT_MIME_TYPES = frozenset({
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "application/x-yaml",
+    "application/yaml",
+})
+
+Chunk = bytes | memoryview
+
+
+class ResourceReader(ABC):
+    """Base class for objects that produce a resource's bytes in chunks."""
+
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    @abstractmethod
+    async def read(
+        self,
+        uri: str,
+        offset: int = 0,
+        length: int | None = None,
+        variables: dict[str, str] | None = None,
+    ) -> Iterable[Chunk]:
+        """Return the requested byte range of the resource as an iterable of chunks.
+
+        Args:
+            uri: The URI being read.
+            offset: First byte to return.
+            length: Maximum number of bytes to return, or None for the rest.
+            variables: Values extracted from the URI when it matched a template.
+        """
+
+
+class FileReader(ResourceReader):
+    """Serves a file through ``mmap`` without copying it into Python strings.
+
+    Chunks are memoryview slices of the mapping, produced lazily, so only the
+    requested range is touched. Each chunk is released once the consumer asks
+    for the next one and must not be kept beyond that.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        if chunk_size < 3 or chunk_size % 3:
+            raise ValueError("chunk_size must be a positive multiple of 3")
+        self.path = os.fspath(path)
+        self.chunk_size = chunk_size
+
+    async def read(
+        self,
+        uri: str,
+        offset: int = 0,
+        length: int | None = None,
+        variables: dict[str, str] | None = None,
+    ) -> Iterable[Chunk]:
+        _clamp_range(0, offset, length)  # Reject bad ranges before any I/O happens.
+        # Open now, off the event loop, so a missing file is reported here
+        # rather than once the response is being encoded.
+        f = await asyncio.to_thread(open, self.path, "rb")
+        return self._chunks(f, offset, length)
+
+    def _chunks(self, f: BinaryIO, offset: int, length: int | None) -> Iterator[Chunk]:
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            start, stop = _clamp_range(size, offset, length)
+            if start >= stop:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for pos in range(start, stop, self.chunk_size):
+                        chunk = view[pos:min(pos + self.chunk_size, stop)]
+                        try:
+                            yield chunk
+                        finally:
+                            chunk.release()
+                finally:
+                    view.release()
+
+
+class CallableReader(ResourceReader):
+    """Serves the ``str`` or ``bytes`` returned by a sync or async function of the URI.
+
+    For template resources the extracted variables are passed as keyword
+    arguments after the URI.
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., str | bytes | Awaitable[str | bytes]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        if chunk_size < 3 or chunk_size % 3:
+            raise ValueError("chunk_size must be a positive multiple of 3")
+        self.func = func
+        self.chunk_size = chunk_size
+
+    async def read(
+        self,
+        uri: str,
+        offset: int = 0,
+        length: int | None = None,
+        variables: dict[str, str] | None = None,
+    ) -> Iterable[Chunk]:
+        data = self.func(uri, **(variables or {}))
+        if inspect.isawaitable(data):
+            data = await data
+        if isinstance(data, str):
+            data = data.encode()
+        view = memoryview(data)
+        start, stop = _clamp_range(len(view), offset, length)
+        size = self.chunk_size
+        return (view[pos:min(pos + size, stop)] for pos in range(start, stop, size))
+
+
+def is_text_mime_type(mime_type: str) -> bool:
+    """Return True if contents of this MIME type are sent as ``text`` rather than ``blob``."""
+    base = mime_type.split(";", 1)[0].strip().lower()
+    return (
+        base.startswith("text/")
+        or base in TEXT_MIME_TYPES
+        or base.endswith("+json")
+        or base.endswith("+xml")
+    )
+
+
+def encode_contents(uri: str, mime_type: str, chunks: Iterable[Chunk]) -> list[bytes]:
+    """Encode resource chunks as a JSON ``contents`` entry without joining the raw bytes.
+
+    Text types are decoded incrementally and JSON-escaped per chunk; other
+    types are base64-encoded per chunk, which is valid because every chunk
+    except the last is a multiple of 3 bytes long.
+
+    Args:
+        uri: The resource URI.
+        mime_type: The resource MIME type.
+        chunks: The resource bytes, in order.
+
+    Returns:
+        The encoded JSON object as pieces, to be joined only once, into the
+        final response (see ``RawJSON``).
+    """
+    head = f'{{"uri": {json.dumps(uri)}, "mimeType": {json.dumps(mime_type)}, '
+    if is_text_mime_type(mime_type):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        parts = [head.encode(), b'"text": "']
+        for chunk in chunks:
+            parts.append(json.dumps(decoder.decode(chunk))[1:-1].encode("ascii"))
+        parts.append(json.dumps(decoder.decode(b"", final=True))[1:-1].encode("ascii"))
+    else:
+        parts = [head.encode(), b'"blob": "']
+        carry = b""
+        for chunk in chunks:
+            if carry or len(chunk) % 3:
+                data = carry + bytes(chunk)
+                cut = len(data) - len(data) % 3
+                parts.append(base64.b64encode(data[:cut]))
+                carry = data[cut:]
+            else:
+                parts.append(base64.b64encode(chunk))
+        parts.append(base64.b64encode(carry))
+    parts.append(b'"}')
+    return parts
+
+
+def _clamp_range(size: int, offset: int, length: int | None) -> tuple[int, int]:
+    if offset < 0:
+        raise ValueError("offset must not be negative")
+    if length is not None and length < 0:
+        raise ValueError("length must not be negative")
+    start = min(offset, size)
+    stop = size if length is None else min(size, start + length)
+    return start, stop
+
@@ -0,0 +1,106 @@
+"""Segment trie for resolving URIs against RFC 6570 level-1 URI templates."""
+
+import re
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+_VARIABLE = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+class _Node(Generic[T]):
+    __slots__ = ("literals", "patterns", "value")
+
+    def __init__(self) -> None:
+        self.literals: dict[str, _Node[T]] = {}
+        self.patterns: list[tuple[str, re.Pattern[str], tuple[str, ...], _Node[T]]] = []
+        self.value: tuple[T, tuple[str, ...]] | None = None
+
+
+class UriRouter(Generic[T]):
+    """Maps URI templates like ``db://tables/{name}/rows`` to values.
+
+    Templates are split on ``/`` into a trie. Literal segments are dict
+    lookups and segments containing ``{var}`` are compiled to a regex that
+    matches within a single segment, so lookup cost depends on the depth of
+    the URI rather than on the number of templates. Literal segments win over
+    variable ones; among variable segments the first registered wins.
+    """
+
+    def __init__(self) -> None:
+        self._root: _Node[T] = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, template: str, value: T) -> None:
+        """Register ``value`` under ``template``, replacing any previous value.
+
+        Raises:
+            ValueError: If a variable name appears twice in the template.
+        """
+        node = self._root
+        names: list[str] = []
+        for segment in template.split("/"):
+            segment_names = _VARIABLE.findall(segment)
+            if not segment_names:
+                node = node.literals.setdefault(segment, _Node())
+                continue
+            names.extend(segment_names)
+            for existing, _, _, child in node.patterns:
+                if existing == segment:
+                    node = child
+                    break
+            else:
+                child = _Node()
+                node.patterns.append(
+                    (segment, _compile_segment(segment), tuple(segment_names), child)
+                )
+                node = child
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate variable in URI template: {template}")
+        if node.value is None:
+            self._size += 1
+        node.value = (value, tuple(names))
+
+    def match(self, uri: str) -> tuple[T, dict[str, str]] | None:
+        """Return the value whose template matches ``uri`` and the extracted variables."""
+        segments = uri.split("/")
+        found = self._match(self._root, segments, 0, [])
+        if found is None:
+            return None
+        value, names, values = found
+        return value, dict(zip(names, values))
+
+    def _match(
+        self, node: _Node[T], segments: list[str], depth: int, values: list[str]
+    ) -> tuple[T, tuple[str, ...], list[str]] | None:
+        if depth == len(segments):
+            if node.value is None:
+                return None
+            return node.value[0], node.value[1], values
+        segment = segments[depth]
+        child = node.literals.get(segment)
+        if child is not None:
+            found = self._match(child, segments, depth + 1, values)
+            if found is not None:
+                return found
+        for _, pattern, _, child in node.patterns:
+            m = pattern.fullmatch(segment)
+            if m is not None:
+                found = self._match(child, segments, depth + 1, values + list(m.groups()))
+                if found is not None:
+                    return found
+        return None
+
+
+def _compile_segment(segment: str) -> re.Pattern[str]:
+    parts = []
+    pos = 0
+    for m in _VARIABLE.finditer(segment):
+        parts.append(re.escape(segment[pos:m.start()]))
+        parts.append("([^/]+?)")
+        pos = m.end()
+    parts.append(re.escape(segment[pos:]))
+    return re.compile("".join(parts))
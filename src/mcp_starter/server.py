@@ -1,21 +1,141 @@
-from typing import Any, Callable
+import asyncio
+import dataclasses
+import importlib
+import inspect
+import sys
+import time
+from concurrent.futures import Future
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Hashable
 
-from mcp_starter.models import ToolDefinition, ToolParam, ToolCallRequest, ToolCallResponse
-from mcp_starter.registry import MCPRegistry
+from mcp_starter.cache import CacheStats, ResultCache, canonical_arguments
+from mcp_starter.content import JsonContent, ResourceLink, as_blocks
+from mcp_starter.executors import ExecutorPool
+from mcp_starter.limits import ConcurrencyLimiter, LimiterStats, RateLimiter
+from mcp_starter.metrics import PROMETHEUS_CONTENT_TYPE, ServerMetrics
+from mcp_starter.models import (
+    CachePolicy,
+    ConcurrencyLimit,
+    ExecutionMode,
+    RateLimit,
+    Resource,
+    SpoolPolicy,
+    ToolCallRequest,
+    ToolCallResponse,
+    ToolDefinition,
+    ToolParam,
+)
+from mcp_starter.protocol import (
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    RESOURCE_NOT_FOUND,
+    ProtocolError,
+    ProtocolHandler,
+    RawJSON,
+)
+from mcp_starter.registry import RESOURCES, TOOLS, ListingPage, MCPRegistry
+from mcp_starter.resources import CallableReader, encode_contents
+from mcp_starter.singleflight import SingleFlight
+from mcp_starter.spool import ResultSpool, SpoolBuffer
+from mcp_starter.streaming import (
+    DEFAULT_STREAM_BUFFER,
+    ChunkCallback,
+    TextBuffer,
+    ThreadRunner,
+    collect,
+    collect_async,
+    is_stream,
+)
+from mcp_starter.validation import ToolValidator
 
 DEFAULT_VERSION = "1.0.0"
+PROTOCOL_VERSION = "2025-06-18"
+SUPPORTED_PROTOCOL_VERSIONS = ("2025-06-18", "2025-03-26", "2024-11-05")
+# First version with resource_link content blocks and structuredContent.
+TYPED_RESULTS_VERSION = "2025-06-18"
+DEFAULT_PAGE_LIMIT = 100
+DEFAULT_METRICS_URI = "metrics://prometheus"
+
+MethodHandler = Callable[[dict[str, Any]], Awaitable[Any]]
+NotificationSink = Callable[[bytes], None]
+
+# Request ids are only unique per client; transports serving several clients
+# set this to a per-client key so cancellations cannot cross between them.
+REQUEST_SCOPE: ContextVar[Hashable] = ContextVar("mcp_request_scope", default=None)
+
+# True while sinks receive a notification about the request being handled,
+# such as its progress; transports may send those with that request's reply.
+REQUEST_NOTIFICATION: ContextVar[bool] = ContextVar("mcp_request_notification", default=False)
+
+LIST_CHANGED_NOTIFICATIONS = {
+    TOOLS: "notifications/tools/list_changed",
+    RESOURCES: "notifications/resources/list_changed",
+}
 
 
 class MCPServer:
     """Top-level MCP server that registers tools/resources and dispatches requests."""
 
-    def __init__(self, name: str, version: str = DEFAULT_VERSION) -> None:
+    def __init__(
+        self,
+        name: str,
+        version: str = DEFAULT_VERSION,
+        max_threads: int | None = None,
+        max_processes: int | None = None,
+        page_size: int | None = None,
+        limit: ConcurrencyLimit | None = None,
+        stream_buffer: int = DEFAULT_STREAM_BUFFER,
+        spool: SpoolPolicy | None = None,
+        rate_limit: RateLimit | None = None,
+    ) -> None:
+        if page_size is not None and page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if stream_buffer < 1:
+            raise ValueError("stream_buffer must be at least 1")
         self.name = name
         self.version = version
         self.registry = MCPRegistry()
+        self.protocol = ProtocolHandler()
+        self.executors = ExecutorPool(max_threads, max_processes)
+        self.page_size = page_size
+        self.stream_buffer = stream_buffer
+        self.spool = ResultSpool(self.registry, spool) if spool is not None else None
+        self._notification_sinks: list[NotificationSink] = []
+        self._result_caches: dict[str, tuple[ToolDefinition, ResultCache]] = {}
+        self.single_flight: SingleFlight[ToolCallResponse] = SingleFlight()
+        self._limiter = ConcurrencyLimiter(limit) if limit is not None else None
+        self._tool_limiters: dict[str, tuple[ToolDefinition, ConcurrencyLimiter]] = {}
+        self._rate_limiter = (
+            RateLimiter(rate_limit, name="this session") if rate_limit is not None else None
+        )
+        self._tool_rate_limiters: dict[str, tuple[ToolDefinition, RateLimiter]] = {}
+        self._in_flight: dict[tuple[Hashable, str | int], asyncio.Task[Any]] = {}
+        self._protocol_versions: dict[Hashable, str] = {}
+        self.metrics = ServerMetrics()
+        self.registry.add_listener(self._on_registry_change)
+        self._methods: dict[str, MethodHandler] = {
+            "initialize": self._rpc_initialize,
+            "ping": self._rpc_ping,
+            "tools/list": self._rpc_list_tools,
+            "tools/call": self._rpc_call_tool,
+            "resources/list": self._rpc_list_resources,
+            "resources/read": self._rpc_read_resource,
+            "resources/templates/list": self._rpc_list_resource_templates,
+            "notifications/cancelled": self._rpc_cancelled,
+        }
 
     def tool(
-        self, name: str, description: str, parameters: list[ToolParam] | None = None
+        self,
+        name: str,
+        description: str,
+        parameters: list[ToolParam] | None = None,
+        execution: ExecutionMode = ExecutionMode.THREAD,
+        cache: CachePolicy | None = None,
+        coalesce: bool = False,
+        limit: ConcurrencyLimit | None = None,
+        timeout: float | None = None,
+        rate_limit: RateLimit | None = None,
     ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
         """Decorator that registers a function as an MCP tool.
 
@@ -23,21 +143,119 @@ class MCPServer:
             name: Unique tool name exposed to clients.
             description: Human-readable description of the tool.
             parameters: Optional list of parameter definitions.
+            execution: Where a sync handler runs; use PROCESS for CPU-bound work
+                and INLINE only for handlers that never block.
+            cache: Optional memoization policy for pure, lookup-style tools.
+            coalesce: Share one execution between concurrent calls with equal
+                arguments.
+            limit: Maximum concurrent executions and wait-queue length for this tool.
+            timeout: Default deadline in seconds for a call, including queueing.
+            rate_limit: How often each client session may call this tool.
 
         Returns:
             A decorator that registers the wrapped function.
         """
         def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
-            tool_def = ToolDefinition(
-                name=name,
-                description=description,
-                parameters=parameters or [],
-                handler=func,
+            self.add_tool(
+                name, description, func, parameters, execution, cache, coalesce, limit, timeout,
+                rate_limit,
             )
-            self.registry.register_tool(tool_def)
             return func
         return decorator
 
+    def add_tool(
+        self,
+        name: str,
+        description: str,
+        handler: Callable[..., Any] | str,
+        parameters: list[ToolParam] | None = None,
+        execution: ExecutionMode = ExecutionMode.THREAD,
+        cache: CachePolicy | None = None,
+        coalesce: bool = False,
+        limit: ConcurrencyLimit | None = None,
+        timeout: float | None = None,
+        rate_limit: RateLimit | None = None,
+    ) -> ToolDefinition:
+        """Register a tool without decorating its function.
+
+        ``handler`` may be an import path such as ``"pkg.module:func"``: the
+        tool is listed straight away and its module is imported on a worker
+        thread the first time the tool is called. Other arguments are as for
+        ``tool``.
+
+        Returns:
+            The registered definition.
+
+        Raises:
+            ValueError: If the handler path is malformed or the handler cannot
+                run with ``execution``.
+        """
+        tool_def = ToolDefinition(
+            name=name,
+            description=description,
+            parameters=parameters or [],
+            handler=handler,
+            execution=execution,
+            cache=cache,
+            coalesce=coalesce,
+            limit=limit,
+            timeout=timeout,
+            rate_limit=rate_limit,
+        )
+        if tool_def.is_loaded:
+            _check_execution(tool_def)
+        self.registry.register_tool(tool_def)
+        return tool_def
+
+    def load_tools(self) -> None:
+        """Import every tool registered by import path now rather than on first call.
+
+        Raises:
+            ImportError: If a handler cannot be imported.
+            ValueError: If a handler cannot run with its tool's execution mode.
+        """
+        for tool in self.registry.list_tools():
+            if not tool.is_loaded:
+                _load_handler(tool)
+
+    def reload_tools(self, module: str) -> list[str]:
+        """Re-import a tool module and swap in its tools in one atomic step.
+
+        Decorators in the module register their tools again as it runs.
+        Other tools whose handler comes from the module, such as tools added
+        by import path, are re-registered with the module's new handler, or
+        removed if it no longer defines one. Clients see the old tools until
+        the module has been imported and then all of the new ones, and calls
+        that are already running finish with the handler they started with.
+
+        Returns:
+            The names of the tools that were added, replaced or removed.
+
+        Raises:
+            Exception: Whatever importing the module raises; the registry is
+                then left as it was.
+        """
+        before = self.registry.snapshot().tools
+        with self.registry.batch() as batch:
+            loaded = sys.modules.get(module)
+            loaded = importlib.reload(loaded) if loaded else importlib.import_module(module)
+            for tool in before.values():
+                if batch.tools.get(tool.name) is not tool or not _reloadable(tool, module):
+                    continue
+                handler = _reloaded_handler(tool, loaded)
+                if handler is None:
+                    self.registry.unregister_tool(tool.name)
+                    continue
+                replacement = dataclasses.replace(tool, handler=handler)
+                if replacement.is_loaded:
+                    _check_execution(replacement)
+                self.registry.register_tool(replacement)
+            after = batch.tools
+            return sorted(
+                name for name in before.keys() | after.keys()
+                if before.get(name) is not after.get(name)
+            )
+
     def handle_list_tools(self) -> list[dict[str, Any]]:
         """Return JSON-schema representations of all registered tools."""
         return self.registry.to_tool_schemas()
@@ -45,29 +263,777 @@ class MCPServer:
     def handle_call_tool(self, request: ToolCallRequest) -> ToolCallResponse:
         """Execute a tool by name with the provided arguments.
 
+        Arguments are checked with the tool's compiled validator first. Async
+        handlers are run to completion with ``asyncio.run``, so this must not be
+        called from a running event loop for them; use ``handle_call_tool_async``
+        there instead. Generator handlers are drained in the calling thread.
+        Tools with ``ExecutionMode.PROCESS`` run in the process pool; other
+        sync handlers run in the calling thread.
+
         Args:
             request: The incoming tool call request.
 
         Returns:
             A response containing the result or an error message.
+
+        Raises:
+            RateLimitedError: If the session exceeded the server's or the tool's rate limit.
         """
         tool = self.registry.get_tool(request.tool_name)
         if tool is None:
             return ToolCallResponse(content=f"Unknown tool: {request.tool_name}", is_error=True)
+        self.metrics.tool_started(tool.name)
+        start = time.perf_counter()
+        is_error = True
         try:
-            result = tool.handler(**request.arguments)
-            return ToolCallResponse(content=str(result))
-        except Exception as e:
-            return ToolCallResponse(content=f"Error: {e}", is_error=True)
+            response = self._call_tool_sync(tool, request)
+            is_error = response.is_error
+            return response
+        finally:
+            self.metrics.tool_finished(tool.name, time.perf_counter() - start, is_error)
+
+    async def handle_call_tool_async(self, request: ToolCallRequest) -> ToolCallResponse:
+        """Execute a tool by name without blocking the event loop.
+
+        Arguments are validated first. Async handlers are awaited directly;
+        sync handlers run according to their ``ExecutionMode`` on the server's
+        executor pools. For tools with ``coalesce`` set, concurrent calls with
+        equal arguments share a single execution. Executions are admitted by
+        the tool's and then the server's concurrency limits. If the request's
+        ``timeout`` (or else the tool's) passes first, an async handler is
+        cancelled and its slot freed; a sync handler already running in a
+        pool runs to completion and keeps its slots until then, but its result
+        is discarded. A coalesced execution is
+        cancelled once every call sharing it has timed out or been cancelled.
+
+        Generator and async-generator handlers stream their result: each chunk
+        is sent as a ``notifications/progress`` message when the request has
+        a ``progress_token``, and the chunks are joined into the response.
+        A sync generator runs on a worker thread at most ``stream_buffer``
+        chunks ahead of the event loop.
+
+        Args:
+            request: The incoming tool call request.
+
+        Returns:
+            A response containing the result or an error message.
+
+        Raises:
+            OverloadedError: If a concurrency limit's wait queue is full.
+            RateLimitedError: If the session exceeded the server's or the tool's rate limit.
+        """
+        tool = self.registry.get_tool(request.tool_name)
+        if tool is None:
+            return ToolCallResponse(content=f"Unknown tool: {request.tool_name}", is_error=True)
+        self.metrics.tool_started(tool.name)
+        start = time.perf_counter()
+        is_error = True
+        try:
+            response = await self._call_tool_async(tool, request)
+            is_error = response.is_error
+            return response
+        finally:
+            self.metrics.tool_finished(tool.name, time.perf_counter() - start, is_error)
 
     def handle_list_resources(self) -> list[dict[str, str]]:
         """Return serialized representations of all registered resources."""
-        return [
-            {
-                "uri": r.uri,
-                "name": r.name,
-                "description": r.description,
-                "mimeType": r.mime_type,
-            }
-            for r in self.registry.list_resources()
-        ]
+        return self.registry.to_resource_schemas()
+
+    def invalidate_cache(
+        self, tool_name: str | None = None, arguments: dict[str, Any] | None = None
+    ) -> None:
+        """Drop cached tool results.
+
+        Args:
+            tool_name: Tool whose results to drop, or None for every tool.
+            arguments: Drop only the result for these arguments; requires ``tool_name``.
+        """
+        if tool_name is None:
+            for _, cache in self._result_caches.values():
+                cache.invalidate()
+            return
+        entry = self._result_caches.get(tool_name)
+        if entry is not None:
+            key = canonical_arguments(arguments) if arguments is not None else None
+            entry[1].invalidate(key)
+
+    def coalesced_calls(self, tool_name: str) -> int:
+        """Return how many calls to ``tool_name`` joined an identical in-flight call."""
+        return self.single_flight.coalesced(tool_name)
+
+    def expose_metrics(
+        self, uri: str | None = DEFAULT_METRICS_URI, tool_name: str | None = None
+    ) -> None:
+        """Publish the Prometheus metrics dump as a resource and/or a tool.
+
+        Args:
+            uri: Resource URI for the dump, or None to skip the resource.
+            tool_name: Name of a tool returning the dump, or None to skip the tool.
+        """
+        if uri is not None:
+            self.registry.register_resource(Resource(
+                uri=uri,
+                name="Server metrics",
+                description="Prometheus text-format metrics for this server.",
+                mime_type=PROMETHEUS_CONTENT_TYPE,
+                reader=CallableReader(lambda _: self.metrics.render_prometheus()),
+            ))
+        if tool_name is not None:
+            self.tool(
+                name=tool_name,
+                description="Return Prometheus text-format metrics for this server.",
+                execution=ExecutionMode.INLINE,
+            )(self.metrics.render_prometheus)
+
+    def limiter_stats(self, tool_name: str | None = None) -> LimiterStats | None:
+        """Return occupancy, queue depth and rejections for a tool's or the server's limit.
+
+        Args:
+            tool_name: Tool to report on, or None for the server-wide limit.
+
+        Returns:
+            The stats, or None if no such limit is configured or used yet.
+        """
+        if tool_name is None:
+            return self._limiter.stats() if self._limiter is not None else None
+        entry = self._tool_limiters.get(tool_name)
+        return entry[1].stats() if entry is not None else None
+
+    def cache_stats(self, tool_name: str) -> CacheStats | None:
+        """Return hit/miss/eviction counters for a cached tool, or None if it has no cache."""
+        entry = self._result_caches.get(tool_name)
+        return entry[1].stats() if entry is not None else None
+
+    async def handle_read_resource(
+        self, uri: str, offset: int = 0, length: int | None = None
+    ) -> list[bytes]:
+        """Read a resource through its reader and encode it as a JSON ``contents`` entry.
+
+        URIs matching a resource template pass the extracted variables to the
+        template's reader.
+
+        Chunks are encoded on a worker thread as they are produced, so large
+        file-backed resources are never held in memory as a single string of
+        raw bytes.
+
+        Args:
+            uri: URI of the resource to read.
+            offset: First byte to return.
+            length: Maximum number of bytes to return, or None for the rest.
+
+        Returns:
+            The encoded contents entry, in pieces that are joined only once,
+            into the response.
+
+        Raises:
+            ProtocolError: If the resource does not exist or cannot be read.
+        """
+        if self.spool is not None:
+            self.spool.purge()
+        resolved = self.registry.resolve_resource(uri)
+        if resolved is None or (reader := resolved[0].reader) is None:
+            raise ProtocolError(f"Resource not found: {uri}", RESOURCE_NOT_FOUND)
+        resource, variables = resolved
+        try:
+            chunks = await reader.read(uri, offset, length, variables)
+            return await self.executors.run(
+                ExecutionMode.THREAD,
+                encode_contents,
+                {"uri": uri, "mime_type": resource.mime_type, "chunks": chunks},
+            )
+        except ValueError as e:
+            raise ProtocolError(str(e), INVALID_PARAMS)
+        except OSError:
+            # The error names a server path, which the client must not see.
+            raise ProtocolError(f"Resource not found: {uri}", RESOURCE_NOT_FOUND)
+
+    def add_notification_sink(self, sink: NotificationSink) -> None:
+        """Deliver server-initiated notifications to ``sink`` as encoded bytes."""
+        self._notification_sinks.append(sink)
+
+    def remove_notification_sink(self, sink: NotificationSink) -> None:
+        """Stop delivering notifications to a sink added with ``add_notification_sink``."""
+        self._notification_sinks.remove(sink)
+
+    def notify(
+        self, method: str, params: dict[str, Any] | None = None, about_request: bool = False
+    ) -> None:
+        """Send a notification to every connected sink.
+
+        Args:
+            method: The notification method.
+            params: Optional parameters object.
+            about_request: Whether the notification concerns the request being
+                handled; sinks see this as ``REQUEST_NOTIFICATION``.
+        """
+        if not self._notification_sinks:
+            return
+        message = self.protocol.build_notification(method, params)
+        token = REQUEST_NOTIFICATION.set(about_request)
+        try:
+            for sink in list(self._notification_sinks):
+                sink(message)
+        finally:
+            REQUEST_NOTIFICATION.reset(token)
+
+    async def handle_message(self, message: dict[str, Any]) -> bytes | None:
+        """Dispatch a parsed JSON-RPC message to the matching method handler.
+
+        Requests are tracked by id while they run so that a
+        ``notifications/cancelled`` message can cancel them; a cancelled
+        request raises ``asyncio.CancelledError`` and gets no response.
+
+        Args:
+            message: A request dict as returned by ``ProtocolHandler.parse_request``.
+
+        Returns:
+            The encoded response, or None if the message was a notification.
+        """
+        request_id = message.get("id")
+        is_notification = "id" not in message
+        method = message["method"]
+        handler = self._methods.get(method)
+        if handler is None:
+            if is_notification:
+                return None
+            return self.protocol.build_error(
+                request_id, METHOD_NOT_FOUND, f"Method not found: {method}"
+            )
+        params = message.get("params") or {}
+        if not isinstance(params, dict):
+            if is_notification:
+                return None
+            return self.protocol.build_error(
+                request_id, INVALID_PARAMS, "'params' must be an object"
+            )
+        task = asyncio.current_task()
+        key = None
+        if not is_notification and task is not None and isinstance(request_id, (str, int)):
+            key = (REQUEST_SCOPE.get(), request_id)
+            self._in_flight[key] = task
+        self.metrics.request_started(method)
+        start = time.perf_counter()
+        is_error = True
+        try:
+            result = await handler(params)
+            is_error = False
+        except ProtocolError as e:
+            return None if is_notification else self.protocol.build_error(
+                request_id, e.code, e.message, e.data
+            )
+        except Exception as e:
+            return None if is_notification else self.protocol.build_error(
+                request_id, INTERNAL_ERROR, f"Internal error: {e}"
+            )
+        finally:
+            self.metrics.request_finished(method, time.perf_counter() - start, is_error)
+            if key is not None and self._in_flight.get(key) is task:
+                del self._in_flight[key]
+        if is_notification:
+            return None
+        return self.protocol.build_response(request_id, result)
+
+    async def handle_raw(self, raw: str | bytes | memoryview) -> bytes | None:
+        """Parse and dispatch a raw JSON-RPC message or batch.
+
+        Args:
+            raw: The encoded message as received from the transport.
+
+        Returns:
+            The encoded response, or None if no response should be sent.
+        """
+        try:
+            message = self.protocol.parse_message(raw)
+        except ProtocolError as e:
+            return self.protocol.build_error(None, e.code, e.message)
+        if isinstance(message, list):
+            return await self.handle_batch(message)
+        return await self.handle_message(message)
+
+    async def handle_batch(self, items: list[Any]) -> bytes | None:
+        """Dispatch the requests of a batch concurrently.
+
+        Invalid items get their own error entry; notifications produce none.
+
+        Args:
+            items: Decoded batch entries as returned by ``parse_message``.
+
+        Returns:
+            The encoded batch response, or None if every item was a notification.
+        """
+        async def dispatch(item: Any) -> bytes | None:
+            try:
+                message = self.protocol.validate_request(item)
+            except ProtocolError as e:
+                return self.protocol.build_error(None, e.code, e.message)
+            return await self.handle_message(message)
+
+        # Cancelled items come back as CancelledError and, like notifications,
+        # get no entry in the batch response.
+        responses = await asyncio.gather(
+            *(dispatch(item) for item in items), return_exceptions=True
+        )
+        return self.protocol.build_batch([r for r in responses if isinstance(r, bytes)])
+
+    async def run_stdio(self, max_in_flight: int | None = None) -> None:
+        """Serve newline-delimited JSON-RPC over stdin/stdout until EOF.
+
+        Either side may be a pipe, a terminal or a regular file, so output
+        can be redirected to a log and requests replayed from a file.
+
+        Args:
+            max_in_flight: Maximum number of requests processed concurrently.
+        """
+        from mcp_starter.transport import DEFAULT_MAX_IN_FLIGHT, StdioTransport
+
+        transport = StdioTransport(self, max_in_flight or DEFAULT_MAX_IN_FLIGHT)
+        try:
+            await transport.serve_stdio()
+        finally:
+            self.shutdown()
+
+    async def run_http(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """Serve the Streamable HTTP transport on ``host:port`` until cancelled.
+
+        Args:
+            host: Interface to listen on.
+            port: TCP port to listen on.
+        """
+        from mcp_starter.http_transport import HTTPTransport
+
+        transport = HTTPTransport(self, host, port)
+        try:
+            await transport.serve_forever()
+        finally:
+            self.shutdown()
+
+    def end_session(self, scope: Hashable) -> None:
+        """Forget what the server keeps about a client session, e.g. when a transport closes it."""
+        self._protocol_versions.pop(scope, None)
+
+    def protocol_version(self) -> str:
+        """Return the protocol version negotiated by the current session's ``initialize``.
+
+        Sessions that never initialized are answered with the latest version.
+        """
+        return self._protocol_versions.get(REQUEST_SCOPE.get(), PROTOCOL_VERSION)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Release the tool executor pools and delete spooled results."""
+        self.executors.shutdown(wait=wait)
+        if self.spool is not None:
+            self.spool.close()
+
+    async def _rpc_initialize(self, params: dict[str, Any]) -> dict[str, Any]:
+        requested = params.get("protocolVersion")
+        version = requested if requested in SUPPORTED_PROTOCOL_VERSIONS else PROTOCOL_VERSION
+        self._protocol_versions[REQUEST_SCOPE.get()] = version
+        return {
+            "protocolVersion": version,
+            "capabilities": {
+                "tools": {"listChanged": True},
+                "resources": {"listChanged": True},
+            },
+            "serverInfo": {"name": self.name, "version": self.version},
+        }
+
+    async def _rpc_ping(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {}
+
+    async def _rpc_list_tools(self, params: dict[str, Any]) -> RawJSON:
+        if self._wants_full_listing(params):
+            return RawJSON([b'{"tools":', self.registry.tool_schemas_json(), b"}"])
+        return self._listing_result("tools", self.registry.page_tools, params)
+
+    async def _rpc_list_resources(self, params: dict[str, Any]) -> RawJSON:
+        if self._wants_full_listing(params):
+            return RawJSON([b'{"resources":', self.registry.resource_schemas_json(), b"}"])
+        return self._listing_result("resources", self.registry.page_resources, params)
+
+    async def _rpc_cancelled(self, params: dict[str, Any]) -> None:
+        request_id = params.get("requestId")
+        if not isinstance(request_id, (str, int)):
+            return
+        task = self._in_flight.get((REQUEST_SCOPE.get(), request_id))
+        if task is not None:
+            task.cancel()
+
+    async def _rpc_list_resource_templates(self, params: dict[str, Any]) -> RawJSON:
+        return RawJSON([b'{"resourceTemplates":', self.registry.template_schemas_json(), b"}"])
+
+    async def _rpc_read_resource(self, params: dict[str, Any]) -> RawJSON:
+        uri = params.get("uri")
+        if not isinstance(uri, str):
+            raise ProtocolError("Missing resource 'uri'", INVALID_PARAMS)
+        offset = params.get("offset", 0)
+        length = params.get("length")
+        if not isinstance(offset, int) or (length is not None and not isinstance(length, int)):
+            raise ProtocolError("'offset' and 'length' must be integers", INVALID_PARAMS)
+        contents = await self.handle_read_resource(uri, offset, length)
+        return RawJSON([b'{"contents":[', *contents, b"]}"])
+
+    def _wants_full_listing(self, params: dict[str, Any]) -> bool:
+        return self.page_size is None and not params.get("cursor") and not params.get("prefix")
+
+    def _listing_result(
+        self, key: str, page: Callable[..., ListingPage], params: dict[str, Any]
+    ) -> RawJSON:
+        cursor = params.get("cursor")
+        prefix = params.get("prefix") or ""
+        if cursor is not None and not isinstance(cursor, str):
+            raise ProtocolError("'cursor' must be a string", INVALID_PARAMS)
+        if not isinstance(prefix, str):
+            raise ProtocolError("'prefix' must be a string", INVALID_PARAMS)
+        try:
+            result = page(cursor, self.page_size or DEFAULT_PAGE_LIMIT, prefix)
+        except ValueError as e:
+            raise ProtocolError(str(e), INVALID_PARAMS)
+        pieces = [f'{{"{key}":'.encode(), result.json]
+        if result.next_cursor is not None:
+            pieces.append(f',"nextCursor":"{result.next_cursor}"'.encode())
+        pieces.append(b"}")
+        return RawJSON(pieces)
+
+    async def _rpc_call_tool(self, params: dict[str, Any]) -> RawJSON:
+        name = params.get("name")
+        if not isinstance(name, str):
+            raise ProtocolError("Missing tool 'name'", INVALID_PARAMS)
+        arguments = params.get("arguments") or {}
+        if not isinstance(arguments, dict):
+            raise ProtocolError("Tool 'arguments' must be an object", INVALID_PARAMS)
+        timeout = params.get("timeout")
+        if timeout is not None and (
+            not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or timeout <= 0
+        ):
+            raise ProtocolError("'timeout' must be a positive number of seconds", INVALID_PARAMS)
+        meta = params.get("_meta")
+        progress_token = meta.get("progressToken") if isinstance(meta, dict) else None
+        if progress_token is not None and (
+            not isinstance(progress_token, (str, int)) or isinstance(progress_token, bool)
+        ):
+            raise ProtocolError("'progressToken' must be a string or integer", INVALID_PARAMS)
+        request = ToolCallRequest(
+            tool_name=name, arguments=arguments, timeout=timeout, progress_token=progress_token
+        )
+        response = await self.handle_call_tool_async(request)
+        blocks = response.content_blocks()
+        if self.protocol_version() >= TYPED_RESULTS_VERSION:
+            return self.protocol.build_tool_result(blocks, response.is_error)
+        # Older clients know neither block type; the text already names the resource.
+        blocks = [block for block in blocks if not isinstance(block, ResourceLink)]
+        return self.protocol.build_tool_result(blocks, response.is_error, structured=False)
+
+    def _call_tool_sync(self, tool: ToolDefinition, request: ToolCallRequest) -> ToolCallResponse:
+        self._check_rate_limits(tool)
+        invalid = self._validate(tool, request)
+        if invalid is not None:
+            return invalid
+        cache = self._result_cache(tool)
+        key = canonical_arguments(request.arguments) if cache is not None else None
+        if cache is not None and key is not None and (cached := cache.get(key)) is not None:
+            return cached
+        try:
+            if not tool.is_loaded:
+                _load_handler(tool)
+            result = self.executors.call(tool.execution, _handler(tool), request.arguments)
+            if inspect.iscoroutine(result):
+                result = asyncio.run(result)
+            if is_stream(result):
+                sink = self._result_sink()
+                on_chunk = self._progress_callback(request)
+                try:
+                    if inspect.isasyncgen(result):
+                        asyncio.run(collect_async(result, sink, on_chunk))
+                    else:
+                        collect(result, sink, on_chunk)
+                except BaseException:
+                    sink.discard()
+                    raise
+                response = self._stream_response(sink)
+            elif (typed := self._typed_response(tool, result)) is not None:
+                response = typed
+            else:
+                response = self._text_response(str(result), self.spool)
+        except Exception as e:
+            return ToolCallResponse(content=f"Error: {e}", is_error=True)
+        if cache is not None and key is not None and response.resource_link is None:
+            cache.put(key, response)
+        return response
+
+    async def _call_tool_async(
+        self, tool: ToolDefinition, request: ToolCallRequest
+    ) -> ToolCallResponse:
+        self._check_rate_limits(tool)
+        invalid = self._validate(tool, request)
+        if invalid is not None:
+            return invalid
+        cache = self._result_cache(tool)
+        needs_key = cache is not None or tool.coalesce
+        key = canonical_arguments(request.arguments) if needs_key else None
+        if cache is not None and key is not None and (cached := cache.get(key)) is not None:
+            return cached
+        timeout = request.timeout if request.timeout is not None else tool.timeout
+        if tool.coalesce:
+            execution = self.single_flight.do(
+                tool.name, key, lambda: self._execute(tool, request)
+            )
+        else:
+            execution = self._execute(tool, request)
+        try:
+            response = await asyncio.wait_for(execution, timeout)
+        except TimeoutError:
+            return ToolCallResponse(
+                content=f"Tool '{tool.name}' timed out after {timeout:g}s", is_error=True
+            )
+        if cache is not None and key is not None and response.resource_link is None:
+            cache.put(key, response)
+        return response
+
+    async def _execute(self, tool: ToolDefinition, request: ToolCallRequest) -> ToolCallResponse:
+        held: list[ConcurrencyLimiter] = []
+        running: list[Future[Any]] = []
+        try:
+            # Take the tool slot before the global one so queued calls for a busy
+            # tool do not hold server-wide capacity.
+            for limiter in (self._tool_limiter(tool), self._limiter):
+                if limiter is not None:
+                    await limiter.acquire()
+                    held.append(limiter)
+            return await self._invoke(tool, request, running)
+        finally:
+            _release_when_finished(held, running)
+
+    async def _invoke(
+        self, tool: ToolDefinition, request: ToolCallRequest, running: list[Future[Any]]
+    ) -> ToolCallResponse:
+        try:
+            if not tool.is_loaded:
+                # Importing a tool's module may be slow; keep it off the event loop.
+                await self.executors.run(ExecutionMode.THREAD, _load_handler, {"tool": tool})
+            handler = _handler(tool)
+            if tool.is_async:
+                result = await handler(**request.arguments)
+            elif tool.is_streaming:
+                # Creating the generator runs none of its body, so it cannot block.
+                result = handler(**request.arguments)
+            else:
+                if tool.execution is ExecutionMode.INLINE:
+                    result = handler(**request.arguments)
+                else:
+                    future = self.executors.submit(tool.execution, handler, request.arguments)
+                    running.append(future)
+                    result = await asyncio.wrap_future(future)
+                if inspect.isawaitable(result):
+                    result = await result
+            if is_stream(result):
+                sink = self._result_sink()
+                try:
+                    await collect_async(
+                        result,
+                        sink,
+                        self._progress_callback(request),
+                        self._thread_runner(tool),
+                        self.stream_buffer,
+                    )
+                except BaseException:
+                    sink.discard()
+                    raise
+                return self._stream_response(sink)
+            typed = self._typed_response(tool, result)
+            if typed is not None:
+                return typed
+            text = str(result)
+            if self.spool is None or len(text) <= self.spool.policy.threshold:
+                return ToolCallResponse(content=text)
+            # Writing tens of megabytes must not stall the event loop.
+            return await self.executors.run(
+                ExecutionMode.THREAD, self._text_response, {"text": text, "spool": self.spool}
+            )
+        except Exception as e:
+            return ToolCallResponse(content=f"Error: {e}", is_error=True)
+
+    def _typed_response(self, tool: ToolDefinition, result: Any) -> ToolCallResponse | None:
+        blocks = as_blocks(result, _result_uri(tool))
+        if blocks is None:
+            return None
+        try:
+            # Encode now, while the handler's errors are still caught, so that
+            # writing or caching the response cannot fail later.
+            for block in blocks:
+                if isinstance(block, JsonContent):
+                    block.encode(self.protocol.codec)
+        except Exception:
+            # Values JSON cannot hold, such as sets or huge ints, are sent as text.
+            return None
+        return ToolCallResponse(blocks=blocks)
+
+    def _result_sink(self) -> TextBuffer | SpoolBuffer:
+        return self.spool.buffer() if self.spool is not None else TextBuffer()
+
+    def _stream_response(self, sink: TextBuffer | SpoolBuffer) -> ToolCallResponse:
+        result = sink.result()
+        if isinstance(result, Resource):
+            return _link_response(result)
+        return ToolCallResponse(content=result)
+
+    @staticmethod
+    def _text_response(text: str, spool: ResultSpool | None) -> ToolCallResponse:
+        if spool is None or len(text) <= spool.policy.threshold:
+            return ToolCallResponse(content=text)
+        return _link_response(spool.spool(text))
+
+    def _progress_callback(self, request: ToolCallRequest) -> ChunkCallback | None:
+        token = request.progress_token
+        if token is None:
+            return None
+        progress = 0
+
+        def send(chunk: str) -> None:
+            nonlocal progress
+            progress += 1
+            self.notify("notifications/progress", {
+                "progressToken": token, "progress": progress, "message": chunk,
+            }, about_request=True)
+        return send
+
+    def _thread_runner(self, tool: ToolDefinition) -> ThreadRunner | None:
+        if tool.execution is ExecutionMode.INLINE:
+            return None
+        return lambda func: self.executors.run(ExecutionMode.THREAD, func, {})
+
+    def _tool_limiter(self, tool: ToolDefinition) -> ConcurrencyLimiter | None:
+        if tool.limit is None:
+            return None
+        entry = self._tool_limiters.get(tool.name)
+        if entry is None or entry[0] is not tool:
+            entry = (tool, ConcurrencyLimiter(tool.limit, name=f"tool '{tool.name}'"))
+            self._tool_limiters[tool.name] = entry
+        return entry[1]
+
+    def _check_rate_limits(self, tool: ToolDefinition) -> None:
+        session = REQUEST_SCOPE.get()
+        if self._rate_limiter is not None:
+            self._rate_limiter.check(session)
+        if tool.rate_limit is None:
+            return
+        entry = self._tool_rate_limiters.get(tool.name)
+        if entry is None or entry[0] is not tool:
+            entry = (tool, RateLimiter(tool.rate_limit, name=f"tool '{tool.name}'"))
+            self._tool_rate_limiters[tool.name] = entry
+        entry[1].check(session)
+
+    def _result_cache(self, tool: ToolDefinition) -> ResultCache | None:
+        if tool.cache is None:
+            return None
+        entry = self._result_caches.get(tool.name)
+        if entry is None or entry[0] is not tool:
+            # First call, or the tool was re-registered: start from an empty cache.
+            entry = (tool, ResultCache(tool.cache))
+            self._result_caches[tool.name] = entry
+        return entry[1]
+
+    def _validate(self, tool: ToolDefinition, request: ToolCallRequest) -> ToolCallResponse | None:
+        # Tools registered without parameter definitions accept any arguments.
+        if not tool.parameters:
+            return None
+        snapshot = self.registry.snapshot()
+        if snapshot.tools.get(tool.name) is tool:
+            validator = snapshot.validators.get(tool.name)
+        else:
+            # Replaced since the call looked it up: check against the definition it runs.
+            validator = ToolValidator.compile(tool)
+        errors = validator(request.arguments) if validator is not None else []
+        if not errors:
+            return None
+        self.metrics.validation_failed(tool.name)
+        return ToolCallResponse(content="Invalid arguments: " + "; ".join(errors), is_error=True)
+
+    def _on_registry_change(self, kind: str) -> None:
+        self.notify(LIST_CHANGED_NOTIFICATIONS[kind])
+
+
+def _link_response(resource: Resource) -> ToolCallResponse:
+    return ToolCallResponse(
+        content=f"{resource.name} stored as resource {resource.uri}; read it with resources/read",
+        resource_link=resource,
+    )
+
+
+def _result_uri(tool: ToolDefinition) -> str:
+    return f"tool://{tool.name}/result"
+
+
+def _check_execution(tool: ToolDefinition) -> None:
+    if tool.execution is not ExecutionMode.PROCESS:
+        return
+    if tool.is_async:
+        raise ValueError(f"Async tool '{tool.name}' cannot run in a process pool")
+    if tool.is_streaming:
+        raise ValueError(f"Streaming tool '{tool.name}' cannot run in a process pool")
+
+
+def _reloadable(tool: ToolDefinition, module: str) -> bool:
+    handler = tool.handler
+    if isinstance(handler, str):
+        return handler.partition(":")[0] == module
+    # Bound methods and closures cannot be looked up again by name.
+    qualname = getattr(handler, "__qualname__", "<locals>")
+    return (
+        getattr(handler, "__module__", None) == module
+        and not inspect.ismethod(handler)
+        and "<locals>" not in qualname
+    )
+
+
+def _reloaded_handler(tool: ToolDefinition, module: Any) -> Callable[..., Any] | str | None:
+    handler = tool.handler
+    if handler is None or isinstance(handler, str):
+        # A path is imported from the reloaded module on first call.
+        return handler
+    target = module
+    for part in handler.__qualname__.split("."):
+        target = getattr(target, part, None)
+    # Reloading keeps names the new code no longer defines, still bound to
+    # the old objects; running the module again creates new functions.
+    if target is handler or not callable(target):
+        return None
+    return target
+
+
+def _release_when_finished(held: list[ConcurrencyLimiter], running: list[Future[Any]]) -> None:
+    def release() -> None:
+        for limiter in reversed(held):
+            limiter.release()
+
+    if not running or running[-1].done():
+        release()
+        return
+    # A timed-out or cancelled call cannot stop a handler that already started
+    # in a pool, so its slots stay taken until the handler returns.
+    loop = asyncio.get_running_loop()
+
+    def release_on_loop(_: Future[Any]) -> None:
+        try:
+            loop.call_soon_threadsafe(release)
+        except RuntimeError:
+            pass  # The loop is closed, and the limiters with it.
+
+    running[-1].add_done_callback(release_on_loop)
+
+
+def _handler(tool: ToolDefinition) -> Callable[..., Any]:
+    """Return a loaded tool's handler, which registration may have left unset."""
+    if not callable(tool.handler):
+        raise TypeError(f"Tool '{tool.name}' has no handler")
+    return tool.handler
+
+
+def _load_handler(tool: ToolDefinition) -> None:
+    path = tool.handler
+    tool.load()
+    try:
+        _check_execution(tool)
+    except ValueError:
+        # Stay unloaded so every call reports the problem instead of misbehaving.
+        tool.handler, tool.is_async, tool.is_streaming = path, False, False
+        raise
@@ -0,0 +1,82 @@
+"""Coalescing of identical concurrent calls into a single execution."""
+
+import asyncio
+from collections import Counter
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight(Generic[T]):
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: "asyncio.Future[T]") -> None:
+        self.future = future
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Shares one in-flight execution between concurrent callers with the same key.
+
+    The first caller for a key starts the work; callers arriving before it
+    finishes await the same result instead of starting their own. A caller
+    being cancelled, e.g. by a deadline, does not cancel the shared execution
+    for the others, but once every caller has been cancelled the execution
+    is cancelled too, so it stops and frees whatever it holds.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight[T]] = {}
+        self._executions: Counter[str] = Counter()
+        self._coalesced: Counter[str] = Counter()
+
+    async def do(self, group: str, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func`` unless an identical call is already in flight, then share its result.
+
+        Args:
+            group: Name used for the counters, e.g. the tool name.
+            key: Identifies equivalent calls within the group.
+            func: Starts the work when no identical call is in flight.
+
+        Returns:
+            The result of the shared execution.
+        """
+        flight_key = (group, key)
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            self._executions[group] += 1
+            flight = _Flight(asyncio.ensure_future(func()))
+            self._flights[flight_key] = flight
+            flight.future.add_done_callback(lambda _: self._forget(flight_key, flight))
+        else:
+            self._coalesced[group] += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.future)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.future.done():
+                # The last caller gave up: new callers start afresh, and the
+                # execution is cancelled and waited for, so its limiter slot
+                # is free again by the time this caller returns.
+                self._forget(flight_key, flight)
+                flight.future.cancel()
+                await asyncio.wait([flight.future])
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, flight_key: Hashable, flight: _Flight[T]) -> None:
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+
+    def in_flight(self) -> int:
+        """Return the number of distinct executions currently running."""
+        return len(self._flights)
+
+    def executions(self, group: str) -> int:
+        """Return how many executions were started for ``group``."""
+        return self._executions[group]
+
+    def coalesced(self, group: str) -> int:
+        """Return how many calls in ``group`` joined an execution instead of starting one."""
+        return self._coalesced[group]
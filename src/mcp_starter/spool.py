@@ -0,0 +1,150 @@
+"""Spooling of large tool results to temp files served as ephemeral resources."""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, TextIO
+
+from mcp_starter.models import Resource, SpoolPolicy
+from mcp_starter.resources import FileReader
+
+if TYPE_CHECKING:
+    from mcp_starter.registry import MCPRegistry
+
+SPOOL_URI_PREFIX = "spool://results/"
+
+
+class ResultSpool:
+    """Writes oversized results to temp files and registers them as resources.
+
+    Spooled results are added to the registry as ephemeral resources, so
+    clients can read them in ranges with ``resources/read`` without them
+    appearing in listings. Each expires ``policy.ttl`` seconds after it is
+    written; expired entries are removed on the next ``purge``, which runs
+    whenever a result is spooled. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        registry: "MCPRegistry",
+        policy: SpoolPolicy,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.registry = registry
+        self.policy = policy
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._directory: str | None = None
+        self._entries: deque[tuple[float, str, str]] = deque()
+
+    def buffer(self) -> "SpoolBuffer":
+        """Return a sink that accumulates streamed text and spools it past the threshold."""
+        return SpoolBuffer(self)
+
+    def spool(self, text: str) -> Resource:
+        """Write ``text`` to a new temp file and return the resource serving it."""
+        path, f = self.create_file()
+        with f:
+            f.write(text)
+        return self.publish(path, len(text))
+
+    def create_file(self) -> tuple[str, TextIO]:
+        """Open a new spool file for writing, purging expired ones first."""
+        self.purge()
+        with self._lock:
+            if self._directory is None:
+                self._directory = tempfile.mkdtemp(prefix="mcp-spool-", dir=self.policy.directory)
+            directory = self._directory
+        fd, path = tempfile.mkstemp(suffix=".txt", dir=directory)
+        return path, open(fd, "w", encoding="utf-8")
+
+    def publish(self, path: str, size: int) -> Resource:
+        """Register a finished spool file as an ephemeral resource."""
+        uri = SPOOL_URI_PREFIX + os.path.basename(path)
+        resource = Resource(
+            uri=uri,
+            name=f"Tool result ({size} characters)",
+            description=f"Spooled tool result, available for {self.policy.ttl:g}s.",
+            reader=FileReader(path),
+        )
+        self.registry.add_ephemeral_resource(resource)
+        with self._lock:
+            self._entries.append((self._clock() + self.policy.ttl, uri, path))
+        return resource
+
+    def purge(self) -> int:
+        """Remove expired results and return how many were removed."""
+        now = self._clock()
+        expired = []
+        with self._lock:
+            # Entries share one TTL, so they expire in insertion order.
+            while self._entries and self._entries[0][0] <= now:
+                expired.append(self._entries.popleft())
+        for _, uri, path in expired:
+            self._remove(uri, path)
+        return len(expired)
+
+    def close(self) -> None:
+        """Remove every spooled result and the spool directory."""
+        with self._lock:
+            entries, self._entries = self._entries, deque()
+            directory, self._directory = self._directory, None
+        for _, uri, _ in entries:
+            self.registry.remove_ephemeral_resource(uri)
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, uri: str, path: str) -> None:
+        self.registry.remove_ephemeral_resource(uri)
+        # Readers that already opened the file keep their mapping after unlink.
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+class SpoolBuffer:
+    """Collects streamed text in memory until it passes the spool threshold.
+
+    Past the threshold, buffered and later chunks go to a spool file, so a
+    long stream holds at most ``threshold`` characters in memory.
+    """
+
+    def __init__(self, spool: ResultSpool) -> None:
+        self._spool = spool
+        self._parts: list[str] = []
+        self._size = 0
+        self._path: str | None = None
+        self._file: TextIO | None = None
+
+    def write(self, text: str) -> None:
+        self._size += len(text)
+        if self._file is not None:
+            self._file.write(text)
+            return
+        self._parts.append(text)
+        if self._size > self._spool.policy.threshold:
+            self._path, self._file = self._spool.create_file()
+            self._file.writelines(self._parts)
+            self._parts = []
+
+    def result(self) -> str | Resource:
+        """Return the joined text, or the resource serving it if it was spooled."""
+        if self._file is None or self._path is None:
+            return "".join(self._parts)
+        self._file.close()
+        return self._spool.publish(self._path, self._size)
+
+    def discard(self) -> None:
+        """Drop everything written so far, deleting any partial spool file."""
+        self._parts = []
+        if self._file is not None and self._path is not None:
+            self._file.close()
+            os.unlink(self._path)
+            self._file = None
@@ -0,0 +1,144 @@
+"""Incremental results from generator and async-generator tool handlers."""
+
+import asyncio
+import inspect
+import threading
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generator, Iterator, Protocol
+
+DEFAULT_STREAM_BUFFER = 16
+
+ChunkCallback = Callable[[str], None]
+ThreadRunner = Callable[[Callable[[], None]], Awaitable[None]]
+
+_DONE = object()
+
+
+class TextSink(Protocol):
+    """Destination for the text of each chunk, such as a ``TextBuffer``."""
+
+    def write(self, text: str) -> None: ...
+
+
+class TextBuffer:
+    """Keeps every chunk in memory and joins them on ``result``."""
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+
+    def result(self) -> str:
+        return "".join(self._parts)
+
+    def discard(self) -> None:
+        self._parts = []
+
+
+def is_stream(value: Any) -> bool:
+    """Return True for generator and async-generator objects."""
+    return inspect.isgenerator(value) or inspect.isasyncgen(value)
+
+
+def collect(
+    stream: Iterator[Any], sink: TextSink, on_chunk: ChunkCallback | None = None
+) -> None:
+    """Drain a sync generator in the calling thread, writing each chunk to ``sink``."""
+    for chunk in stream:
+        text = str(chunk)
+        sink.write(text)
+        if on_chunk is not None:
+            on_chunk(text)
+
+
+async def collect_async(
+    stream: Generator[Any, Any, Any] | AsyncGenerator[Any, Any],
+    sink: TextSink,
+    on_chunk: ChunkCallback | None = None,
+    run_in_thread: ThreadRunner | None = None,
+    buffer_size: int = DEFAULT_STREAM_BUFFER,
+) -> None:
+    """Drain a generator without blocking the event loop, writing chunks to ``sink``.
+
+    ``sink`` and ``on_chunk`` are called on the event loop as each chunk arrives. Async
+    generators are iterated on the loop. Sync generators are iterated by
+    ``run_in_thread`` (or inline if it is None) and hand chunks over through
+    a queue of ``buffer_size`` entries, so a producer that outpaces the loop
+    blocks instead of buffering without limit. If the caller is cancelled,
+    an async generator is closed and a sync generator is closed once its
+    current step returns.
+
+    Args:
+        stream: A generator or async generator.
+        sink: Receives the text of every chunk.
+        on_chunk: Optional callback for each chunk's text.
+        run_in_thread: Runs a blocking callable on a worker thread.
+        buffer_size: Maximum chunks produced ahead of the consumer.
+    """
+    if isinstance(stream, AsyncGenerator):
+        await _collect_async_gen(stream, sink, on_chunk)
+    elif run_in_thread is None:
+        collect(stream, sink, on_chunk)
+    else:
+        await _collect_in_thread(stream, sink, on_chunk, run_in_thread, buffer_size)
+
+
+async def _collect_async_gen(
+    stream: AsyncGenerator[Any, Any], sink: TextSink, on_chunk: ChunkCallback | None
+) -> None:
+    try:
+        async for chunk in stream:
+            text = str(chunk)
+            sink.write(text)
+            if on_chunk is not None:
+                on_chunk(text)
+    finally:
+        await stream.aclose()
+
+
+async def _collect_in_thread(
+    stream: Generator[Any, Any, Any],
+    sink: TextSink,
+    on_chunk: ChunkCallback | None,
+    run_in_thread: ThreadRunner,
+    buffer_size: int,
+) -> None:
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[Any] = asyncio.Queue(buffer_size)
+    stopped = threading.Event()
+
+    def hand_over(item: Any) -> None:
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def produce() -> None:
+        try:
+            # Check before each step so a cancelled call stops at the next chunk.
+            while not stopped.is_set():
+                try:
+                    chunk = next(stream)
+                except StopIteration:
+                    hand_over(_DONE)
+                    return
+                hand_over(str(chunk))
+        except BaseException as e:
+            if not stopped.is_set():
+                hand_over(e)
+        finally:
+            stream.close()
+
+    producer = asyncio.ensure_future(run_in_thread(produce))
+    try:
+        while (item := await queue.get()) is not _DONE:
+            if isinstance(item, BaseException):
+                raise item
+            sink.write(item)
+            if on_chunk is not None:
+                on_chunk(item)
+    except BaseException:
+        stopped.set()
+        # Unblock a producer waiting for queue space so its thread can exit.
+        while not queue.empty():
+            queue.get_nowait()
+        producer.cancel()
+        raise
+    await producer
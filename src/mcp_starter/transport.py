@@ -0,0 +1,180 @@
+"""Asyncio stdio transport with concurrent request dispatch."""
+
+import asyncio
+import os
+import stat
+import sys
+from typing import IO, TYPE_CHECKING, Any, BinaryIO, Callable, Iterator, Protocol
+
+from mcp_starter.framing import Framer, NewlineFramer
+from mcp_starter.protocol import ProtocolError
+
+if TYPE_CHECKING:
+    from mcp_starter.server import MCPServer
+
+DEFAULT_MAX_IN_FLIGHT = 64
+READ_SIZE = 256 * 1024
+
+
+class MessageReader(Protocol):
+    """Minimal subset of ``asyncio.StreamReader`` used by transports."""
+
+    async def read(self, n: int) -> bytes: ...
+
+
+class MessageWriter(Protocol):
+    """Minimal subset of ``asyncio.StreamWriter`` used by transports."""
+
+    def write(self, data: bytes) -> None: ...
+
+    async def drain(self) -> None: ...
+
+
+class StdioTransport:
+    """Reads framed JSON-RPC messages and dispatches them concurrently.
+
+    Each message is handled in its own task so a slow tool call does not hold
+    up other requests. At most ``max_in_flight`` messages are processed at
+    once; further input is not read until a slot frees up. Messages are
+    newline-delimited unless another ``framing`` is given, e.g.
+    ``ContentLengthFramer`` or a ``functools.partial`` setting
+    ``max_message_size``.
+    """
+
+    def __init__(
+        self,
+        server: "MCPServer",
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        framing: Callable[[], Framer] = NewlineFramer,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.server = server
+        self.max_in_flight = max_in_flight
+        self.framing = framing
+
+    async def serve(self, reader: MessageReader, writer: MessageWriter) -> None:
+        """Process messages from ``reader`` until EOF, writing responses to ``writer``.
+
+        Framing errors, such as an oversized message, are answered with an
+        error response and reading continues with the next message.
+
+        Args:
+            reader: Source of framed messages.
+            writer: Sink for framed responses.
+        """
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks: set[asyncio.Task[None]] = set()
+        framer = self.framing()
+
+        def send(message: bytes) -> None:
+            for part in framer.wrap(message):
+                writer.write(part)
+
+        def send_notification(message: bytes) -> None:
+            # Registrations may happen on other threads; writes stay on the loop.
+            loop.call_soon_threadsafe(send, message)
+
+        async def dispatch(frames: Iterator[memoryview]) -> bool:
+            try:
+                for frame in frames:
+                    await slots.acquire()
+                    task = asyncio.create_task(self._handle(frame, send, writer, slots))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            except ProtocolError as e:
+                send(self.server.protocol.build_error(None, e.code, e.message))
+                return False
+            return True
+
+        self.server.add_notification_sink(send_notification)
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                # After a framing error, resume with the input the framer kept.
+                while not await dispatch(framer.feed(data)):
+                    data = b""
+            await dispatch(framer.finish())
+            if tasks:
+                # Requests cancelled by the client finish with CancelledError.
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self.server.remove_notification_sink(send_notification)
+
+    async def serve_stdio(self) -> None:
+        """Serve the process's stdin/stdout until stdin is closed.
+
+        Pipes, sockets and terminals are driven by the event loop. Asyncio
+        cannot watch regular files, so when stdin or stdout is redirected to
+        one, that side is read or written on a worker thread instead.
+        """
+        loop = asyncio.get_running_loop()
+        reader: MessageReader
+        if _is_pollable(sys.stdin):
+            reader = stream_reader = asyncio.StreamReader()
+            await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(stream_reader), sys.stdin
+            )
+        else:
+            reader = _FileReader(sys.stdin.buffer)
+        if not _is_pollable(sys.stdout):
+            file_writer = _FileWriter(sys.stdout.buffer)
+            try:
+                await self.serve(reader, file_writer)
+            finally:
+                await file_writer.drain()
+            return
+        write_transport, write_protocol = await loop.connect_write_pipe(
+            asyncio.streams.FlowControlMixin, sys.stdout
+        )
+        writer = asyncio.StreamWriter(write_transport, write_protocol, None, loop)
+        try:
+            await self.serve(reader, writer)
+        finally:
+            writer.close()
+
+    async def _handle(
+        self,
+        frame: memoryview,
+        send: Callable[[bytes], None],
+        writer: MessageWriter,
+        slots: asyncio.Semaphore,
+    ) -> None:
+        try:
+            response = await self.server.handle_raw(frame)
+            if response is not None:
+                send(response)
+                await writer.drain()
+        finally:
+            slots.release()
+
+
+class _FileReader:
+    """Reads a regular file on a worker thread."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+
+    async def read(self, n: int) -> bytes:
+        return await asyncio.to_thread(self._file.read, n)
+
+
+class _FileWriter:
+    """Buffers writes to a regular file and flushes them on a worker thread."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    async def drain(self) -> None:
+        await asyncio.to_thread(self._file.flush)
+
+
+def _is_pollable(file: IO[Any]) -> bool:
+    mode = os.fstat(file.fileno()).st_mode
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode)
@@ -1,16 +1,9 @@
 """Input validation for MCP tool calls."""
 
-from typing import Any
+from typing import Any, Callable
 
 from mcp_starter.models import ToolDefinition, ToolParamType
 
-TYPE_MAP: dict[ToolParamType, type | tuple[type, ...]] = {
-    ToolParamType.STRING: str,
-    ToolParamType.INTEGER: int,
-    ToolParamType.BOOLEAN: bool,
-    ToolParamType.NUMBER: (int, float),
-}
-
 
 class ValidationError(Exception):
     """Raised when tool call validation fails."""
@@ -21,12 +14,85 @@ class ValidationError(Exception):
         super().__init__(message)
 
 
+def _is_string(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def _is_integer(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_boolean(value: Any) -> bool:
+    return isinstance(value, bool)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+TYPE_CHECKERS: dict[ToolParamType, Callable[[Any], bool]] = {
+    ToolParamType.STRING: _is_string,
+    ToolParamType.INTEGER: _is_integer,
+    ToolParamType.BOOLEAN: _is_boolean,
+    ToolParamType.NUMBER: _is_number,
+}
+
+
+class CompiledValidator:
+    """Argument validator precomputed from a ToolDefinition.
+
+    Builds the required/known name sets and per-parameter type checks once,
+    so a valid call costs a subset test plus one check per supplied argument.
+    """
+
+    __slots__ = ("tool_name", "_required", "_known", "_checks")
+
+    def __init__(self, tool: ToolDefinition) -> None:
+        self.tool_name = tool.name
+        self._required = tuple(p.name for p in tool.parameters if p.required)
+        self._known = frozenset(p.name for p in tool.parameters)
+        self._checks = tuple(
+            (p.name, p.type.value, TYPE_CHECKERS[p.type]) for p in tool.parameters
+        )
+
+    def __call__(self, arguments: dict[str, Any]) -> list[str]:
+        """Validate arguments, returning a list of error messages (empty if valid)."""
+        errors: list[str] = []
+        for name in self._required:
+            if name not in arguments:
+                errors.append(f"Missing required parameter: {name}")
+        if not self._known.issuperset(arguments):
+            for key in arguments:
+                if key not in self._known:
+                    errors.append(f"Unknown parameter: {key}")
+        for name, type_name, check in self._checks:
+            if name in arguments:
+                value = arguments[name]
+                if not check(value):
+                    errors.append(
+                        f"Parameter '{name}' expected {type_name}, got {type(value).__name__}"
+                    )
+        return errors
+
+
 class ToolValidator:
     """Validates tool call arguments against a ToolDefinition."""
 
+    @staticmethod
+    def compile(tool: ToolDefinition) -> CompiledValidator:
+        """Build a reusable validator for ``tool``.
+
+        The result does not track later changes to ``tool.parameters``;
+        recompile after modifying them.
+        """
+        return CompiledValidator(tool)
+
     def validate_call(self, tool: ToolDefinition, arguments: dict[str, Any]) -> list[str]:
         """Validate arguments against the tool's parameter definitions.
 
+        The tool is compiled on every call; use ``compile`` to validate many
+        calls to the same tool.
+
         Args:
             tool: The tool definition to validate against.
             arguments: Mapping of argument names to values.
@@ -34,29 +100,4 @@ class ToolValidator:
         Returns:
             A list of validation error messages (empty if valid).
         """
-        errors: list[str] = []
-        for param in tool.parameters:
-            if param.required and param.name not in arguments:
-                errors.append(f"Missing required parameter: {param.name}")
-        known_names = {p.name for p in tool.parameters}
-        for key in arguments:
-            if key not in known_names:
-                errors.append(f"Unknown parameter: {key}")
-        for param in tool.parameters:
-            if param.name in arguments:
-                value = arguments[param.name]
-                if not self._check_type(value, param.type):
-                    errors.append(
-                        f"Parameter '{param.name}' expected {param.type.value}, "
-                        f"got {type(value).__name__}"
-                    )
-        return errors
-
-    @staticmethod
-    def _check_type(value: Any, param_type: ToolParamType) -> bool:
-        expected = TYPE_MAP[param_type]
-        if param_type == ToolParamType.INTEGER and isinstance(value, bool):
-            return False
-        if param_type == ToolParamType.NUMBER and isinstance(value, bool):
-            return False
-        return isinstance(value, expected)
+        return CompiledValidator(tool)(arguments)
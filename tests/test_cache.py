@@ -0,0 +1,113 @@
+"""Tests for tool result memoization."""
+
+import asyncio
+
+import pytest
+
+from mcp_starter.cache import ResultCache, canonical_arguments
+from mcp_starter.models import CachePolicy, ToolCallRequest, ToolCallResponse
+from mcp_starter.server import MCPServer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_canonical_arguments_ignores_key_order():
+    assert canonical_arguments({"b": 1, "a": [1, 2]}) == canonical_arguments({"a": [1, 2], "b": 1})
+    assert canonical_arguments({"a": 1}) != canonical_arguments({"a": "1"})
+
+
+def test_lru_eviction_and_stats():
+    cache = ResultCache(CachePolicy(max_entries=2))
+    cache.put("a", ToolCallResponse(content="A"))
+    cache.put("b", ToolCallResponse(content="B"))
+    assert cache.get("a").content == "A"
+    cache.put("c", ToolCallResponse(content="C"))
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (1, 1, 1, 2)
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = ResultCache(CachePolicy(ttl=10), clock=clock)
+    cache.put("a", ToolCallResponse(content="A"))
+    clock.now = 9.9
+    assert cache.get("a") is not None
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert cache.stats().entries == 0
+
+
+def test_max_bytes_bounds_total_size():
+    cache = ResultCache(CachePolicy(max_bytes=10))
+    cache.put("big", ToolCallResponse(content="x" * 11))
+    assert cache.stats().entries == 0
+    cache.put("a", ToolCallResponse(content="x" * 6))
+    cache.put("b", ToolCallResponse(content="x" * 6))
+    stats = cache.stats()
+    assert (stats.entries, stats.bytes, stats.evictions) == (1, 6, 1)
+
+
+def test_errors_not_cached_and_invalidate():
+    cache = ResultCache(CachePolicy())
+    cache.put("err", ToolCallResponse(content="boom", is_error=True))
+    assert cache.get("err") is None
+    cache.put("a", ToolCallResponse(content="A"))
+    cache.put("b", ToolCallResponse(content="B"))
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    cache.invalidate()
+    assert cache.stats().entries == 0
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        CachePolicy(max_entries=0)
+    with pytest.raises(ValueError):
+        CachePolicy(ttl=0)
+
+
+def test_server_caches_successful_results_only():
+    server = MCPServer(name="test")
+    calls = []
+
+    @server.tool(name="lookup", description="Pure lookup", cache=CachePolicy())
+    def lookup(key: str) -> str:
+        calls.append(key)
+        if key == "bad":
+            raise KeyError(key)
+        return key.upper()
+
+    def call(key):
+        return server.handle_call_tool(ToolCallRequest(tool_name="lookup", arguments={"key": key}))
+
+    assert call("a").content == "A"
+    assert asyncio.run(server.handle_call_tool_async(
+        ToolCallRequest(tool_name="lookup", arguments={"key": "a"})
+    )).content == "A"
+    call("bad")
+    call("bad")
+    assert calls == ["a", "bad", "bad"]
+    stats = server.cache_stats("lookup")
+    assert (stats.hits, stats.misses) == (1, 3)
+
+    server.invalidate_cache("lookup", {"key": "a"})
+    call("a")
+    assert calls[-1] == "a"
+    server.invalidate_cache()
+    assert server.cache_stats("lookup").entries == 0
+    assert server.cache_stats("missing") is None
+
+
+def test_reregistration_discards_cache():
+    server = MCPServer(name="test")
+    server.tool(name="v", description="", cache=CachePolicy())(lambda: "one")
+    assert server.handle_call_tool(ToolCallRequest(tool_name="v")).content == "one"
+    server.tool(name="v", description="", cache=CachePolicy())(lambda: "two")
+    assert server.handle_call_tool(ToolCallRequest(tool_name="v")).content == "two"
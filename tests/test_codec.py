@@ -0,0 +1,47 @@
+"""Tests for the pluggable JSON codecs."""
+
+import pytest
+
+from mcp_starter.codec import StdlibCodec, available_codecs, default_codec
+from mcp_starter.protocol import PARSE_ERROR, ProtocolError, ProtocolHandler, RawJSON
+
+CODECS = available_codecs()
+
+
+@pytest.fixture(params=CODECS, ids=[c.name for c in CODECS])
+def handler(request):
+    return ProtocolHandler(codec=request.param)
+
+
+def test_default_codec_prefers_installed_library():
+    assert default_codec().name == CODECS[0].name
+    assert CODECS[-1].name == "json"
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"jsonrpc": "2.0", "id": 1, "method": "ping"}',
+    memoryview(b'xx{"jsonrpc": "2.0", "id": 1, "method": "ping"}xx')[2:-2],
+    '{"jsonrpc": "2.0", "id": 1, "method": "ping"}',
+])
+def test_parse_accepts_bytes_memoryview_and_str(handler, raw):
+    assert handler.parse_request(raw) == {"jsonrpc": "2.0", "id": 1, "method": "ping"}
+
+
+@pytest.mark.parametrize("raw", [b"not json {{{", b"\xff\xfe", memoryview(b"{")])
+def test_malformed_input_is_a_parse_error(handler, raw):
+    with pytest.raises(ProtocolError, match="Invalid JSON") as info:
+        handler.parse_request(raw)
+    assert info.value.code == PARSE_ERROR
+
+
+def test_missing_method_is_reported(handler):
+    with pytest.raises(ProtocolError, match="Missing 'method' field"):
+        handler.parse_request(b'{"jsonrpc": "2.0", "id": 1}')
+
+
+def test_codecs_produce_identical_output(handler):
+    reference = ProtocolHandler(codec=StdlibCodec())
+    result = {"text": "café ✓", "n": [1, 2.5, None, True]}
+    assert handler.build_response(7, result) == reference.build_response(7, result)
+    assert handler.build_error("a", -1, "bad") == reference.build_error("a", -1, "bad")
+    assert handler.build_response(7, RawJSON(b'{"x":1}')) == handler.build_response(7, {"x": 1})
@@ -0,0 +1,137 @@
+"""Tests for typed tool result content blocks."""
+
+import asyncio
+import base64
+import json
+
+import pytest
+
+from mcp_starter.cache import response_size
+from mcp_starter.content import (
+    EmbeddedResource,
+    ImageContent,
+    JsonContent,
+    ResourceLink,
+    TextContent,
+    as_blocks,
+)
+from mcp_starter.models import CachePolicy, ExecutionMode, ToolCallRequest, ToolCallResponse
+from mcp_starter.protocol import ProtocolHandler
+from mcp_starter.server import MCPServer
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256))
+
+
+def _result(handler, response: ToolCallResponse) -> dict:
+    raw = handler.build_tool_result(response.content_blocks(), response.is_error)
+    return json.loads(handler.build_response(1, raw))["result"]
+
+
+@pytest.fixture
+def handler():
+    return ProtocolHandler()
+
+
+def test_text_response_is_unchanged(handler):
+    assert _result(handler, ToolCallResponse(content="hi")) == {
+        "content": [{"type": "text", "text": "hi"}], "isError": False,
+    }
+    assert _result(handler, ToolCallResponse(content="", is_error=True))["isError"] is True
+
+
+def test_blocks_render_as_mcp_content(handler):
+    response = ToolCallResponse(content="summary", blocks=[
+        ImageContent(PNG, "image/png"),
+        EmbeddedResource("file:///a.txt", "text/plain", text="línea"),
+        EmbeddedResource("file:///a.bin", blob=b"\x00\xff"),
+        ResourceLink("file:///big.csv", "big", mime_type="text/csv"),
+    ])
+    text, image, text_resource, blob_resource, link = _result(handler, response)["content"]
+    assert text == {"type": "text", "text": "summary"}
+    assert image == {"type": "image", "mimeType": "image/png",
+                     "data": base64.b64encode(PNG).decode()}
+    assert text_resource["resource"] == {
+        "uri": "file:///a.txt", "mimeType": "text/plain", "text": "línea",
+    }
+    assert blob_resource["resource"]["blob"] == base64.b64encode(b"\x00\xff").decode()
+    assert link["type"] == "resource_link" and link["mimeType"] == "text/csv"
+
+
+def test_json_content_is_structured_and_encoded_once(handler):
+    block = JsonContent({"rows": [1, 2], "ok": True})
+    result = _result(handler, ToolCallResponse(blocks=[block]))
+    assert result["structuredContent"] == {"rows": [1, 2], "ok": True}
+    assert json.loads(result["content"][0]["text"]) == result["structuredContent"]
+    encoded = block.encode(handler.codec)
+    _result(handler, ToolCallResponse(blocks=[block]))
+    assert block.encode(handler.codec) is encoded
+    assert response_size(ToolCallResponse(blocks=[block])) == len(encoded)
+
+
+@pytest.mark.parametrize("value", [[1, 2], (3,), "s", 4])
+def test_non_object_json_content_is_wrapped_in_structured_content(handler, value):
+    result = _result(handler, ToolCallResponse(blocks=[JsonContent(value)]))
+    expected = list(value) if isinstance(value, tuple) else value
+    assert result["structuredContent"] == {"result": expected}
+    assert json.loads(result["content"][0]["text"]) == expected
+
+
+def test_embedded_resource_requires_one_payload():
+    with pytest.raises(ValueError):
+        EmbeddedResource("file:///x")
+    with pytest.raises(ValueError):
+        EmbeddedResource("file:///x", text="a", blob=b"a")
+
+
+def test_as_blocks_maps_return_values():
+    image = ImageContent(PNG, "image/png")
+    assert as_blocks(image, "u") == [image]
+    assert as_blocks([image, TextContent("t")], "u") == [image, TextContent("t")]
+    assert as_blocks({"a": 1}, "u") == [JsonContent({"a": 1})]
+    assert as_blocks([1, 2], "u") == [JsonContent([1, 2])]
+    assert as_blocks(b"\x01", "u") == [EmbeddedResource("u", blob=b"\x01")]
+    assert as_blocks("text", "u") is None
+    assert as_blocks(42, "u") is None
+
+
+@pytest.mark.parametrize("execution", [ExecutionMode.INLINE, ExecutionMode.THREAD])
+def test_tools_return_structured_and_binary_results(execution):
+    server = MCPServer(name="test")
+    server.tool(name="stats", description="", execution=execution)(lambda: {"mean": 1.5})
+    server.tool(name="rows", description="", execution=execution)(lambda: [1, 2])
+    server.tool(name="raw", description="", execution=execution)(lambda: b"\x00\x01")
+    server.tool(name="chart", description="", execution=execution)(
+        lambda: ImageContent(PNG, "image/png")
+    )
+
+    def call(name):
+        return json.loads(asyncio.run(server.handle_message({
+            "jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": name},
+        })))["result"]
+
+    assert call("stats")["structuredContent"] == {"mean": 1.5}
+    assert call("rows")["structuredContent"] == {"result": [1, 2]}
+    assert call("raw")["content"][0]["resource"] == {
+        "uri": "tool://raw/result", "mimeType": "application/octet-stream",
+        "blob": base64.b64encode(b"\x00\x01").decode(),
+    }
+    assert call("chart")["content"][0]["type"] == "image"
+    sync = server.handle_call_tool(ToolCallRequest(tool_name="stats"))
+    assert sync.blocks == [JsonContent({"mean": 1.5})] and sync.content == ""
+
+
+@pytest.mark.parametrize("value", [{"t": {1, 2}}, [2**70]])
+def test_values_json_cannot_hold_do_not_fail_the_call(value):
+    # Sets never encode; ints over 64 bits do not under orjson.
+    server = MCPServer(name="test")
+    server.tool(name="odd", description="", cache=CachePolicy())(lambda: value)
+    request = ToolCallRequest(tool_name="odd")
+    for _ in range(2):
+        assert not server.handle_call_tool(request).is_error
+        assert not asyncio.run(server.handle_call_tool_async(request)).is_error
+    result = json.loads(asyncio.run(server.handle_message({
+        "jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "odd"},
+    })))["result"]
+    assert not result["isError"]
+    if isinstance(value, dict):
+        assert result["content"] == [{"type": "text", "text": str(value)}]
@@ -0,0 +1,97 @@
+"""Tests for executor pools used by sync tool handlers."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from mcp_starter.executors import ExecutorPool
+from mcp_starter.models import ExecutionMode, ToolCallRequest
+from mcp_starter.server import MCPServer
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+def current_pid() -> int:
+    return os.getpid()
+
+
+@pytest.fixture
+def pool():
+    pool = ExecutorPool(max_threads=2, max_processes=2)
+    yield pool
+    pool.shutdown()
+
+
+def test_inline_runs_on_calling_thread(pool):
+    ident = asyncio.run(pool.run(ExecutionMode.INLINE, threading.get_ident, {}))
+    assert ident == threading.get_ident()
+
+
+def test_thread_runs_off_calling_thread(pool):
+    ident = asyncio.run(pool.run(ExecutionMode.THREAD, threading.get_ident, {}))
+    assert ident != threading.get_ident()
+
+
+def test_process_runs_in_child_process(pool):
+    assert asyncio.run(pool.run(ExecutionMode.PROCESS, square, {"x": 7})) == 49
+    assert asyncio.run(pool.run(ExecutionMode.PROCESS, current_pid, {})) != os.getpid()
+
+
+def test_pools_are_lazy_and_restartable(pool):
+    assert pool._threads is None and pool._processes is None
+    asyncio.run(pool.run(ExecutionMode.THREAD, square, {"x": 2}))
+    assert pool._threads is not None
+    pool.shutdown()
+    assert pool._threads is None
+    assert asyncio.run(pool.run(ExecutionMode.THREAD, square, {"x": 3})) == 9
+
+
+def test_invalid_pool_sizes():
+    with pytest.raises(ValueError):
+        ExecutorPool(max_threads=0)
+    with pytest.raises(ValueError):
+        ExecutorPool(max_processes=0)
+
+
+def test_server_dispatches_by_execution_mode():
+    server = MCPServer(name="test", max_processes=1)
+    server.tool(name="square", description="Square", execution=ExecutionMode.PROCESS)(square)
+    try:
+        response = asyncio.run(server.handle_call_tool_async(
+            ToolCallRequest(tool_name="square", arguments={"x": 5})
+        ))
+        assert response.content == "25"
+        assert server.registry.get_tool("square").execution is ExecutionMode.PROCESS
+    finally:
+        server.shutdown()
+
+
+def test_call_blocks_and_uses_the_process_pool_only_for_process_mode(pool):
+    assert pool.call(ExecutionMode.THREAD, threading.get_ident, {}) == threading.get_ident()
+    assert pool._threads is None
+    assert pool.call(ExecutionMode.PROCESS, square, {"x": 6}) == 36
+    assert pool.call(ExecutionMode.PROCESS, current_pid, {}) != os.getpid()
+
+
+def test_sync_call_runs_process_tools_in_the_pool():
+    server = MCPServer(name="test", max_processes=1)
+    server.tool(name="pid", description="Process id", execution=ExecutionMode.PROCESS)(current_pid)
+    try:
+        response = server.handle_call_tool(ToolCallRequest(tool_name="pid"))
+        assert not response.is_error and response.content != str(os.getpid())
+    finally:
+        server.shutdown()
+
+
+def test_async_tool_rejects_process_mode():
+    server = MCPServer(name="test")
+
+    async def handler() -> None:
+        return None
+
+    with pytest.raises(ValueError, match="process pool"):
+        server.tool(name="bad", description="", execution=ExecutionMode.PROCESS)(handler)
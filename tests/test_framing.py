@@ -0,0 +1,130 @@
+"""Tests for incremental message framing."""
+
+import asyncio
+import json
+
+import pytest
+
+from mcp_starter.framing import (
+    ContentLengthFramer,
+    Framer,
+    MessageTooLargeError,
+    NewlineFramer,
+)
+from mcp_starter.protocol import ProtocolError
+from mcp_starter.server import MCPServer
+from mcp_starter.transport import StdioTransport
+
+
+def _feed_all(framer, chunks):
+    messages = []
+    for chunk in chunks:
+        messages.extend(bytes(m) for m in framer.feed(chunk))
+    messages.extend(bytes(m) for m in framer.finish())
+    return messages
+
+
+def _split(data: bytes, size: int) -> list[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestNewlineFramer:
+    def test_messages_within_one_chunk_are_slices_of_it(self):
+        chunk = b'{"a": 1}\n{"b": 2}\n'
+        frames = list(NewlineFramer().feed(chunk))
+        assert [bytes(f) for f in frames] == [b'{"a": 1}', b'{"b": 2}']
+        assert all(f.obj is chunk for f in frames)
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 1000])
+    def test_arbitrary_chunking(self, size):
+        data = b'{"a": 1}\n\n  \n{"b": "x y"}\r\n{"c": 3}'
+        messages = _feed_all(NewlineFramer(), _split(data, size))
+        assert messages == [b'{"a": 1}', b'{"b": "x y"}\r', b'{"c": 3}']
+
+    def test_large_message_split_across_many_chunks(self):
+        payload = b'{"text": "' + b"x" * 2_000_000 + b'"}'
+        messages = _feed_all(NewlineFramer(), _split(payload + b"\n", 4096))
+        assert messages == [payload]
+
+    def test_oversized_message_is_skipped_and_framing_continues(self):
+        framer = NewlineFramer(max_message_size=10)
+        frames = framer.feed(b'{"a": 1}\n' + b"x" * 12)
+        assert bytes(next(frames)) == b'{"a": 1}'
+        with pytest.raises(MessageTooLargeError):
+            next(frames)
+        assert list(framer.feed(b"x" * 20)) == []
+        assert [bytes(m) for m in framer.feed(b"xxxx\n" + b'{"b": 2}\n')] == [b'{"b": 2}']
+
+    def test_oversized_final_piece_keeps_following_input(self):
+        framer = NewlineFramer(max_message_size=4)
+        with pytest.raises(MessageTooLargeError):
+            list(framer.feed(b"123456\n{}\n"))
+        assert [bytes(m) for m in framer.feed(b"")] == [b"{}"]
+
+
+class TestContentLengthFramer:
+    @pytest.mark.parametrize("size", [1, 5, 1000])
+    def test_arbitrary_chunking(self, size):
+        bodies = [b'{"a": 1}', b'{"b": "\\n"}']
+        data = b"".join(b"".join(ContentLengthFramer.wrap(b)) for b in bodies)
+        data = data.replace(b"\r\n\r\n", b"\r\nContent-Type: application/json\r\n\r\n", 1)
+        assert _feed_all(ContentLengthFramer(), _split(data, size)) == bodies
+
+    def test_single_chunk_message_is_a_slice(self):
+        chunk = b"Content-Length: 2\r\n\r\n{}"
+        (frame,) = ContentLengthFramer().feed(chunk)
+        assert frame.obj is chunk and bytes(frame) == b"{}"
+
+    def test_oversized_message_is_skipped_by_length(self):
+        framer = ContentLengthFramer(max_message_size=4)
+        with pytest.raises(MessageTooLargeError):
+            list(framer.feed(b"Content-Length: 6\r\n\r\n{}"))
+        data = b'"abc"' + b"".join(ContentLengthFramer.wrap(b"[]"))
+        assert [bytes(m) for m in framer.feed(data[1:])] == [b"[]"]
+
+    def test_invalid_headers(self):
+        with pytest.raises(ProtocolError, match="Missing Content-Length"):
+            list(ContentLengthFramer().feed(b"X: 1\r\n\r\n"))
+        with pytest.raises(ProtocolError, match="Invalid Content-Length"):
+            list(ContentLengthFramer().feed(b"Content-Length: -1\r\n\r\n"))
+
+
+class CollectingWriter:
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        pass
+
+
+def test_transport_with_content_length_framing_and_size_limit():
+    server = MCPServer(name="test")
+    ping = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "ping"}).encode()
+    big = json.dumps({"jsonrpc": "2.0", "id": 2, "method": "ping", "x": "y" * 500}).encode()
+
+    async def run():
+        reader = asyncio.StreamReader()
+        for body in (big, ping):
+            reader.feed_data(b"".join(ContentLengthFramer.wrap(body)))
+        reader.feed_eof()
+        writer = CollectingWriter()
+        transport = StdioTransport(server, framing=lambda: ContentLengthFramer(256))
+        await transport.serve(reader, writer)
+        return [json.loads(bytes(m)) for m in ContentLengthFramer().feed(bytes(writer.data))]
+
+    error, response = asyncio.run(run())
+    assert error["id"] is None and "exceeds 256 bytes" in error["error"]["message"]
+    assert response == {"jsonrpc": "2.0", "id": 1, "result": {}}
+
+
+def test_framer_subclasses_must_implement_framing():
+    class Partial(Framer):
+        @staticmethod
+        def wrap(message):
+            return (message,)
+
+    with pytest.raises(TypeError, match="_frames"):
+        Partial()
@@ -0,0 +1,103 @@
+"""Tests for reloading tool modules without dropping in-flight calls."""
+
+import asyncio
+import sys
+import textwrap
+
+import pytest
+
+from mcp_starter.models import ToolCallRequest
+from mcp_starter.server import MCPServer
+
+MODULE = """
+    from reload_host import gate, server
+
+    @server.tool(name="version", description="Report the module version")
+    async def version() -> str:
+        await gate.wait()
+        return "{version}"
+
+    def plain() -> str:
+        return "plain {version}"
+
+    {extra}
+"""
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    (tmp_path / "reload_host.py").write_text(textwrap.dedent("""
+        import asyncio
+
+        from mcp_starter.server import MCPServer
+
+        server = MCPServer(name="reload")
+        gate = asyncio.Event()
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # Bytecode of a rewritten module is keyed by mtime; don't let a stale cache win.
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+
+    def write(version: str, extra: str = "") -> None:
+        source = MODULE.format(version=version, extra=extra)
+        (tmp_path / "reload_tools_mod.py").write_text(textwrap.dedent(source))
+
+    yield write
+    for name in ["reload_host", "reload_tools_mod"]:
+        sys.modules.pop(name, None)
+
+
+def _host():
+    import reload_host
+
+    return reload_host
+
+
+def test_reload_swaps_tools_atomically(modules):
+    modules("v1", extra="def legacy() -> str:\n        return 'old'")
+    host = _host()
+    server: MCPServer = host.server
+    assert server.reload_tools("reload_tools_mod") == ["version"]
+    server.add_tool("plain", "Plain", "reload_tools_mod:plain")
+    server.add_tool("legacy", "Legacy", sys.modules["reload_tools_mod"].legacy)
+    server.load_tools()
+    changes = []
+    server.registry.add_listener(changes.append)
+
+    modules("v2")
+    assert server.reload_tools("reload_tools_mod") == ["legacy", "plain", "version"]
+    assert changes == ["tools"]
+    assert server.registry.get_tool("legacy") is None
+    response = server.handle_call_tool(ToolCallRequest(tool_name="plain"))
+    assert response.content == "plain v2"
+
+
+def test_in_flight_calls_finish_on_the_old_handler(modules):
+    modules("v1")
+    host = _host()
+    server: MCPServer = host.server
+    server.reload_tools("reload_tools_mod")
+
+    async def scenario() -> tuple[str, str]:
+        old = asyncio.create_task(
+            server.handle_call_tool_async(ToolCallRequest(tool_name="version"))
+        )
+        await asyncio.sleep(0)
+        modules("v2")
+        server.reload_tools("reload_tools_mod")
+        host.gate.set()
+        new = await server.handle_call_tool_async(ToolCallRequest(tool_name="version"))
+        return (await old).content, new.content
+
+    assert asyncio.run(scenario()) == ("v1", "v2")
+
+
+def test_failed_reload_leaves_registry_unchanged(modules):
+    modules("v1")
+    server: MCPServer = _host().server
+    server.reload_tools("reload_tools_mod")
+    before = server.registry.snapshot()
+    modules("v2", extra="raise RuntimeError('broken')")
+    with pytest.raises(RuntimeError, match="broken"):
+        server.reload_tools("reload_tools_mod")
+    assert server.registry.snapshot() is before
@@ -0,0 +1,321 @@
+"""Tests for the Streamable HTTP transport."""
+
+import asyncio
+import json
+
+import pytest
+
+from mcp_starter.http_transport import SESSION_HEADER, HTTPTransport
+from mcp_starter.models import ToolParam, ToolParamType
+from mcp_starter.server import MCPServer
+
+
+class Client:
+    """Minimal HTTP/1.1 client over one persistent connection."""
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.session_id: str | None = None
+
+    async def __aenter__(self) -> "Client":
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.writer.close()
+
+    async def request(self, method, body=None, path="/mcp", accept="application/json", **headers):
+        data = json.dumps(body).encode() if body is not None else b""
+        lines = [f"{method} {path} HTTP/1.1", "Host: test", f"Accept: {accept}",
+                 f"Content-Length: {len(data)}"]
+        if self.session_id is not None:
+            lines.append(f"{SESSION_HEADER}: {self.session_id}")
+        lines.extend(f"{k.replace('_', '-')}: {v}" for k, v in headers.items())
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + data)
+        return await self.read_response()
+
+    async def read_response(self):
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode().strip().split("\r\n")
+        response_headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        if response_headers.get("transfer-encoding") == "chunked":
+            body = await self.read_chunks()
+        else:
+            body = await self.reader.readexactly(int(response_headers["content-length"]))
+        return int(status_line.split()[1]), response_headers, body
+
+    async def read_chunks(self, limit=None) -> bytes:
+        parts = []
+        while limit is None or len(parts) < limit:
+            size = int(await self.reader.readuntil(b"\r\n"), 16)
+            chunk = await self.reader.readexactly(size + 2)
+            if size == 0:
+                break
+            parts.append(chunk[:-2])
+        return b"".join(parts)
+
+    async def initialize(self):
+        status, headers, _ = await self.request("POST", _rpc(0, "initialize"))
+        assert status == 200
+        self.session_id = headers[SESSION_HEADER.lower()]
+
+
+def _rpc(request_id, method, **params):
+    message = {"jsonrpc": "2.0", "method": method, "params": params}
+    if request_id is not None:
+        message["id"] = request_id
+    return message
+
+
+def _events(body: bytes) -> list[dict]:
+    return [json.loads(line[6:]) for line in body.split(b"\n") if line.startswith(b"data: ")]
+
+
+def _serve(server, scenario, **options):
+    async def run():
+        transport = HTTPTransport(server, port=0, **options)
+        await transport.start()
+        try:
+            return await scenario(transport)
+        finally:
+            await transport.close()
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def server():
+    server = MCPServer(name="test")
+
+    @server.tool(name="echo", description="Echo text", parameters=[
+        ToolParam(name="text", type=ToolParamType.STRING),
+    ])
+    def echo(text: str) -> str:
+        return text
+
+    @server.tool(name="count", description="Stream numbers")
+    async def count():
+        for i in range(3):
+            yield str(i)
+
+    return server
+
+
+def test_session_and_keep_alive(server):
+    async def scenario(transport):
+        async with Client(transport.port) as client:
+            await client.initialize()
+            results = []
+            for i in range(3):
+                request = _rpc(i + 1, "tools/call", name="echo", arguments={"text": str(i)})
+                status, headers, body = await client.request("POST", request)
+                assert status == 200 and headers["content-type"] == "application/json"
+                results.append(json.loads(body)["result"]["content"][0]["text"])
+            return results, transport.session_count
+
+    assert _serve(server, scenario) == (["0", "1", "2"], 1)
+
+
+def test_session_errors(server):
+    async def scenario(transport):
+        async with Client(transport.port) as client:
+            missing = await client.request("POST", _rpc(1, "ping"))
+            client.session_id = "nope"
+            unknown = await client.request("POST", _rpc(1, "ping"))
+            client.session_id = None
+            await client.initialize()
+            deleted = await client.request("DELETE")
+            after = await client.request("POST", _rpc(2, "ping"))
+            return missing[0], unknown[0], deleted[0], after[0]
+
+    assert _serve(server, scenario) == (400, 404, 200, 404)
+
+
+def test_signed_session_ids_are_checked(server):
+    async def scenario(transport):
+        async with Client(transport.port) as client:
+            await client.initialize()
+            signed = client.session_id
+            forged = signed[:-1] + ("1" if signed.endswith("0") else "0")
+            transport._sessions.clear()
+            statuses = []
+            for session_id in (signed, forged, "tok\u00e9n.sig\u00e9"):
+                client.session_id = session_id
+                statuses.append((await client.request("POST", _rpc(1, "ping")))[0])
+            return statuses
+
+    assert _serve(server, scenario, session_secret=b"key") == [200, 404, 404]
+
+
+@pytest.mark.parametrize("secret", [None, b"key"])
+def test_deleted_and_expired_sessions_are_refused(server, secret):
+    now = [1000.0]
+
+    async def scenario(transport):
+        statuses = []
+        async with Client(transport.port) as client:
+            await client.initialize()
+            await client.request("DELETE")
+            statuses.append((await client.request("POST", _rpc(1, "ping")))[0])
+            client.session_id = None
+            await client.initialize()
+            now[0] += 11
+            statuses.append((await client.request("POST", _rpc(2, "ping")))[0])
+            client.session_id = None
+            await client.initialize()
+            # Another worker sharing the secret forgets the session once it is too old.
+            transport._sessions.clear()
+            now[0] += 5
+            statuses.append((await client.request("POST", _rpc(3, "ping")))[0])
+            transport._sessions.clear()
+            now[0] += 6
+            statuses.append((await client.request("POST", _rpc(4, "ping")))[0])
+        return statuses
+
+    expected = [404, 404, 200, 404] if secret else [404, 404, 404, 404]
+    options = {"session_secret": secret, "session_timeout": 10, "clock": lambda: now[0]}
+    assert _serve(server, scenario, **options) == expected
+
+
+def test_notification_only_post_is_accepted(server):
+    async def scenario(transport):
+        async with Client(transport.port) as client:
+            await client.initialize()
+            return await client.request("POST", _rpc(None, "notifications/initialized"))
+
+    status, _, body = _serve(server, scenario)
+    assert status == 202 and body == b""
+
+
+def test_progress_streams_over_sse_then_response(server):
+    request = _rpc(1, "tools/call", name="count", arguments={}, _meta={"progressToken": "p"})
+
+    async def scenario(transport):
+        async with Client(transport.port) as client:
+            await client.initialize()
+            sse = await client.request(
+                "POST", request, accept="application/json, text/event-stream"
+            )
+            # The connection stays usable after the stream ends.
+            ping = await client.request("POST", _rpc(2, "ping"))
+            return sse, ping[0]
+
+    (status, headers, body), ping_status = _serve(server, scenario)
+    assert status == 200 and headers["content-type"] == "text/event-stream"
+    events = _events(body)
+    assert [e["params"]["message"] for e in events[:-1]] == ["0", "1", "2"]
+    assert events[-1]["result"]["content"][0]["text"] == "012"
+    assert ping_status == 200
+
+
+def test_slow_post_stream_drops_notifications_beyond_the_buffer(server):
+    @server.tool(name="flood", description="Many progress updates")
+    async def flood():
+        for i in range(50):
+            yield str(i)
+
+    request = _rpc(1, "tools/call", name="flood", arguments={}, _meta={"progressToken": "p"})
+
+    async def scenario(transport):
+        async with Client(transport.port) as client:
+            await client.initialize()
+            return await client.request(
+                "POST", request, accept="application/json, text/event-stream"
+            )
+
+    status, _, body = _serve(server, scenario, event_buffer=4)
+    events = _events(body)
+    assert status == 200 and len(events) <= 5
+    assert events[-1]["result"]["content"][0]["text"] == "".join(map(str, range(50)))
+
+
+def test_get_stream_receives_list_changed(server):
+    async def scenario(transport):
+        async with Client(transport.port) as client:
+            await client.initialize()
+            lines = ["GET /mcp HTTP/1.1", "Accept: text/event-stream",
+                     f"{SESSION_HEADER}: {client.session_id}"]
+            client.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+            await client.reader.readuntil(b"\r\n\r\n")
+            server.add_tool("late", "Added later", lambda: "x")
+            return _events(await asyncio.wait_for(client.read_chunks(limit=1), 5))
+
+    events = _serve(server, scenario)
+    assert events[0]["method"] == "notifications/tools/list_changed"
+
+
+def test_list_changed_raised_during_a_post_is_broadcast(server):
+    @server.tool(name="grow", description="Adds a tool")
+    async def grow():
+        yield "adding"
+        server.add_tool("grown", "Added by a call", lambda: "x")
+        yield "added"
+
+    request = _rpc(1, "tools/call", name="grow", arguments={}, _meta={"progressToken": "p"})
+
+    async def scenario(transport):
+        async with Client(transport.port) as watcher, Client(transport.port) as caller:
+            await watcher.initialize()
+            await caller.initialize()
+            lines = ["GET /mcp HTTP/1.1", "Accept: text/event-stream",
+                     f"{SESSION_HEADER}: {watcher.session_id}"]
+            watcher.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+            await watcher.reader.readuntil(b"\r\n\r\n")
+            _, _, body = await caller.request(
+                "POST", request, accept="application/json, text/event-stream"
+            )
+            watched = await asyncio.wait_for(watcher.read_chunks(limit=1), 5)
+            return _events(body), _events(watched)
+
+    reply, watched = _serve(server, scenario)
+    assert [e.get("method") for e in reply] == ["notifications/progress"] * 2 + [None]
+    assert watched[0]["method"] == "notifications/tools/list_changed"
+
+
+def test_cancellation_is_scoped_to_session():
+    server = MCPServer(name="test")
+
+    @server.tool(name="wait", description="Sleeps")
+    async def wait() -> str:
+        await asyncio.sleep(0.2)
+        return "done"
+
+    async def scenario(transport):
+        async with Client(transport.port) as a, Client(transport.port) as b:
+            await a.initialize()
+            await b.initialize()
+            call = asyncio.create_task(
+                a.request("POST", _rpc(1, "tools/call", name="wait", arguments={}))
+            )
+            await asyncio.sleep(0.05)
+            await b.request("POST", _rpc(None, "notifications/cancelled", requestId=1))
+            return await call
+
+    status, _, body = _serve(server, scenario)
+    assert status == 200 and json.loads(body)["result"]["content"][0]["text"] == "done"
+
+
+def test_http_errors(server):
+    async def scenario(transport):
+        async with Client(transport.port) as client:
+            not_found = await client.request("POST", None, path="/other")
+            parse = await client.request("POST", None, path="/mcp")
+        async with Client(transport.port) as client:
+            client.writer.write(b"POST /mcp HTTP/1.1\r\nContent-Length: 100\r\n\r\n")
+            too_large = await client.read_response()
+        return not_found[0], parse[0], json.loads(parse[2])["error"]["code"], too_large[0]
+
+    assert _serve(server, scenario, max_message_size=10) == (404, 400, -32700, 413)
+
+
+def test_disallowed_origin_is_rejected(server):
+    async def scenario(transport):
+        async with Client(transport.port) as client:
+            status, _, _ = await client.request(
+                "POST", _rpc(0, "initialize"), Origin="http://evil.example"
+            )
+            return status
+
+    assert _serve(server, scenario, allowed_origins={"http://localhost"}) == 403
@@ -0,0 +1,114 @@
+"""Tests for lazy tool registration by import path."""
+
+import asyncio
+import json
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from mcp_starter.models import (
+    ExecutionMode,
+    ToolCallRequest,
+    ToolDefinition,
+    ToolParam,
+    ToolParamType,
+)
+from mcp_starter.server import MCPServer
+
+
+@pytest.fixture
+def tool_module(tmp_path, monkeypatch):
+    (tmp_path / "lazy_tools_mod.py").write_text(textwrap.dedent("""
+        IMPORTED = True
+
+        def shout(text):
+            return text.upper()
+
+        async def ashout(text):
+            return text.upper() + "!"
+
+        class Tools:
+            @staticmethod
+            def whisper(text):
+                return text.lower()
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_tools_mod"
+    sys.modules.pop("lazy_tools_mod", None)
+
+
+def test_listing_does_not_import_the_module(tool_module):
+    server = MCPServer(name="test")
+    server.add_tool("shout", "Shout", f"{tool_module}:shout", [
+        ToolParam(name="text", type=ToolParamType.STRING),
+    ])
+    listing = json.loads(asyncio.run(server.handle_raw(
+        b'{"jsonrpc": "2.0", "id": 1, "method": "tools/list"}'
+    )))
+    assert listing["result"]["tools"][0]["inputSchema"]["required"] == ["text"]
+    assert tool_module not in sys.modules
+    assert not server.registry.get_tool("shout").is_loaded
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("shout", "HI"), ("ashout", "HI!"), ("Tools.whisper", "hi"),
+])
+def test_handler_is_imported_on_first_call(tool_module, path, expected):
+    server = MCPServer(name="test")
+    tool = server.add_tool("t", "", f"{tool_module}:{path}")
+    request = ToolCallRequest(tool_name="t", arguments={"text": "Hi"})
+    assert asyncio.run(server.handle_call_tool_async(request)).content == expected
+    assert tool.is_loaded and tool_module in sys.modules
+    assert tool.is_async == (path == "ashout")
+
+
+def test_sync_call_imports_handler(tool_module):
+    server = MCPServer(name="test")
+    server.add_tool("t", "", f"{tool_module}:shout")
+    request = ToolCallRequest(tool_name="t", arguments={"text": "a"})
+    assert server.handle_call_tool(request).content == "A"
+
+
+def test_bad_paths():
+    with pytest.raises(ValueError, match="package.module:function"):
+        ToolDefinition(name="t", description="", handler="no_colon")
+    server = MCPServer(name="test")
+    server.add_tool("missing", "", "no_such_module_xyz:run")
+    server.add_tool("attr", "", "json:no_such_function")
+    for name, message in (("missing", "No module named"), ("attr", "has no attribute")):
+        response = asyncio.run(server.handle_call_tool_async(ToolCallRequest(tool_name=name)))
+        assert response.is_error and message in response.content
+
+
+def test_tool_without_handler_is_reported():
+    server = MCPServer(name="test")
+    server.registry.register_tool(ToolDefinition(name="t", description=""))
+    request = ToolCallRequest(tool_name="t")
+    for response in (
+        server.handle_call_tool(request),
+        asyncio.run(server.handle_call_tool_async(request)),
+    ):
+        assert response.is_error and response.content == "Error: Tool 't' has no handler"
+
+
+def test_async_handler_in_process_pool_is_reported(tool_module):
+    server = MCPServer(name="test")
+    tool = server.add_tool("t", "", f"{tool_module}:ashout", execution=ExecutionMode.PROCESS)
+    for _ in range(2):
+        response = server.handle_call_tool(ToolCallRequest(tool_name="t", arguments={"text": "a"}))
+        assert response.is_error and "cannot run in a process pool" in response.content
+    assert not tool.is_loaded
+
+
+def test_package_import_is_lazy():
+    code = "import sys, mcp_starter; print('mcp_starter.server' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+    import mcp_starter
+
+    assert mcp_starter.MCPServer is MCPServer
+    assert set(mcp_starter.__all__) <= set(dir(mcp_starter))
+    with pytest.raises(AttributeError):
+        mcp_starter.NoSuchThing
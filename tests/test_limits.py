@@ -0,0 +1,266 @@
+"""Tests for concurrency limits and admission control."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from mcp_starter.limits import (
+    ConcurrencyLimiter,
+    LimiterStats,
+    OverloadedError,
+    RateLimitedError,
+    RateLimiter,
+)
+from mcp_starter.models import ConcurrencyLimit, RateLimit, ToolCallRequest
+from mcp_starter.protocol import RATE_LIMITED, SERVER_OVERLOADED
+from mcp_starter.server import REQUEST_SCOPE, MCPServer
+
+
+def test_limiter_queues_then_rejects():
+    async def run():
+        limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrent=1, max_queue=1))
+        await limiter.acquire()
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.stats().waiting == 1
+        with pytest.raises(OverloadedError) as exc_info:
+            await limiter.acquire()
+        assert exc_info.value.code == SERVER_OVERLOADED
+        limiter.release()
+        await queued
+        stats = limiter.stats()
+        assert (stats.active, stats.waiting, stats.rejected) == (1, 0, 1)
+        limiter.release()
+        assert limiter.stats().active == 0
+
+    asyncio.run(run())
+
+
+def test_waiters_served_in_order():
+    async def run():
+        limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrent=1, max_queue=5))
+        order = []
+
+        async def worker(i):
+            async with limiter:
+                order.append(i)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(worker(i) for i in range(5)))
+        return order
+
+    assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+
+
+def test_cancelled_waiter_frees_its_queue_place():
+    async def run():
+        limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrent=1, max_queue=1))
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.stats().waiting == 0
+        limiter.release()
+        assert limiter.stats().active == 0
+
+    asyncio.run(run())
+
+
+def test_waiter_cancelled_in_the_same_tick_as_release():
+    async def run():
+        limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrent=1, max_queue=2))
+        await limiter.acquire()
+        cancelled = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        limiter.release()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert limiter.stats() == LimiterStats(max_concurrent=1, max_queue=2)
+        await limiter.acquire()
+        assert limiter.stats().active == 1
+
+    asyncio.run(run())
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        ConcurrencyLimit(max_concurrent=0)
+    with pytest.raises(ValueError):
+        ConcurrencyLimit(max_concurrent=1, max_queue=-1)
+
+
+def test_server_rejects_over_limit_calls_with_jsonrpc_error():
+    server = MCPServer(name="test")
+    gate = None
+
+    @server.tool(name="slow", description="Slow", limit=ConcurrencyLimit(max_concurrent=1))
+    async def slow() -> str:
+        await gate.wait()
+        return "done"
+
+    async def run():
+        nonlocal gate
+        gate = asyncio.Event()
+        message = {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "slow"}}
+        first = asyncio.ensure_future(server.handle_message({**message, "id": 1}))
+        await asyncio.sleep(0)
+        rejected = json.loads(await server.handle_message({**message, "id": 2}))
+        gate.set()
+        return json.loads(await first), rejected
+
+    first, rejected = asyncio.run(run())
+    assert first["result"]["content"][0]["text"] == "done"
+    assert rejected["error"]["code"] == SERVER_OVERLOADED
+    assert server.limiter_stats("slow").rejected == 1
+
+
+def test_server_global_limit_bounds_all_tools():
+    server = MCPServer(name="test", limit=ConcurrencyLimit(max_concurrent=2, max_queue=10))
+    active = 0
+    peak = 0
+
+    @server.tool(name="work", description="Work")
+    async def work() -> str:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+        return "ok"
+
+    async def run():
+        return await asyncio.gather(*(
+            server.handle_call_tool_async(ToolCallRequest(tool_name="work")) for _ in range(8)
+        ))
+
+    assert all(r.content == "ok" for r in asyncio.run(run()))
+    assert peak == 2
+    assert server.limiter_stats().active == 0
+    assert server.limiter_stats("work") is None
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_timed_out_sync_call_keeps_its_slots_until_the_handler_returns():
+    server = MCPServer(name="test", limit=ConcurrencyLimit(max_concurrent=2, max_queue=10))
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    @server.tool(name="db", description="Blocking query", timeout=0.05,
+                 limit=ConcurrencyLimit(max_concurrent=1, max_queue=10))
+    def db() -> str:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.2)
+        with lock:
+            active -= 1
+        return "ok"
+
+    async def run():
+        start = time.monotonic()
+        responses = [
+            await server.handle_call_tool_async(ToolCallRequest(tool_name="db")) for _ in range(5)
+        ]
+        elapsed = time.monotonic() - start
+        held = server.limiter_stats("db").active, server.limiter_stats().active
+        while server.limiter_stats("db").active:
+            await asyncio.sleep(0.01)
+        return responses, elapsed, held
+
+    try:
+        responses, elapsed, held = asyncio.run(run())
+    finally:
+        server.shutdown()
+    assert all(r.is_error and "timed out" in r.content for r in responses)
+    assert elapsed < 0.5 and held == (1, 1)  # Callers did not wait for the handlers.
+    assert peak == 1 and server.limiter_stats().active == 0
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = RateLimiter(RateLimit(rate=2, burst=3), clock=clock)
+    for _ in range(3):
+        limiter.check("a")
+    with pytest.raises(RateLimitedError) as exc_info:
+        limiter.check("a")
+    assert exc_info.value.code == RATE_LIMITED
+    assert exc_info.value.retry_after == pytest.approx(0.5)
+    assert exc_info.value.data == {"retryAfter": exc_info.value.retry_after}
+    limiter.check("b")
+    clock.now = 0.5
+    limiter.check("a")
+    with pytest.raises(RateLimitedError):
+        limiter.check("a")
+    assert limiter.rejected == 2
+
+
+def test_idle_buckets_are_evicted_and_count_is_bounded():
+    clock = FakeClock()
+    limiter = RateLimiter(RateLimit(rate=1, burst=2), max_buckets=3, clock=clock)
+    limiter.check("a")
+    limiter.check("b")
+    clock.now = 1.0
+    limiter.check("a")
+    clock.now = 2.5
+    # "b" has been idle long enough to refill completely; "a" has not.
+    limiter.check("c")
+    assert len(limiter) == 2
+    limiter.check("d")
+    limiter.check("e")
+    assert len(limiter) == 3
+    with pytest.raises(ValueError):
+        RateLimiter(RateLimit(rate=1), max_buckets=0)
+
+
+def test_invalid_rate_limits():
+    with pytest.raises(ValueError):
+        RateLimit(rate=0)
+    with pytest.raises(ValueError):
+        RateLimit(rate=1, burst=0)
+
+
+def test_server_rate_limits_per_session_and_per_tool():
+    server = MCPServer(name="test", rate_limit=RateLimit(rate=0.001, burst=3))
+
+    @server.tool(name="costly", description="Costly", rate_limit=RateLimit(rate=0.001))
+    def costly() -> str:
+        return "ok"
+
+    @server.tool(name="cheap", description="Cheap")
+    def cheap() -> str:
+        return "ok"
+
+    def call(session, name):
+        async def run():
+            REQUEST_SCOPE.set(session)
+            return json.loads(await server.handle_message({
+                "jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": name},
+            }))
+        return asyncio.run(run())
+
+    assert "result" in call("s1", "costly")
+    limited = call("s1", "costly")["error"]
+    assert limited["code"] == RATE_LIMITED
+    assert "tool 'costly'" in limited["message"]
+    assert limited["data"]["retryAfter"] > 0
+    assert "result" in call("s2", "costly")
+    assert "result" in call("s1", "cheap")
+    assert "this session" in call("s1", "cheap")["error"]["message"]
+    with pytest.raises(RateLimitedError):
+        server.handle_call_tool(ToolCallRequest(tool_name="costly"))
+        server.handle_call_tool(ToolCallRequest(tool_name="costly"))
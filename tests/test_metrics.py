@@ -0,0 +1,87 @@
+"""Tests for the metrics layer."""
+
+import asyncio
+import json
+import math
+
+from mcp_starter.metrics import Histogram, ServerMetrics
+from mcp_starter.models import ExecutionMode, ToolCallRequest, ToolParam, ToolParamType
+from mcp_starter.server import MCPServer
+
+
+def test_histogram_quantiles():
+    hist = Histogram(bounds=(1.0, 2.0, 4.0))
+    assert math.isnan(hist.quantile(0.5))
+    for value in [0.5] * 50 + [1.5] * 45 + [3.0] * 5:
+        hist.observe(value)
+    assert hist.count == 100
+    assert 0.0 < hist.quantile(0.5) <= 1.0
+    assert 1.0 < hist.quantile(0.95) <= 2.0
+    assert 2.0 < hist.quantile(0.99) <= 4.0
+
+
+def test_render_prometheus_format():
+    metrics = ServerMetrics()
+    metrics.tool_started("search")
+    metrics.tool_finished("search", 0.002, is_error=True)
+    metrics.validation_failed('we"ird')
+    text = metrics.render_prometheus()
+    assert "# TYPE mcp_tool_calls_total counter" in text
+    assert 'mcp_tool_calls_total{tool="search"} 1' in text
+    assert 'mcp_tool_errors_total{tool="search"} 1' in text
+    assert 'mcp_tool_calls_in_flight{tool="search"} 0' in text
+    assert 'mcp_tool_duration_seconds_bucket{tool="search",le="+Inf"} 1' in text
+    assert 'mcp_tool_validation_failures_total{tool="we\\"ird"} 1' in text
+
+
+def test_server_records_tool_and_method_metrics():
+    server = MCPServer(name="test")
+
+    @server.tool(name="echo", description="Echo", execution=ExecutionMode.INLINE, parameters=[
+        ToolParam(name="text", type=ToolParamType.STRING),
+    ])
+    def echo(text: str) -> str:
+        return text
+
+    server.handle_call_tool(ToolCallRequest(tool_name="echo", arguments={"text": "a"}))
+    server.handle_call_tool(ToolCallRequest(tool_name="echo", arguments={"text": 1}))
+    asyncio.run(server.handle_message({
+        "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+        "params": {"name": "echo", "arguments": {"text": "b"}},
+    }))
+    asyncio.run(server.handle_message({"jsonrpc": "2.0", "id": 2, "method": "unknown/method"}))
+
+    metrics = server.metrics
+    assert metrics.tool_calls.values["echo"] == 3
+    assert metrics.tool_errors.values["echo"] == 1
+    assert metrics.validation_failures.values["echo"] == 1
+    assert metrics.requests.values == {"tools/call": 1}
+    assert metrics.tool_percentiles("echo")["p99"] > 0
+
+
+def test_expose_metrics_resource_and_tool():
+    server = MCPServer(name="test")
+    server.expose_metrics(tool_name="server_metrics")
+    response = asyncio.run(server.handle_message({
+        "jsonrpc": "2.0", "id": 1, "method": "resources/read",
+        "params": {"uri": "metrics://prometheus"},
+    }))
+    text = json.loads(response)["result"]["contents"][0]["text"]
+    assert "# TYPE mcp_requests_total counter" in text
+    tool_text = server.handle_call_tool(ToolCallRequest(tool_name="server_metrics")).content
+    assert 'mcp_requests_total{method="resources/read"} 1' in tool_text
+    server.shutdown()
+
+
+def test_merge_sums_counters_and_histograms():
+    a, b = ServerMetrics(), ServerMetrics()
+    a.tool_finished("search", 0.001, is_error=False)
+    b.tool_finished("search", 0.002, is_error=True)
+    b.request_started("tools/call")
+    a.merge(b, gauges=False)
+    assert a.tool_calls.values == {"search": 2}
+    assert a.tool_errors.values == {"search": 1}
+    assert a.tool_latency.histogram("search").count == 2
+    assert a.requests_in_flight.values == {}
+    a.merge(b)
+    assert a.requests_in_flight.values == {"tools/call": 1}
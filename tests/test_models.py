@@ -60,3 +60,11 @@ def test_tool_call_response_defaults():
 
     error_response = ToolCallResponse(content="fail", is_error=True)
     assert error_response.is_error is True
+
+
+def test_tool_definition_detects_async_handler():
+    async def handler() -> None:
+        return None
+
+    assert ToolDefinition(name="a", description="", handler=handler).is_async is True
+    assert ToolDefinition(name="s", description="", handler=lambda: None).is_async is False
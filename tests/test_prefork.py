@@ -0,0 +1,109 @@
+"""Tests for prefork worker mode."""
+
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists(f"/proc/{os.getpid()}/task/{os.getpid()}/children"),
+    reason="needs fork and /proc child listings",
+)
+
+SCRIPT = """
+import os
+
+from mcp_starter.models import Resource
+from mcp_starter.prefork import PreforkServer
+from mcp_starter.resources import CallableReader
+from mcp_starter.server import MCPServer
+
+server = MCPServer(name="prefork")
+prefork = PreforkServer(server, workers=2, port=0, metrics_interval=0.05)
+
+@server.tool(name="pid", description="Return the worker's pid")
+def pid() -> str:
+    return str(os.getpid())
+
+server.registry.register_resource(Resource(
+    uri="metrics://all", name="All workers",
+    reader=CallableReader(lambda _: prefork.render_metrics()),
+))
+prefork.bind()
+print(prefork.port, flush=True)
+prefork.run()
+"""
+
+
+def _post(port, message, session_id=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    headers = {"Content-Type": "application/json"}
+    if session_id is not None:
+        headers["Mcp-Session-Id"] = session_id
+    connection.request("POST", "/mcp", json.dumps(message), headers)
+    response = connection.getresponse()
+    body = json.loads(response.read())
+    connection.close()
+    return response, body
+
+
+def _call(port, session_id, request_id, method, **params):
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+    response, body = _post(port, message, session_id)
+    assert response.status == 200
+    return body["result"]
+
+
+def _workers(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return {int(p) for p in f.read().split()}
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def supervisor():
+    env = {**os.environ, "PYTHONPATH": os.path.join(os.path.dirname(__file__), "..", "src")}
+    proc = subprocess.Popen(
+        [sys.executable, "-c", SCRIPT], stdout=subprocess.PIPE, text=True, env=env
+    )
+    port = int(proc.stdout.readline())
+    _wait_for(lambda: len(_workers(proc.pid)) == 2)
+    yield proc, port
+    if proc.poll() is None:
+        proc.kill()
+        proc.wait()
+
+
+def test_workers_share_sessions_restart_and_aggregate_metrics(supervisor):
+    proc, port = supervisor
+    response, _ = _post(port, {"jsonrpc": "2.0", "id": 0, "method": "initialize"})
+    session_id = response.getheader("Mcp-Session-Id")
+
+    # Each call opens a new connection, so it may reach either worker.
+    calls = 10
+    for i in range(calls):
+        result = _call(port, session_id, i, "tools/call", name="pid", arguments={})
+        assert int(result["content"][0]["text"]) in _workers(proc.pid)
+
+    time.sleep(0.3)
+    victim = min(_workers(proc.pid))
+    os.kill(victim, signal.SIGKILL)
+    _wait_for(lambda: len(_workers(proc.pid)) == 2 and victim not in _workers(proc.pid))
+
+    time.sleep(0.2)
+    result = _call(port, session_id, 99, "resources/read", uri="metrics://all")
+    assert f'mcp_tool_calls_total{{tool="pid"}} {calls}' in result["contents"][0]["text"]
+
+    proc.send_signal(signal.SIGTERM)
+    assert proc.wait(timeout=10) == 0
@@ -4,7 +4,7 @@ import json
 
 import pytest
 
-from mcp_starter.protocol import ProtocolHandler
+from mcp_starter.protocol import INVALID_REQUEST, PARSE_ERROR, ProtocolError, ProtocolHandler, RawJSON
 
 
 @pytest.fixture
@@ -45,3 +45,41 @@ class TestProtocolHandler:
 
     def test_jsonrpc_version(self, handler):
         assert handler.JSONRPC_VERSION == "2.0"
+
+    def test_parse_non_object(self, handler):
+        with pytest.raises(ProtocolError, match="must be a JSON object") as exc_info:
+            handler.parse_request("42")
+        assert exc_info.value.code == INVALID_REQUEST
+
+    def test_parse_error_code(self, handler):
+        with pytest.raises(ProtocolError) as exc_info:
+            handler.parse_request("not json {{{")
+        assert exc_info.value.code == PARSE_ERROR
+
+    def test_parse_message_single_and_batch(self, handler):
+        single = handler.parse_message(json.dumps({"method": "ping", "id": 1}))
+        assert single["method"] == "ping"
+        batch = handler.parse_message(json.dumps([{"method": "ping", "id": 1}, 5]))
+        assert batch == [{"method": "ping", "id": 1}, 5]
+
+    def test_parse_message_empty_batch(self, handler):
+        with pytest.raises(ProtocolError, match="Empty batch") as exc_info:
+            handler.parse_message("[]")
+        assert exc_info.value.code == INVALID_REQUEST
+
+    def test_build_batch(self, handler):
+        responses = [handler.build_response(1, "a"), handler.build_error(2, -1, "bad")]
+        parsed = json.loads(handler.build_batch(responses))
+        assert [item["id"] for item in parsed] == [1, 2]
+        assert handler.build_batch([]) is None
+
+    def test_build_response_splices_raw_json(self, handler):
+        response = handler.build_response("abc", RawJSON('{"tools":[]}'))
+        assert json.loads(response) == {"jsonrpc": "2.0", "id": "abc", "result": {"tools": []}}
+        assert response == handler.build_response("abc", {"tools": []})
+
+    def test_build_notification(self, handler):
+        assert json.loads(handler.build_notification("notifications/x")) == {
+            "jsonrpc": "2.0", "method": "notifications/x",
+        }
+        assert json.loads(handler.build_notification("n", {"a": 1}))["params"] == {"a": 1}
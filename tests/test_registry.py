@@ -1,5 +1,10 @@
-from mcp_starter.models import ToolDefinition, ToolParam, ToolParamType, Resource
-from mcp_starter.registry import MCPRegistry
+import json
+import threading
+
+import pytest
+
+from mcp_starter.models import Resource, ResourceTemplate, ToolDefinition, ToolParam, ToolParamType
+from mcp_starter.registry import MCPRegistry, RegistryBatch
 
 
 def test_register_and_get_tool():
@@ -91,3 +96,224 @@ def test_to_tool_schemas_format():
         "description": "Max results",
     }
     assert schema["inputSchema"]["required"] == ["query"]
+
+
+def test_validator_compiled_and_replaced_on_reregistration():
+    registry = MCPRegistry()
+    registry.register_tool(ToolDefinition(
+        name="t", description="", parameters=[ToolParam(name="a", type=ToolParamType.STRING)],
+    ))
+    first = registry.get_validator("t")
+    assert first({"a": "x"}) == []
+    registry.register_tool(ToolDefinition(
+        name="t", description="", parameters=[ToolParam(name="b", type=ToolParamType.INTEGER)],
+    ))
+    second = registry.get_validator("t")
+    assert second is not first
+    assert second({"b": 1}) == []
+    assert registry.get_validator("missing") is None
+
+
+def test_listing_cache_invalidated_only_on_registration():
+    registry = MCPRegistry()
+    registry.register_tool(ToolDefinition(name="a", description="A"))
+    first = registry.to_tool_schemas()
+    assert registry.to_tool_schemas() is first
+    assert json.loads(registry.tool_schemas_json()) == first
+    version = registry.tools_version
+    registry.register_tool(ToolDefinition(name="b", description="B"))
+    assert registry.tools_version == version + 1
+    assert [s["name"] for s in registry.to_tool_schemas()] == ["a", "b"]
+    assert json.loads(registry.tool_schemas_json()) == registry.to_tool_schemas()
+
+
+def test_resource_listing_cache():
+    registry = MCPRegistry()
+    registry.register_resource(Resource(uri="file:///a.txt", name="A"))
+    assert registry.resources_version == 1
+    assert json.loads(registry.resource_schemas_json()) == [{
+        "uri": "file:///a.txt", "name": "A", "description": "", "mimeType": "text/plain",
+    }]
+
+
+def test_listeners_receive_change_kind():
+    registry = MCPRegistry()
+    changes = []
+    registry.add_listener(changes.append)
+    registry.register_tool(ToolDefinition(name="a", description="A"))
+    registry.register_resource(Resource(uri="file:///a.txt", name="A"))
+    registry.remove_listener(changes.append)
+    registry.register_tool(ToolDefinition(name="b", description="B"))
+    assert changes == ["tools", "resources"]
+
+
+def _tool_names(page):
+    return [item["name"] for item in page.items]
+
+
+def test_page_tools_walks_all_pages_in_name_order():
+    registry = MCPRegistry()
+    for name in ["delta", "alpha", "echo", "charlie", "bravo"]:
+        registry.register_tool(ToolDefinition(name=name, description=name))
+    first = registry.page_tools(limit=2)
+    assert _tool_names(first) == ["alpha", "bravo"]
+    assert json.loads(first.json) == first.items
+    second = registry.page_tools(cursor=first.next_cursor, limit=2)
+    assert _tool_names(second) == ["charlie", "delta"]
+    last = registry.page_tools(cursor=second.next_cursor, limit=2)
+    assert _tool_names(last) == ["echo"]
+    assert last.next_cursor is None
+
+
+def test_page_tools_consistent_across_registrations():
+    registry = MCPRegistry()
+    for name in ["b", "d", "f"]:
+        registry.register_tool(ToolDefinition(name=name, description=name))
+    first = registry.page_tools(limit=2)
+    registry.register_tool(ToolDefinition(name="a", description="before cursor"))
+    registry.register_tool(ToolDefinition(name="e", description="after cursor"))
+    rest = registry.page_tools(cursor=first.next_cursor, limit=10)
+    assert _tool_names(first) + _tool_names(rest) == ["b", "d", "e", "f"]
+
+
+def test_page_prefix_filter():
+    registry = MCPRegistry()
+    for name in ["db.query", "db.insert", "fs.read", "dbx", "d"]:
+        registry.register_tool(ToolDefinition(name=name, description=name))
+    page = registry.page_tools(prefix="db.", limit=1)
+    assert _tool_names(page) == ["db.insert"]
+    page = registry.page_tools(cursor=page.next_cursor, prefix="db.", limit=1)
+    assert _tool_names(page) == ["db.query"]
+    assert page.next_cursor is None
+
+
+def test_page_resources_and_invalid_arguments():
+    registry = MCPRegistry()
+    registry.register_resource(Resource(uri="file:///b", name="B"))
+    registry.register_resource(Resource(uri="file:///a", name="A"))
+    assert [r["uri"] for r in registry.page_resources().items] == ["file:///a", "file:///b"]
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        registry.page_resources(cursor="%%%")
+    with pytest.raises(ValueError):
+        registry.page_tools(limit=0)
+
+
+def test_resource_templates_resolve_through_get_resource():
+    registry = MCPRegistry()
+    template = ResourceTemplate(uri_template="db://tables/{name}/rows", name="Rows", mime_type="application/json")
+    registry.register_resource_template(template)
+    registry.register_resource(Resource(uri="db://tables/special/rows", name="Special"))
+
+    resource, variables = registry.resolve_resource("db://tables/orders/rows")
+    assert resource.uri == "db://tables/orders/rows"
+    assert resource.name == "Rows"
+    assert resource.mime_type == "application/json"
+    assert variables == {"name": "orders"}
+    assert registry.get_resource("db://tables/special/rows").name == "Special"
+    assert registry.get_resource("db://tables/orders") is None
+    assert registry.to_template_schemas() == [{
+        "uriTemplate": "db://tables/{name}/rows", "name": "Rows",
+        "description": "", "mimeType": "application/json",
+    }]
+    assert json.loads(registry.template_schemas_json()) == registry.to_template_schemas()
+
+
+def test_snapshot_is_unchanged_by_later_registrations():
+    registry = MCPRegistry()
+    registry.register_tool(ToolDefinition(name="a", description="A"))
+    before = registry.snapshot()
+    listing = registry.to_tool_schemas()
+    registry.register_tool(ToolDefinition(name="b", description="B"))
+    registry.unregister_tool("a")
+    assert list(before.tools) == ["a"]
+    assert before.tool_names == ("a",)
+    assert before._listing("tool_schemas")[0] is listing
+    assert list(registry.snapshot().tools) == ["b"]
+
+
+def test_batch_publishes_once_and_discards_on_error():
+    registry = MCPRegistry()
+    changes = []
+    registry.add_listener(changes.append)
+    with registry.batch() as batch:
+        for name in ["c", "a", "b"]:
+            registry.register_tool(ToolDefinition(name=name, description=name))
+        registry.register_resource(Resource(uri="file:///a", name="A"))
+        assert registry.get_tool("a") is None
+        assert set(batch.tools) == {"a", "b", "c"}
+    assert registry.tools_version == 1
+    assert changes == ["tools", "resources"]
+    assert _tool_names(registry.page_tools()) == ["a", "b", "c"]
+
+    with pytest.raises(RuntimeError):
+        with registry.batch():
+            registry.unregister_tool("a")
+            registry.register_tool(ToolDefinition(name="d", description="d"))
+            raise RuntimeError("abort")
+    assert registry.snapshot().tool_names == ("a", "b", "c")
+    assert registry.tools_version == 1
+    assert len(changes) == 2
+
+
+def test_unregister_tool_and_resource():
+    registry = MCPRegistry()
+    registry.register_tool(ToolDefinition(name="a", description="A"))
+    registry.register_resource(Resource(uri="file:///a", name="A"))
+    assert registry.unregister_tool("a") is True
+    assert registry.unregister_tool("a") is False
+    assert registry.get_validator("a") is None
+    assert registry.to_tool_schemas() == []
+    assert registry.unregister_resource("file:///a") is True
+    assert registry.get_resource("file:///a") is None
+    assert registry.page_resources().items == []
+    assert registry.tools_version == 2
+
+
+def test_readers_see_whole_batches_while_writers_publish():
+    registry = MCPRegistry()
+    stop = threading.Event()
+    torn = []
+
+    def write() -> None:
+        generation = 0
+        while not stop.is_set():
+            generation += 1
+            with registry.batch():
+                for name in ["x", "y"]:
+                    registry.register_tool(ToolDefinition(name=name, description=str(generation)))
+
+    writers = [threading.Thread(target=write) for _ in range(2)]
+    for writer in writers:
+        writer.start()
+    try:
+        for _ in range(20_000):
+            snapshot = registry.snapshot()
+            if len(snapshot.tools) == 2:
+                x, y = snapshot.tools["x"], snapshot.tools["y"]
+                if x.description != y.description:
+                    torn.append((x.description, y.description))
+    finally:
+        stop.set()
+        for writer in writers:
+            writer.join()
+    assert torn == []
+
+
+def test_one_at_a_time_registrations_publish_once_on_next_read(monkeypatch):
+    publishes = []
+    publish = RegistryBatch._publish
+    monkeypatch.setattr(RegistryBatch, "_publish", lambda self: publishes.append(1) or publish(self))
+    registry = MCPRegistry()
+    for i in range(3000):
+        registry.register_tool(ToolDefinition(name=f"t{i:04d}", description=""))
+        registry.register_resource(Resource(uri=f"file:///{i:04d}", name=""))
+        registry.register_resource_template(
+            ResourceTemplate(uri_template=f"db://t{i}/{{id}}", name=f"t{i}")
+        )
+    assert publishes == []
+    assert registry.tools_version == 3000
+    assert registry.resources_version == 6000
+    assert len(registry.list_tools()) == 3000
+    assert registry.get_resource("db://t2999/7").name == "t2999"
+    assert registry.page_tools(limit=1).items[0]["name"] == "t0000"
+    assert publishes == [1]
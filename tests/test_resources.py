@@ -0,0 +1,146 @@
+"""Tests for resource readers and contents encoding."""
+
+import asyncio
+import base64
+import json
+
+import pytest
+
+from mcp_starter.models import Resource, ResourceTemplate
+from mcp_starter.resources import (
+    CallableReader,
+    FileReader,
+    ResourceReader,
+    encode_contents,
+    is_text_mime_type,
+)
+from mcp_starter.server import MCPServer
+
+
+def _read(reader, offset=0, length=None):
+    async def run():
+        return b"".join(bytes(c) for c in await reader.read("x://", offset, length))
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 40)
+    return path
+
+
+def test_file_reader_chunks_and_ranges(data_file):
+    reader = FileReader(data_file, chunk_size=30)
+    content = data_file.read_bytes()
+    assert _read(reader) == content
+    assert _read(reader, offset=100, length=50) == content[100:150]
+    assert _read(reader, offset=len(content) + 5) == b""
+
+
+def test_file_reader_reports_a_missing_file_on_read(tmp_path):
+    reader = FileReader(tmp_path / "missing.bin")
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(reader.read("x://"))
+
+
+def test_file_reader_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert _read(FileReader(path)) == b""
+
+
+def test_reader_rejects_bad_arguments(data_file):
+    with pytest.raises(ValueError):
+        FileReader(data_file, chunk_size=4)
+    with pytest.raises(ValueError):
+        _read(CallableReader(lambda uri: "abc"), offset=-1)
+
+
+def test_callable_reader_sync_and_async():
+    async def fetch(uri: str) -> bytes:
+        return uri.encode()
+
+    assert _read(CallableReader(lambda uri: "héllo"), offset=1) == "héllo".encode()[1:]
+    assert _read(CallableReader(fetch)) == b"x://"
+
+
+def test_resource_reader_requires_read():
+    with pytest.raises(TypeError, match="read"):
+        ResourceReader()
+
+
+@pytest.mark.parametrize("mime_type,expected", [
+    ("text/plain", True),
+    ("text/csv; charset=utf-8", True),
+    ("application/json", True),
+    ("application/ld+json", True),
+    ("image/png", False),
+    ("application/octet-stream", False),
+])
+def test_is_text_mime_type(mime_type, expected):
+    assert is_text_mime_type(mime_type) is expected
+
+
+def test_encode_blob_matches_one_shot_base64():
+    data = bytes(range(256)) * 7
+    chunks = [data[i:i + 12] for i in range(0, len(data), 12)]
+    entry = json.loads(b"".join(encode_contents("x://b", "image/png", chunks)))
+    assert entry == {"uri": "x://b", "mimeType": "image/png", "blob": base64.b64encode(data).decode()}
+    # Misaligned chunks are carried over rather than producing padding mid-stream.
+    odd = [data[:5], data[5:11], data[11:]]
+    assert json.loads(b"".join(encode_contents("x://b", "image/png", odd)))["blob"] == entry["blob"]
+
+
+def test_encode_text_splits_multibyte_characters():
+    text = 'quote " and ünïcødé\n' * 50
+    raw = text.encode()
+    chunks = [raw[i:i + 7] for i in range(0, len(raw), 7)]
+    assert json.loads(b"".join(encode_contents("x://t", "text/plain", chunks)))["text"] == text
+
+
+def test_server_resources_read(data_file):
+    server = MCPServer(name="test")
+    server.registry.register_resource(Resource(
+        uri="file:///data.bin", name="Data", mime_type="application/octet-stream",
+        reader=FileReader(data_file),
+    ))
+    server.registry.register_resource(Resource(uri="file:///meta", name="No reader"))
+
+    def call(params):
+        return json.loads(asyncio.run(server.handle_message(
+            {"jsonrpc": "2.0", "id": 1, "method": "resources/read", "params": params}
+        )))
+
+    result = call({"uri": "file:///data.bin", "offset": 3, "length": 9})["result"]
+    assert base64.b64decode(result["contents"][0]["blob"]) == data_file.read_bytes()[3:12]
+    assert call({"uri": "file:///meta"})["error"]["code"] == -32002
+    assert call({"uri": "file:///missing"})["error"]["code"] == -32002
+    assert call({"uri": "file:///data.bin", "offset": -1})["error"]["code"] == -32602
+    data_file.unlink()
+    error = call({"uri": "file:///data.bin"})["error"]
+    assert error["code"] == -32002 and str(data_file.parent) not in error["message"]
+    server.shutdown()
+
+
+def test_server_reads_template_resource_with_variables():
+    server = MCPServer(name="test")
+
+    def rows(uri: str, name: str) -> str:
+        return json.dumps({"table": name})
+
+    server.registry.register_resource_template(ResourceTemplate(
+        uri_template="db://tables/{name}/rows", name="Rows",
+        mime_type="application/json", reader=CallableReader(rows),
+    ))
+
+    def call(method, params=None):
+        return json.loads(asyncio.run(server.handle_message(
+            {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+        )))["result"]
+
+    contents = call("resources/read", {"uri": "db://tables/orders/rows"})["contents"][0]
+    assert json.loads(contents["text"]) == {"table": "orders"}
+    templates = call("resources/templates/list")["resourceTemplates"]
+    assert templates[0]["uriTemplate"] == "db://tables/{name}/rows"
+    server.shutdown()
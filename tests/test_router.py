@@ -0,0 +1,56 @@
+"""Tests for the URI template router."""
+
+import pytest
+
+from mcp_starter.router import UriRouter
+
+
+@pytest.fixture
+def router():
+    router = UriRouter()
+    router.add("db://tables/{name}/rows", "rows")
+    router.add("db://tables/{name}/schema", "schema")
+    router.add("db://tables/users/rows", "users-rows")
+    router.add("file:///logs/{date}.log", "log")
+    router.add("db://{db}/tables/{table}", "nested")
+    return router
+
+
+def test_extracts_variables(router):
+    assert router.match("db://tables/orders/rows") == ("rows", {"name": "orders"})
+    assert router.match("db://tables/orders/schema") == ("schema", {"name": "orders"})
+    assert router.match("db://main/tables/t1") == ("nested", {"db": "main", "table": "t1"})
+
+
+def test_literal_segments_take_precedence(router):
+    assert router.match("db://tables/users/rows") == ("users-rows", {})
+
+
+def test_partial_segment_variables(router):
+    assert router.match("file:///logs/2024-01-01.log") == ("log", {"date": "2024-01-01"})
+    assert router.match("file:///logs/2024-01-01.txt") is None
+
+
+def test_no_match(router):
+    assert router.match("db://tables/orders") is None
+    assert router.match("db://tables/orders/rows/extra") is None
+    assert router.match("http://example.com") is None
+
+
+def test_backtracks_when_literal_branch_fails():
+    router = UriRouter()
+    router.add("x://a/{v}/end", "var")
+    router.add("x://a/b/other", "literal")
+    assert router.match("x://a/b/end") == ("var", {"v": "b"})
+
+
+def test_replace_and_len(router):
+    assert len(router) == 5
+    router.add("db://tables/{name}/rows", "rows-v2")
+    assert len(router) == 5
+    assert router.match("db://tables/x/rows") == ("rows-v2", {"name": "x"})
+
+
+def test_duplicate_variable_rejected():
+    with pytest.raises(ValueError, match="Duplicate variable"):
+        UriRouter().add("x://{a}/{a}", "bad")
@@ -1,4 +1,10 @@
-from mcp_starter.models import ToolParam, ToolParamType, ToolCallRequest, Resource
+import asyncio
+import json
+
+import pytest
+
+from mcp_starter.models import ConcurrencyLimit, ToolParam, ToolParamType, ToolCallRequest, Resource
+from mcp_starter.protocol import INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR
 from mcp_starter.server import MCPServer
 
 
@@ -90,3 +96,298 @@ def test_handle_list_resources():
         "description": "A test file",
         "mimeType": "application/json",
     }
+
+
+def _call(server, message):
+    response = asyncio.run(server.handle_message(message))
+    return None if response is None else json.loads(response)
+
+
+def test_handle_message_tools_call():
+    server = MCPServer(name="test")
+
+    @server.tool(name="add", description="Add numbers")
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    response = _call(server, {
+        "jsonrpc": "2.0", "id": 7, "method": "tools/call",
+        "params": {"name": "add", "arguments": {"a": 2, "b": 3}},
+    })
+    assert response["id"] == 7
+    assert response["result"] == {"content": [{"type": "text", "text": "5"}], "isError": False}
+
+
+def test_handle_message_tools_and_resources_list():
+    server = MCPServer(name="test")
+    server.registry.register_resource(Resource(uri="file:///a.txt", name="A"))
+
+    @server.tool(name="noop", description="Does nothing")
+    def noop() -> None:
+        return None
+
+    tools = _call(server, {"jsonrpc": "2.0", "id": 1, "method": "tools/list"})
+    assert [t["name"] for t in tools["result"]["tools"]] == ["noop"]
+    resources = _call(server, {"jsonrpc": "2.0", "id": 2, "method": "resources/list"})
+    assert resources["result"]["resources"][0]["uri"] == "file:///a.txt"
+
+
+def test_handle_message_unknown_method():
+    server = MCPServer(name="test")
+    response = _call(server, {"jsonrpc": "2.0", "id": 1, "method": "nope"})
+    assert response["error"]["code"] == METHOD_NOT_FOUND
+
+
+def test_handle_message_invalid_params():
+    server = MCPServer(name="test")
+    response = _call(server, {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {}})
+    assert response["error"]["code"] == INVALID_PARAMS
+
+
+@pytest.mark.parametrize("params", [["x"], "x", 1])
+def test_handle_message_non_object_params(params):
+    server = MCPServer(name="test")
+    request = {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": params}
+    response = _call(server, request)
+    assert response["error"]["code"] == INVALID_PARAMS
+    del request["id"]
+    assert _call(server, request) is None
+
+
+def test_handle_message_notification_has_no_response():
+    server = MCPServer(name="test")
+    assert _call(server, {"jsonrpc": "2.0", "method": "notifications/initialized"}) is None
+    assert _call(server, {"jsonrpc": "2.0", "method": "ping"}) is None
+
+
+def test_handle_raw_parse_error():
+    server = MCPServer(name="test")
+    response = json.loads(asyncio.run(server.handle_raw(b"{not json")))
+    assert response["id"] is None
+    assert response["error"]["code"] == PARSE_ERROR
+
+
+def test_async_handler_detected_and_awaited():
+    server = MCPServer(name="test")
+
+    @server.tool(name="double", description="Double a number")
+    async def double(x: int) -> int:
+        await asyncio.sleep(0)
+        return x * 2
+
+    assert server.registry.get_tool("double").is_async is True
+    response = asyncio.run(server.handle_call_tool_async(ToolCallRequest(tool_name="double", arguments={"x": 4})))
+    assert response.content == "8"
+    assert response.is_error is False
+    # The sync entry point still runs async handlers to completion.
+    assert server.handle_call_tool(ToolCallRequest(tool_name="double", arguments={"x": 1})).content == "2"
+
+
+def test_async_path_supports_sync_handlers_and_errors():
+    server = MCPServer(name="test")
+
+    @server.tool(name="upper", description="Uppercase")
+    def upper(s: str) -> str:
+        return s.upper()
+
+    @server.tool(name="boom", description="Fails")
+    async def boom() -> None:
+        raise RuntimeError("kaboom")
+
+    ok = asyncio.run(server.handle_call_tool_async(ToolCallRequest(tool_name="upper", arguments={"s": "a"})))
+    assert ok.content == "A"
+    failed = asyncio.run(server.handle_call_tool_async(ToolCallRequest(tool_name="boom")))
+    assert failed.is_error is True
+    assert "kaboom" in failed.content
+    unknown = asyncio.run(server.handle_call_tool_async(ToolCallRequest(tool_name="missing")))
+    assert unknown.is_error is True
+
+
+def test_async_handlers_run_concurrently():
+    server = MCPServer(name="test")
+    started = 0
+
+    @server.tool(name="wait", description="Waits for a peer")
+    async def wait() -> str:
+        nonlocal started
+        started += 1
+        while started < 2:
+            await asyncio.sleep(0.001)
+        return "ok"
+
+    async def run():
+        return await asyncio.wait_for(asyncio.gather(
+            server.handle_call_tool_async(ToolCallRequest(tool_name="wait")),
+            server.handle_call_tool_async(ToolCallRequest(tool_name="wait")),
+        ), timeout=2)
+
+    assert [r.content for r in asyncio.run(run())] == ["ok", "ok"]
+
+
+def test_handle_raw_batch_runs_concurrently():
+    server = MCPServer(name="test")
+    arrived = 0
+
+    @server.tool(name="rendezvous", description="Waits for its peer")
+    async def rendezvous(tag: str) -> str:
+        nonlocal arrived
+        arrived += 1
+        while arrived < 2:
+            await asyncio.sleep(0.001)
+        return tag
+
+    batch = json.dumps([
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+         "params": {"name": "rendezvous", "arguments": {"tag": "a"}}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/call",
+         "params": {"name": "rendezvous", "arguments": {"tag": "b"}}},
+        {"jsonrpc": "2.0", "id": 3},
+    ])
+    raw = asyncio.run(asyncio.wait_for(server.handle_raw(batch), timeout=2))
+    responses = json.loads(raw)
+    assert [r["id"] for r in responses] == [1, 2, None]
+    assert responses[0]["result"]["content"][0]["text"] == "a"
+    assert responses[1]["result"]["content"][0]["text"] == "b"
+    assert responses[2]["error"]["code"] == -32600
+
+
+def test_handle_raw_batch_of_notifications_returns_none():
+    server = MCPServer(name="test")
+    batch = json.dumps([{"jsonrpc": "2.0", "method": "ping"}])
+    assert asyncio.run(server.handle_raw(batch)) is None
+
+
+def test_call_tool_validates_arguments_before_dispatch():
+    server = MCPServer(name="test")
+    calls = []
+
+    @server.tool(name="add", description="Add numbers", parameters=[
+        ToolParam(name="a", type=ToolParamType.INTEGER, description="First number"),
+        ToolParam(name="b", type=ToolParamType.INTEGER, description="Second number"),
+    ])
+    def add(a: int, b: int) -> int:
+        calls.append((a, b))
+        return a + b
+
+    response = server.handle_call_tool(ToolCallRequest(tool_name="add", arguments={"a": "1"}))
+    assert response.is_error is True
+    assert "Missing required parameter: b" in response.content
+    assert "Parameter 'a' expected integer" in response.content
+    async_response = asyncio.run(server.handle_call_tool_async(
+        ToolCallRequest(tool_name="add", arguments={"a": 1, "b": 2, "c": 3})
+    ))
+    assert async_response.is_error is True
+    assert "Unknown parameter: c" in async_response.content
+    assert calls == []
+
+
+def test_registration_emits_list_changed_notifications():
+    server = MCPServer(name="test")
+    sent = []
+    server.add_notification_sink(sent.append)
+    server.tool(name="a", description="A")(lambda: None)
+    server.registry.register_resource(Resource(uri="file:///a.txt", name="A"))
+    assert [json.loads(m)["method"] for m in sent] == [
+        "notifications/tools/list_changed",
+        "notifications/resources/list_changed",
+    ]
+
+
+def test_tools_list_pagination():
+    server = MCPServer(name="test", page_size=2)
+    for name in ["c", "a", "b"]:
+        server.tool(name=name, description=name)(lambda: None)
+    first = _call(server, {"jsonrpc": "2.0", "id": 1, "method": "tools/list"})["result"]
+    assert [t["name"] for t in first["tools"]] == ["a", "b"]
+    second = _call(server, {
+        "jsonrpc": "2.0", "id": 2, "method": "tools/list",
+        "params": {"cursor": first["nextCursor"]},
+    })["result"]
+    assert [t["name"] for t in second["tools"]] == ["c"]
+    assert "nextCursor" not in second
+    bad = _call(server, {
+        "jsonrpc": "2.0", "id": 3, "method": "resources/list", "params": {"cursor": "%%%"},
+    })
+    assert bad["error"]["code"] == INVALID_PARAMS
+
+
+def test_call_tool_timeout_from_tool_and_request():
+    server = MCPServer(name="test")
+
+    @server.tool(name="sleepy", description="Sleeps", timeout=0.01)
+    async def sleepy(seconds: float) -> str:
+        await asyncio.sleep(seconds)
+        return "awake"
+
+    timed_out = asyncio.run(server.handle_call_tool_async(
+        ToolCallRequest(tool_name="sleepy", arguments={"seconds": 1})
+    ))
+    assert timed_out.is_error is True
+    assert "timed out after 0.01s" in timed_out.content
+    overridden = asyncio.run(server.handle_call_tool_async(
+        ToolCallRequest(tool_name="sleepy", arguments={"seconds": 0.02}, timeout=1)
+    ))
+    assert overridden.content == "awake"
+
+
+def test_timeout_frees_concurrency_slot():
+    server = MCPServer(name="test")
+
+    @server.tool(name="hang", description="Hangs", limit=ConcurrencyLimit(max_concurrent=1))
+    async def hang() -> str:
+        await asyncio.sleep(10)
+        return "never"
+
+    async def run():
+        request = ToolCallRequest(tool_name="hang", timeout=0.01)
+        first = await server.handle_call_tool_async(request)
+        return first, server.limiter_stats("hang")
+
+    first, stats = asyncio.run(run())
+    assert first.is_error is True
+    assert stats.active == 0
+
+
+def test_notifications_cancelled_stops_request():
+    server = MCPServer(name="test")
+    cancelled = False
+
+    @server.tool(name="wait", description="Waits forever")
+    async def wait() -> str:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return "never"
+
+    async def run():
+        call = asyncio.ensure_future(server.handle_message({
+            "jsonrpc": "2.0", "id": "req-1", "method": "tools/call", "params": {"name": "wait"},
+        }))
+        await asyncio.sleep(0.01)
+        assert await server.handle_message({
+            "jsonrpc": "2.0", "method": "notifications/cancelled",
+            "params": {"requestId": "req-1", "reason": "user abort"},
+        }) is None
+        try:
+            await call
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    assert asyncio.run(run()) is True
+    assert cancelled is True
+    assert server._in_flight == {}
+
+
+def test_invalid_timeout_param():
+    server = MCPServer(name="test")
+    server.tool(name="noop", description="")(lambda: None)
+    response = _call(server, {
+        "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+        "params": {"name": "noop", "timeout": -1},
+    })
+    assert response["error"]["code"] == INVALID_PARAMS
@@ -0,0 +1,158 @@
+"""Tests for single-flight coalescing of identical calls."""
+
+import asyncio
+import threading
+
+import pytest
+
+from mcp_starter.models import ConcurrencyLimit, ToolCallRequest
+from mcp_starter.server import MCPServer
+from mcp_starter.singleflight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    started = 0
+
+    async def work():
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("t", "k", work) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["done"] * 5
+    assert started == 1
+    assert flight.executions("t") == 1
+    assert flight.coalesced("t") == 4
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_and_sequential_calls_run_separately():
+    flight = SingleFlight()
+
+    async def run():
+        a = flight.do("t", "a", lambda: asyncio.sleep(0, "a"))
+        b = flight.do("t", "b", lambda: asyncio.sleep(0, "b"))
+        first = await asyncio.gather(a, b)
+        again = await flight.do("t", "a", lambda: asyncio.sleep(0, "a2"))
+        return first, again
+
+    assert asyncio.run(run()) == (["a", "b"], "a2")
+    assert flight.executions("t") == 3
+    assert flight.coalesced("t") == 0
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return "ok"
+
+        first = asyncio.ensure_future(flight.do("t", "k", work))
+        second = asyncio.ensure_future(flight.do("t", "k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "ok"
+
+
+def test_errors_are_shared():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("nope")
+
+    async def run():
+        return await asyncio.gather(
+            flight.do("t", "k", fail), flight.do("t", "k", fail), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_server_coalesces_sync_and_async_handlers(use_async):
+    server = MCPServer(name="test")
+    calls = 0
+    release = threading.Event()
+
+    if use_async:
+        async def fetch(key: str) -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return key
+    else:
+        def fetch(key: str) -> str:
+            nonlocal calls
+            calls += 1
+            release.wait(timeout=2)
+            return key
+
+    server.tool(name="fetch", description="Expensive fetch", coalesce=True)(fetch)
+
+    async def run():
+        requests = [ToolCallRequest(tool_name="fetch", arguments={"key": "x"}) for _ in range(4)]
+        tasks = [asyncio.ensure_future(server.handle_call_tool_async(r)) for r in requests]
+        await asyncio.sleep(0.01)
+        release.set()
+        other = await server.handle_call_tool_async(
+            ToolCallRequest(tool_name="fetch", arguments={"key": "y"})
+        )
+        return await asyncio.gather(*tasks), other
+
+    responses, other = asyncio.run(run())
+    assert [r.content for r in responses] == ["x"] * 4
+    assert other.content == "y"
+    assert calls == 2
+    assert server.coalesced_calls("fetch") == 3
+    server.shutdown()
+
+
+def test_timed_out_coalesced_call_cancels_execution_and_frees_its_slot():
+    server = MCPServer(name="test")
+    cancelled = []
+
+    @server.tool(
+        name="stuck", description="Never finishes", coalesce=True,
+        limit=ConcurrencyLimit(max_concurrent=1), timeout=0.05,
+    )
+    async def stuck(key: str) -> str:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(key)
+            raise
+        return key
+
+    async def run():
+        request = ToolCallRequest(tool_name="stuck", arguments={"key": "a"})
+        timed_out = await asyncio.gather(
+            server.handle_call_tool_async(request), server.handle_call_tool_async(request)
+        )
+        state = server.single_flight.in_flight(), server.limiter_stats("stuck").active
+        # Raises OverloadedError if the first execution still held the only slot.
+        again = await server.handle_call_tool_async(
+            ToolCallRequest(tool_name="stuck", arguments={"key": "b"}, timeout=0.01)
+        )
+        return timed_out, state, again
+
+    timed_out, (in_flight, active), again = asyncio.run(run())
+    assert all("timed out" in r.content for r in timed_out)
+    assert (in_flight, active) == (0, 0)
+    assert "timed out" in again.content
+    assert cancelled == ["a", "b"]
+    assert server.single_flight.coalesced("stuck") == 1
@@ -0,0 +1,143 @@
+"""Tests for spooling large tool results to ephemeral resources."""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from mcp_starter.models import CachePolicy, SpoolPolicy, ToolCallRequest
+from mcp_starter.protocol import RESOURCE_NOT_FOUND
+from mcp_starter.registry import MCPRegistry
+from mcp_starter.server import PROTOCOL_VERSION, MCPServer
+from mcp_starter.spool import SPOOL_URI_PREFIX, ResultSpool
+
+
+def _rpc(server, method, **params):
+    return json.loads(asyncio.run(server.handle_message({
+        "jsonrpc": "2.0", "id": 1, "method": method, "params": params,
+    })))
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = MCPServer(name="test", spool=SpoolPolicy(threshold=100, directory=str(tmp_path)))
+
+    @server.tool(name="big", description="Large result")
+    def big() -> str:
+        return "x" * 250
+
+    @server.tool(name="small", description="Small result")
+    def small() -> str:
+        return "ok"
+
+    @server.tool(name="stream", description="Large streamed result")
+    def stream():
+        for i in range(50):
+            yield f"{i:04d}\n"
+
+    yield server
+    server.shutdown()
+
+
+def test_large_result_is_returned_as_resource_link(server):
+    result = _rpc(server, "tools/call", name="big")["result"]
+    text, link = result["content"]
+    assert link["type"] == "resource_link" and link["uri"].startswith(SPOOL_URI_PREFIX)
+    assert link["uri"] in text["text"]
+    contents = _rpc(server, "resources/read", uri=link["uri"])["result"]["contents"]
+    assert contents[0]["text"] == "x" * 250
+    ranged = _rpc(server, "resources/read", uri=link["uri"], offset=10, length=5)
+    assert ranged["result"]["contents"][0]["text"] == "xxxxx"
+    assert _rpc(server, "resources/list")["result"]["resources"] == []
+
+
+@pytest.mark.parametrize("requested, negotiated", [
+    ("2024-11-05", "2024-11-05"),
+    ("2025-03-26", "2025-03-26"),
+    ("2025-06-18", "2025-06-18"),
+    ("1999-01-01", PROTOCOL_VERSION),
+])
+def test_older_protocol_versions_get_a_text_pointer_only(server, requested, negotiated):
+    server.tool(name="stats", description="Structured result")(lambda: {"mean": 1.5})
+    result = _rpc(server, "initialize", protocolVersion=requested)["result"]
+    assert result["protocolVersion"] == negotiated
+    typed = negotiated >= "2025-06-18"
+    content = _rpc(server, "tools/call", name="big")["result"]["content"]
+    assert [block["type"] for block in content] == ["text", "resource_link"][:2 if typed else 1]
+    assert "resources/read" in content[0]["text"]
+    assert ("structuredContent" in _rpc(server, "tools/call", name="stats")["result"]) is typed
+
+
+def test_small_result_stays_inline(server):
+    result = _rpc(server, "tools/call", name="small")["result"]
+    assert result["content"] == [{"type": "text", "text": "ok"}]
+    assert len(server.spool) == 0
+
+
+@pytest.mark.parametrize("call", ["sync", "async"])
+def test_streamed_result_is_spooled(server, call):
+    request = ToolCallRequest(tool_name="stream")
+    if call == "sync":
+        response = server.handle_call_tool(request)
+    else:
+        response = asyncio.run(server.handle_call_tool_async(request))
+    link = response.resource_link
+    assert link is not None
+    assert open(link.reader.path).read() == "".join(f"{i:04d}\n" for i in range(50))
+
+
+def test_spool_buffer_holds_at_most_threshold_in_memory(tmp_path):
+    spool = ResultSpool(MCPRegistry(), SpoolPolicy(threshold=10, directory=str(tmp_path)))
+    buffer = spool.buffer()
+    for _ in range(100):
+        buffer.write("abcdef")
+        assert sum(len(p) for p in buffer._parts) <= 10
+    resource = buffer.result()
+    assert open(resource.reader.path).read() == "abcdef" * 100
+
+
+def test_failed_stream_leaves_no_file(server, tmp_path):
+    @server.tool(name="fails", description="")
+    def fails():
+        yield "y" * 500
+        raise RuntimeError("boom")
+
+    response = asyncio.run(server.handle_call_tool_async(ToolCallRequest(tool_name="fails")))
+    assert response.is_error and response.resource_link is None
+    assert [f for _, _, files in os.walk(tmp_path) for f in files] == []
+
+
+def test_expired_results_are_removed(tmp_path):
+    now = [0.0]
+    registry = MCPRegistry()
+    spool = ResultSpool(
+        registry, SpoolPolicy(threshold=1, ttl=60, directory=str(tmp_path)), clock=lambda: now[0]
+    )
+    first = spool.spool("first")
+    now[0] = 30
+    second = spool.spool("second")
+    now[0] = 61
+    assert spool.purge() == 1
+    assert registry.resolve_resource(first.uri) is None
+    assert not os.path.exists(first.reader.path)
+    assert registry.resolve_resource(second.uri)[0] is second
+    spool.close()
+    assert registry.resolve_resource(second.uri) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_expired_result_cannot_be_read(server):
+    link = server.handle_call_tool(ToolCallRequest(tool_name="big")).resource_link
+    server.spool._entries[0] = (0.0, *server.spool._entries[0][1:])
+    error = _rpc(server, "resources/read", uri=link.uri)["error"]
+    assert error["code"] == RESOURCE_NOT_FOUND
+
+
+def test_spooled_results_are_not_cached(tmp_path):
+    server = MCPServer(name="test", spool=SpoolPolicy(threshold=1, directory=str(tmp_path)))
+    server.tool(name="t", description="", cache=CachePolicy())(lambda: "long")
+    first = server.handle_call_tool(ToolCallRequest(tool_name="t")).resource_link
+    second = server.handle_call_tool(ToolCallRequest(tool_name="t")).resource_link
+    assert first.uri != second.uri
+    server.shutdown()
@@ -0,0 +1,129 @@
+"""Tests for streaming generator and async-generator tool handlers."""
+
+import asyncio
+import json
+
+import pytest
+
+from mcp_starter.models import ExecutionMode, ToolCallRequest
+from mcp_starter.server import MCPServer
+from mcp_starter.streaming import TextBuffer, collect_async
+
+
+def _call(server, name, progress_token=None):
+    params = {"name": name, "arguments": {}}
+    if progress_token is not None:
+        params["_meta"] = {"progressToken": progress_token}
+    sent = []
+    server.add_notification_sink(sent.append)
+    response = asyncio.run(server.handle_message({
+        "jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": params,
+    }))
+    server.remove_notification_sink(sent.append)
+    return json.loads(response)["result"], [json.loads(m) for m in sent]
+
+
+@pytest.fixture
+def server():
+    server = MCPServer(name="test")
+
+    @server.tool(name="report", description="Sync generator")
+    def report():
+        for i in range(3):
+            yield f"line {i}\n"
+
+    @server.tool(name="areport", description="Async generator")
+    async def areport():
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield i
+
+    return server
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("report", "line 0\nline 1\nline 2\n"),
+    ("areport", "012"),
+])
+def test_chunks_are_sent_as_progress_and_joined(server, name, expected):
+    result, notifications = _call(server, name, progress_token="tok")
+    assert result == {"content": [{"type": "text", "text": expected}], "isError": False}
+    assert [n["method"] for n in notifications] == ["notifications/progress"] * 3
+    assert [n["params"]["progress"] for n in notifications] == [1, 2, 3]
+    assert "".join(n["params"]["message"] for n in notifications) == expected
+    assert {n["params"]["progressToken"] for n in notifications} == {"tok"}
+
+
+def test_no_progress_without_token(server):
+    result, notifications = _call(server, "report")
+    assert result["content"][0]["text"] == "line 0\nline 1\nline 2\n"
+    assert notifications == []
+
+
+def test_sync_path_and_errors():
+    server = MCPServer(name="test")
+
+    @server.tool(name="fails", description="Raises mid-stream")
+    def fails():
+        yield "partial"
+        raise RuntimeError("boom")
+
+    @server.tool(name="inline", description="Inline generator", execution=ExecutionMode.INLINE)
+    def inline():
+        yield from "abc"
+
+    assert server.handle_call_tool(ToolCallRequest(tool_name="inline")).content == "abc"
+    for response in (
+        server.handle_call_tool(ToolCallRequest(tool_name="fails")),
+        asyncio.run(server.handle_call_tool_async(ToolCallRequest(tool_name="fails"))),
+    ):
+        assert response.is_error and response.content == "Error: boom"
+
+
+def test_process_pool_streaming_tool_is_rejected():
+    server = MCPServer(name="test")
+    with pytest.raises(ValueError, match="Streaming tool"):
+        server.tool(name="g", description="", execution=ExecutionMode.PROCESS)(lambda: (yield 1))
+
+
+def test_timeout_closes_async_generator():
+    server = MCPServer(name="test")
+    closed = []
+
+    @server.tool(name="endless", description="", timeout=0.05)
+    async def endless():
+        try:
+            while True:
+                await asyncio.sleep(0.01)
+                yield "."
+        finally:
+            closed.append(True)
+
+    response = asyncio.run(server.handle_call_tool_async(ToolCallRequest(tool_name="endless")))
+    assert response.is_error and "timed out" in response.content
+    assert closed == [True]
+
+
+def test_sync_generator_runs_at_most_buffer_ahead():
+    produced = 0
+    lag = []
+
+    def numbers():
+        nonlocal produced
+        for i in range(500):
+            produced += 1
+            yield i
+
+    def on_chunk(chunk):
+        lag.append(produced - (int(chunk) + 1))
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        sink = TextBuffer()
+        await collect_async(
+            numbers(), sink, on_chunk, lambda func: loop.run_in_executor(None, func), buffer_size=4
+        )
+        return sink.result()
+
+    assert asyncio.run(run()) == "".join(str(i) for i in range(500))
+    assert max(lag) <= 4 + 2
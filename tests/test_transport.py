@@ -0,0 +1,168 @@
+"""Tests for the asyncio stdio transport."""
+
+import asyncio
+import json
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from mcp_starter.models import ToolParam, ToolParamType
+from mcp_starter.server import MCPServer
+from mcp_starter.transport import StdioTransport
+
+
+class CollectingWriter:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> None:
+        self.chunks.append(data)
+
+    async def drain(self) -> None:
+        pass
+
+    def messages(self) -> list[dict]:
+        return [json.loads(line) for line in b"".join(self.chunks).splitlines()]
+
+
+def _serve(server, lines, max_in_flight=16):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"".join(line + b"\n" for line in lines))
+        reader.feed_eof()
+        writer = CollectingWriter()
+        await StdioTransport(server, max_in_flight).serve(reader, writer)
+        return writer.messages()
+    return asyncio.run(run())
+
+
+def _call_line(request_id, name, **arguments):
+    return json.dumps({
+        "jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+        "params": {"name": name, "arguments": arguments},
+    }).encode()
+
+
+@pytest.fixture
+def server():
+    server = MCPServer(name="test")
+    release = threading.Event()
+
+    @server.tool(name="slow", description="Blocks until released")
+    def slow() -> str:
+        return "released" if release.wait(timeout=5) else "timed out"
+
+    @server.tool(name="fast", description="Returns immediately", parameters=[
+        ToolParam(name="value", type=ToolParamType.STRING),
+    ])
+    def fast(value: str) -> str:
+        release.set()
+        return value
+
+    return server
+
+
+def test_slow_call_does_not_block_later_calls(server):
+    messages = _serve(server, [_call_line(1, "slow"), _call_line(2, "fast", value="x")])
+    by_id = {m["id"]: m for m in messages}
+    # The slow call only finishes early if the fast call ran while it was in flight.
+    assert by_id[1]["result"]["content"][0]["text"] == "released"
+    assert by_id[2]["result"]["content"][0]["text"] == "x"
+
+
+def test_blank_lines_and_parse_errors(server):
+    messages = _serve(server, [b"", b"{bad", _call_line(3, "fast", value="y")])
+    by_id = {m["id"]: m for m in messages}
+    assert by_id[None]["error"]["code"] == -32700
+    assert by_id[3]["result"]["content"][0]["text"] == "y"
+
+
+def test_max_in_flight_bounds_concurrency():
+    server = MCPServer(name="test")
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    @server.tool(name="work", description="Tracks concurrency")
+    def work() -> str:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return "ok"
+
+    messages = _serve(server, [_call_line(i, "work") for i in range(10)], max_in_flight=2)
+    assert len(messages) == 10
+    assert peak <= 2
+
+
+def test_invalid_max_in_flight():
+    with pytest.raises(ValueError):
+        StdioTransport(MCPServer(name="test"), max_in_flight=0)
+
+
+def test_list_changed_notification_written_during_serve():
+    server = MCPServer(name="test")
+
+    @server.tool(name="install", description="Registers another tool")
+    def install() -> str:
+        server.tool(name="extra", description="Added at runtime")(lambda: None)
+        return "installed"
+
+    messages = _serve(server, [_call_line(1, "install")])
+    methods = [m.get("method") for m in messages]
+    assert "notifications/tools/list_changed" in methods
+    assert any(m.get("id") == 1 for m in messages)
+
+
+def test_cancelled_request_gets_no_response():
+    server = MCPServer(name="test")
+
+    @server.tool(name="wait", description="Waits forever")
+    async def wait() -> str:
+        await asyncio.sleep(10)
+        return "never"
+
+    async def run():
+        reader = asyncio.StreamReader()
+        writer = CollectingWriter()
+        serving = asyncio.ensure_future(StdioTransport(server).serve(reader, writer))
+        reader.feed_data(_call_line(1, "wait") + b"\n")
+        await asyncio.sleep(0.01)
+        reader.feed_data(json.dumps({
+            "jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 1},
+        }).encode() + b"\n")
+        reader.feed_data(_call_line(2, "fast", value="z") + b"\n")
+        reader.feed_eof()
+        await asyncio.wait_for(serving, timeout=2)
+        return writer.messages()
+
+    server.tool(name="fast", description="")(lambda value: value)
+    assert [m["id"] for m in asyncio.run(run())] == [2]
+
+
+def test_stdio_works_with_files_redirected_to_stdin_and_stdout(tmp_path):
+    code = textwrap.dedent("""
+        import asyncio
+        from mcp_starter.server import MCPServer
+
+        server = MCPServer(name="test")
+        server.tool(name="echo", description="Echo")(lambda text: text)
+        asyncio.run(server.run_stdio())
+    """)
+    requests = tmp_path / "requests.jsonl"
+    requests.write_bytes(b"".join(
+        _call_line(i, "echo", text=str(i)) + b"\n" for i in range(3)
+    ))
+    out = tmp_path / "out.jsonl"
+    with requests.open("rb") as stdin, out.open("wb") as stdout:
+        subprocess.run([sys.executable, "-c", code], stdin=stdin, stdout=stdout, check=True)
+    responses = [json.loads(line) for line in out.read_bytes().splitlines()]
+    assert sorted(r["result"]["content"][0]["text"] for r in responses) == ["0", "1", "2"]
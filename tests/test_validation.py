@@ -81,3 +81,27 @@ class TestToolValidator:
         assert len(errors) == 2
         assert any("Missing required parameter: age" in e for e in errors)
         assert any("expected string" in e for e in errors)
+
+
+class TestCompiledValidator:
+    @pytest.mark.parametrize("arguments", [
+        {"name": "Alice", "age": 30},
+        {"name": "Alice"},
+        {"name": "Alice", "age": 30, "color": "blue"},
+        {"name": 999},
+        {"name": "Alice", "age": True, "verbose": 1},
+        {},
+    ])
+    def test_matches_validate_call(self, validator, sample_tool, arguments):
+        compiled = ToolValidator.compile(sample_tool)
+        assert compiled(arguments) == validator.validate_call(sample_tool, arguments)
+
+    def test_number_rejects_bool(self):
+        tool = ToolDefinition(
+            name="calc",
+            description="Calculate",
+            parameters=[ToolParam(name="value", type=ToolParamType.NUMBER)],
+        )
+        compiled = ToolValidator.compile(tool)
+        assert compiled({"value": 1.5}) == []
+        assert compiled({"value": False}) == ["Parameter 'value' expected number, got bool"]